@@ -1,5 +1,7 @@
 import sys
 import os
+import threading
+import multiprocessing
 import darkdetect
 import cantools
 from PIL import Image, ImageQt
@@ -7,18 +9,23 @@ from PIL import Image, ImageQt
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QGroupBox, QPushButton, QLabel, QLineEdit, QRadioButton, QButtonGroup,
-    QTreeWidget, QTreeWidgetItem, QFileDialog, QMessageBox,
-    QHeaderView, QCheckBox, QGraphicsOpacityEffect
+    QTreeWidget, QTreeWidgetItem, QTreeView, QFileDialog, QMessageBox,
+    QHeaderView, QCheckBox, QGraphicsOpacityEffect, QProgressDialog,
+    QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
 )
 
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QAbstractItemModel, QModelIndex, QRect, QEvent
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional
+from contextlib import contextmanager
+from typing import Dict, List, Set, Optional, Tuple
 
 from .generate_functions.generate_c_library import generate_c_code
 from .generate_functions.generate_cpp_library import generate_cpp_code
+from .generate_functions.write_library import write_library
+from .ir.selection import MessageKey, Selection
+from .utils.dbc_loader import iter_load_dbc_files
 
 # Define your app version
 __version__ = "dev"
@@ -33,181 +40,389 @@ def _apply_disabled_visual(cb: QCheckBox, enabled: bool):
     cb.setCursor(Qt.CursorShape.ArrowCursor if enabled else Qt.CursorShape.ForbiddenCursor)
 
 # -------------------------
-# CheckableTreeWidget (Msgs)
+# Message tree model (Msgs)
 # -------------------------
-class CheckableTreeWidget(QTreeWidget):
+class MessageTreeModel(QAbstractItemModel):
+    """
+    Model of messages and signals of the loaded databases.
+
+    Messages are top-level rows, signals are their children. No per-row
+    objects are created: names and check states are kept in flat arrays and
+    indexes are created on demand, so the view only touches rows that are
+    expanded and visible. Message ids are message row numbers, signal ids are
+    global signal numbers.
+
+    Index internal ids: 0 for message rows, message row + 1 for signal rows.
+    """
+
+    COLUMNS = ["Name", "Type", "ID", "RX", "TX"]
+    COL_NAME, COL_TYPE, COL_ID, COL_RX, COL_TX = range(5)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._block_signals = False
-        self._suppress_cell_callbacks = False
-        self._item_map: Dict[str, QTreeWidgetItem] = {}
-        self._parent_id_map: Dict[str, str] = {}
-        self._next_id = 0
         self._controller = None  # set via set_controller
+        self._batch_depth = 0
+        self._dirty_messages: Set[int] = set()
+        self._clear_data()
+
+    def _clear_data(self):
+        # Per message
+        self._msg_names: List[str] = []
+        self._msg_ids: List[str] = []
+        self._msg_first_signal: List[int] = []
+        self._msg_signal_count: List[int] = []
+        self._msg_rx = bytearray()
+        self._msg_tx = bytearray()
+        self._msg_rx_enabled = bytearray()
+        self._msg_tx_enabled = bytearray()
+        # Per signal
+        self._sig_names: List[str] = []
+        self._sig_message: List[int] = []
+        self._sig_checked = bytearray()
 
-        # keep pointers to message RX/TX QCheckBox widgets by message_id
-        self._msg_rx_cb: Dict[str, QCheckBox] = {}
-        self._msg_tx_cb: Dict[str, QCheckBox] = {}
+    def set_controller(self, controller):
+        self._controller = controller
 
-        self.setHeaderLabels(["Name", "Type", "ID", "RX", "TX"])
-        self.header().setStretchLastSection(False)
-        self.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.header().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        self.header().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        self.header().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        self.header().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
+    # ---- Loading ----
+    def add_database(self, db):
+        """
+        Append all messages and signals of a database.
 
-        self.itemChanged.connect(self._handle_item_changed)
+        Returns:
+            List of (message_id, message, signal_ids) for controller registration.
+        """
+        messages = list(db.messages)
+        if not messages:
+            return []
 
-    def set_controller(self, controller):
-        self._controller = controller
+        first_row = len(self._msg_names)
+        registered = []
 
-    def _centered_checkbox(self, checked=False, tooltip=None, on_change=None) -> QWidget:
-        w = QWidget()
-        layout = QHBoxLayout(w)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        cb = QCheckBox()
-        cb.setChecked(checked)
-        if tooltip:
-            cb.setToolTip(tooltip)
-        if on_change:
-            cb.stateChanged.connect(on_change)
-        layout.addWidget(cb)
-        w._checkbox = cb  # convenience pointer
-        return w
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(messages) - 1)
+        for message in messages:
+            message_id = len(self._msg_names)
+            first_signal = len(self._sig_names)
 
-    def _attach_rx_tx(self, item: QTreeWidgetItem, rx_checked=False, tx_checked=False):
-        message_id = item.data(0, Qt.ItemDataRole.UserRole)
-        rx_widget = self._centered_checkbox(
-            checked=rx_checked,
-            tooltip="Mark as RX for this message (selects all its signals)",
-            on_change=lambda s, mid=message_id: (
-                None if self._suppress_cell_callbacks else (
-                    self._controller.on_message_toggle(mid, 'RX', bool(s)) if self._controller else None
-                )
-            ),
+            self._msg_names.append(message.name)
+            self._msg_ids.append(hex(message.frame_id))
+            self._msg_first_signal.append(first_signal)
+            self._msg_signal_count.append(len(message.signals))
+            self._msg_rx.append(0)
+            self._msg_tx.append(0)
+            self._msg_rx_enabled.append(1)
+            self._msg_tx_enabled.append(1)
+
+            for signal in message.signals:
+                self._sig_names.append(signal.name)
+                self._sig_message.append(message_id)
+                self._sig_checked.append(0)
+
+            registered.append((message_id, message, range(first_signal, len(self._sig_names))))
+        self.endInsertRows()
+
+        return registered
+
+    def clear(self):
+        self.beginResetModel()
+        self._clear_data()
+        self._dirty_messages.clear()
+        self.endResetModel()
+
+    # ---- Batch updates ----
+    def begin_batch(self):
+        """
+        Start a batch of check state changes.
+
+        Until the matching end_batch no change notifications are emitted, the
+        changed messages are only recorded. Batches may be nested.
+        """
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """Finish a batch and emit one notification per changed message."""
+        self._batch_depth -= 1
+        if self._batch_depth > 0 or not self._dirty_messages:
+            return
+
+        dirty, self._dirty_messages = self._dirty_messages, set()
+        roles = [Qt.ItemDataRole.CheckStateRole]
+
+        self.dataChanged.emit(
+            self.message_index(min(dirty), self.COL_RX),
+            self.message_index(max(dirty), self.COL_TX),
+            roles
         )
-        tx_widget = self._centered_checkbox(
-            checked=tx_checked,
-            tooltip="Mark as TX for this message (selects all its signals)",
-            on_change=lambda s, mid=message_id: (
-                None if self._suppress_cell_callbacks else (
-                    self._controller.on_message_toggle(mid, 'TX', bool(s)) if self._controller else None
+        for message_id in dirty:
+            count = self._msg_signal_count[message_id]
+            if count:
+                self.dataChanged.emit(
+                    self.createIndex(0, 0, message_id + 1),
+                    self.createIndex(count - 1, 0, message_id + 1),
+                    roles
                 )
-            ),
-        )
-        self.setItemWidget(item, 3, rx_widget)
-        self.setItemWidget(item, 4, tx_widget)
-        # store actual checkbox pointers
-        self._msg_rx_cb[message_id] = rx_widget._checkbox
-        self._msg_tx_cb[message_id] = tx_widget._checkbox
-
-    def set_message_cell_checked(self, message_id: str, which: str, checked: bool):
-        cb = None
-        if which == 'RX':
-            cb = self._msg_rx_cb.get(message_id)
+
+    def _notify(self, message_id: int, top_left: QModelIndex, bottom_right: QModelIndex, roles=None):
+        if self._batch_depth:
+            self._dirty_messages.add(message_id)
+        elif roles is None:
+            self.dataChanged.emit(top_left, bottom_right)
         else:
-            cb = self._msg_tx_cb.get(message_id)
-        if cb is not None:
-            self._suppress_cell_callbacks = True
-            cb.setChecked(bool(checked))
-            self._suppress_cell_callbacks = False
+            self.dataChanged.emit(top_left, bottom_right, roles)
+
+    # ---- Index helpers ----
+    def message_index(self, message_id: int, column: int = 0) -> QModelIndex:
+        return self.createIndex(message_id, column, 0)
+
+    def signal_index(self, signal_id: int, column: int = 0) -> QModelIndex:
+        message_id = self._sig_message[signal_id]
+        return self.createIndex(signal_id - self._msg_first_signal[message_id], column, message_id + 1)
+
+    def _signal_id(self, index: QModelIndex) -> int:
+        return self._msg_first_signal[index.internalId() - 1] + index.row()
+
+    @staticmethod
+    def is_message_index(index: QModelIndex) -> bool:
+        return index.isValid() and index.internalId() == 0
+
+    # ---- QAbstractItemModel interface ----
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._msg_names)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return self._msg_signal_count[parent.row()]
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
 
-    def is_message_cell_checked(self, message_id: str, which: str) -> bool:
-        cb = self._msg_rx_cb.get(message_id) if which == 'RX' else self._msg_tx_cb.get(message_id)
-        return bool(cb.isChecked()) if cb is not None else False
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        column = index.column()
+
+        if self.is_message_index(index):
+            row = index.row()
+            if role == Qt.ItemDataRole.DisplayRole:
+                if column == self.COL_NAME:
+                    return self._msg_names[row]
+                if column == self.COL_TYPE:
+                    return "Message"
+                if column == self.COL_ID:
+                    return self._msg_ids[row]
+            elif role == Qt.ItemDataRole.CheckStateRole:
+                if column == self.COL_RX:
+                    return Qt.CheckState.Checked if self._msg_rx[row] else Qt.CheckState.Unchecked
+                if column == self.COL_TX:
+                    return Qt.CheckState.Checked if self._msg_tx[row] else Qt.CheckState.Unchecked
+            elif role == Qt.ItemDataRole.ToolTipRole:
+                if column == self.COL_RX:
+                    return "Mark as RX for this message (selects all its signals)"
+                if column == self.COL_TX:
+                    return "Mark as TX for this message (selects all its signals)"
+            return None
+
+        signal_id = self._signal_id(index)
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.COL_NAME:
+                return self._sig_names[signal_id]
+            if column == self.COL_TYPE:
+                return "Signal"
+        elif role == Qt.ItemDataRole.CheckStateRole and column == self.COL_NAME:
+            return Qt.CheckState.Checked if self._sig_checked[signal_id] else Qt.CheckState.Unchecked
+        return None
 
-    def add_item(self, parent_q_item_or_id, text, values):
-        parent_q_item = None
-        parent_id = None
-
-        if parent_q_item_or_id is None:
-            new_item = QTreeWidgetItem(self, [text] + list(values) + ["", ""])  # pad RX/TX cols
-        elif isinstance(parent_q_item_or_id, QTreeWidgetItem):
-            parent_q_item = parent_q_item_or_id
-            new_item = QTreeWidgetItem(parent_q_item, [text] + list(values) + ["", ""])  # pad RX/TX
-            parent_id = parent_q_item.data(0, Qt.ItemDataRole.UserRole)
-        elif isinstance(parent_q_item_or_id, str):
-            parent_id = parent_q_item_or_id
-            parent_q_item = self._item_map.get(parent_id)
-            if not parent_q_item:
-                raise ValueError(f"Parent item with ID '{parent_id}' not found.")
-            new_item = QTreeWidgetItem(parent_q_item, [text] + list(values) + ["", ""])  # pad
-        else:
-            raise TypeError("parent_q_item_or_id must be None, QTreeWidgetItem, or item ID (str).")
-
-        # Assign an ID and store maps
-        item_id = f"qitem_{self._next_id}"
-        self._next_id += 1
-        self._item_map[item_id] = new_item
-        new_item.setData(0, Qt.ItemDataRole.UserRole, item_id)
-
-        # Messages (top-level): no left checkbox, attach RX/TX cell widgets
-        is_message = (values and len(values) > 0 and str(values[0]) == "Message" and new_item.parent() is None)
-        if is_message:
-            new_item.setFlags(new_item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable)
-            self._attach_rx_tx(new_item)
-        else:
-            # Signals (children): keep left checkbox
-            new_item.setFlags(new_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            new_item.setCheckState(0, Qt.CheckState.Unchecked)
-            if parent_id:
-                self._parent_id_map[item_id] = parent_id
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
 
-        return item_id
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        column = index.column()
 
-    def _handle_item_changed(self, item: QTreeWidgetItem, column: int):
-        if self._block_signals:
-            return
-        if item.parent() is None or column != 0:
-            return
-        if not (item.flags() & Qt.ItemFlag.ItemIsUserCheckable):
-            return
+        if self.is_message_index(index):
+            row = index.row()
+            if column == self.COL_RX:
+                return (flags | Qt.ItemFlag.ItemIsUserCheckable) if self._msg_rx_enabled[row] else Qt.ItemFlag.ItemIsSelectable
+            if column == self.COL_TX:
+                return (flags | Qt.ItemFlag.ItemIsUserCheckable) if self._msg_tx_enabled[row] else Qt.ItemFlag.ItemIsSelectable
+            return flags
+
+        if column == self.COL_NAME:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+
+        checked = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+
+        if self.is_message_index(index):
+            if index.column() not in (self.COL_RX, self.COL_TX):
+                return False
+            which = 'RX' if index.column() == self.COL_RX else 'TX'
+            if self._controller:
+                # The controller updates the cell, the signals and the node counters
+                self._controller.on_message_toggle(index.row(), which, checked)
+            else:
+                self.set_message_cell_checked(index.row(), which, checked)
+            return True
+
+        if index.column() != self.COL_NAME:
+            return False
+
+        signal_id = self._signal_id(index)
+        self.set_signal_checked(signal_id, checked)
         if self._controller:
-            sig_id = item.data(0, Qt.ItemDataRole.UserRole)
-            self._controller.on_signal_toggled(sig_id)
-
-    def item(self, item_id, attribute=None):
-        q_item = self._item_map.get(item_id)
-        if q_item:
-            item_data = {
-                'text': q_item.text(0),
-                'values': [q_item.text(1), q_item.text(2)],  # Type, ID
-            }
-            if attribute:
-                return item_data.get(attribute)
-            return item_data
-        return None
+            self._controller.on_signal_toggled(signal_id)
+        return True
+
+    # ---- State access used by SelectionController ----
+    def set_message_cell_checked(self, message_id: int, which: str, checked: bool):
+        states = self._msg_rx if which == 'RX' else self._msg_tx
+        if states[message_id] != int(bool(checked)):
+            states[message_id] = int(bool(checked))
+            column = self.COL_RX if which == 'RX' else self.COL_TX
+            index = self.message_index(message_id, column)
+            self._notify(message_id, index, index, [Qt.ItemDataRole.CheckStateRole])
+
+    def is_message_cell_checked(self, message_id: int, which: str) -> bool:
+        states = self._msg_rx if which == 'RX' else self._msg_tx
+        return bool(states[message_id])
+
+    def set_message_cell_enabled(self, message_id: int, which: str, enabled: bool):
+        states = self._msg_rx_enabled if which == 'RX' else self._msg_tx_enabled
+        if states[message_id] != int(bool(enabled)):
+            states[message_id] = int(bool(enabled))
+            column = self.COL_RX if which == 'RX' else self.COL_TX
+            index = self.message_index(message_id, column)
+            self._notify(message_id, index, index)
+
+    def set_signal_checked(self, signal_id: int, checked: bool):
+        if self._sig_checked[signal_id] != int(bool(checked)):
+            self._sig_checked[signal_id] = int(bool(checked))
+            index = self.signal_index(signal_id)
+            self._notify(self._sig_message[signal_id], index, index, [Qt.ItemDataRole.CheckStateRole])
+
+    def set_message_signals_checked(self, message_id: int, checked: bool):
+        """Check or uncheck all signals of a message with a single change notification."""
+        first = self._msg_first_signal[message_id]
+        count = self._msg_signal_count[message_id]
+        if not count:
+            return
+        self._sig_checked[first:first + count] = bytes([int(bool(checked))]) * count
+        self._notify(
+            message_id,
+            self.createIndex(0, 0, message_id + 1),
+            self.createIndex(count - 1, 0, message_id + 1),
+            [Qt.ItemDataRole.CheckStateRole]
+        )
 
-    def parent(self, item_id):
-        return self._parent_id_map.get(item_id)
+    def is_signal_checked(self, signal_id: int) -> bool:
+        return bool(self._sig_checked[signal_id])
 
     def get_checked(self):
-        """Return IDs of checked SIGNAL items only (parents are not checkable)."""
-        checked_ids = []
-        for item_id, q_item in self._item_map.items():
-            if q_item.parent() is not None and \
-               (q_item.flags() & Qt.ItemFlag.ItemIsUserCheckable) and \
-               q_item.checkState(0) in (Qt.CheckState.Checked, Qt.CheckState.PartiallyChecked):
-                checked_ids.append(item_id)
-        return checked_ids
-
-    def set_message_cell_enabled(self, message_id: str, which: str, enabled: bool):
-        cb = self._msg_rx_cb.get(message_id) if which == 'RX' else self._msg_tx_cb.get(message_id)
-        if cb is not None:
-            cb.setEnabled(bool(enabled))
-            _apply_disabled_visual(cb, bool(enabled))
+        """Return IDs of checked SIGNAL items only (messages are not checkable)."""
+        return [signal_id for signal_id, checked in enumerate(self._sig_checked) if checked]
 
-    def clear(self):
-        super().clear()
-        self._item_map.clear()
-        self._parent_id_map.clear()
-        self._msg_rx_cb.clear()
-        self._msg_tx_cb.clear()
-        self._next_id = 0
+
+class CheckBoxDelegate(QStyledItemDelegate):
+    """Draws the RX/TX check states of message rows as centered check boxes."""
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+
+        state = index.data(Qt.ItemDataRole.CheckStateRole)
+        opt.features &= ~QStyleOptionViewItem.ViewItemFeature.HasCheckIndicator
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+
+        if state is None:
+            return
+
+        enabled = bool(index.flags() & Qt.ItemFlag.ItemIsEnabled)
+        box = QStyleOptionButton()
+        box.state = QStyle.StateFlag.State_On if state == Qt.CheckState.Checked else QStyle.StateFlag.State_Off
+        if enabled:
+            box.state |= QStyle.StateFlag.State_Enabled
+        box.rect = self._indicator_rect(style, option, widget)
+
+        painter.save()
+        if not enabled:
+            painter.setOpacity(0.35)
+        style.drawControl(QStyle.ControlElement.CE_CheckBox, box, painter, widget)
+        painter.restore()
+
+    @staticmethod
+    def _indicator_rect(style, option, widget) -> QRect:
+        box = QStyleOptionButton()
+        size = style.subElementRect(QStyle.SubElement.SE_CheckBoxIndicator, box, widget).size()
+        rect = QRect(0, 0, size.width(), size.height())
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    def editorEvent(self, event, model, option, index):
+        flags = index.flags()
+        if not (flags & Qt.ItemFlag.ItemIsUserCheckable) or not (flags & Qt.ItemFlag.ItemIsEnabled):
+            return False
+
+        state = index.data(Qt.ItemDataRole.CheckStateRole)
+        if state is None:
+            return False
+
+        event_type = event.type()
+        if event_type == QEvent.Type.MouseButtonRelease:
+            if event.button() != Qt.MouseButton.LeftButton or not option.rect.contains(event.position().toPoint()):
+                return False
+        elif event_type in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+            return event.button() == Qt.MouseButton.LeftButton
+        elif event_type == QEvent.Type.KeyPress:
+            if event.key() not in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+                return False
+        else:
+            return False
+
+        new_state = Qt.CheckState.Unchecked if state == Qt.CheckState.Checked else Qt.CheckState.Checked
+        return model.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
+
+
+class MessageTreeView(QTreeView):
+    """Tree view of MessageTreeModel with RX/TX check boxes drawn by a delegate."""
+
+    def __init__(self, model: MessageTreeModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setUniformRowHeights(True)
+
+        self._check_delegate = CheckBoxDelegate(self)
+        self.setItemDelegateForColumn(MessageTreeModel.COL_RX, self._check_delegate)
+        self.setItemDelegateForColumn(MessageTreeModel.COL_TX, self._check_delegate)
+
+        self.header().setStretchLastSection(False)
+        self.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.header().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.header().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.header().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        self.header().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
 
 
 # =============================
@@ -305,24 +520,39 @@ class NodesTreeWidget(QTreeWidget):
 # =============================
 @dataclass
 class SelectionController:
-    tree: CheckableTreeWidget
+    model: MessageTreeModel
     nodes_tree: NodesTreeWidget
 
-    # Indexes keyed by stable item_id strings
-    message_children: Dict[str, List[str]] = field(default_factory=dict)
-    message_sender: Dict[str, Optional[str]] = field(default_factory=dict)
-    message_receivers: Dict[str, Set[str]] = field(default_factory=dict)
-    signal_receivers: Dict[str, Set[str]] = field(default_factory=dict)
+    # Indexes keyed by model message ids (message rows) and signal ids (global signal numbers)
+    message_children: Dict[int, List[int]] = field(default_factory=dict)
+    message_sender: Dict[int, Optional[str]] = field(default_factory=dict)
+    message_receivers: Dict[int, Set[str]] = field(default_factory=dict)
+    signal_receivers: Dict[int, Set[str]] = field(default_factory=dict)
+
+    node_tx_messages: Dict[str, List[int]] = field(default_factory=dict)
+    node_rx_signals: Dict[str, List[int]] = field(default_factory=dict)
+    node_rx_messages: Dict[str, Set[int]] = field(default_factory=dict)
 
-    node_tx_messages: Dict[str, List[str]] = field(default_factory=dict)
-    node_rx_signals: Dict[str, List[str]] = field(default_factory=dict)
-    node_rx_messages: Dict[str, Set[str]] = field(default_factory=dict)
+    signal_to_message: Dict[int, int] = field(default_factory=dict)
 
-    signal_to_message: Dict[str, str] = field(default_factory=dict)
+    # Nodes whose RX aggregate depends on a message (inverse of node_rx_messages)
+    message_rx_nodes: Dict[int, Set[str]] = field(default_factory=dict)
+
+    # Number of checked message cells per node, node cells are checked when all are
+    node_tx_checked: Dict[str, int] = field(default_factory=dict)
+    node_rx_checked: Dict[str, int] = field(default_factory=dict)
+
+    _batch_depth: int = 0
+    _dirty_nodes: Set[Tuple[str, str]] = field(default_factory=set)
+
+    # Keys used to build the tree-independent Selection
+    message_keys: Dict[int, MessageKey] = field(default_factory=dict)
+    signal_names: Dict[int, str] = field(default_factory=dict)
 
     # ---- Registration during loading ----
-    def register_message(self, message_id: str, message_obj):
+    def register_message(self, message_id: int, message_obj, db_index: int = 0):
         self.message_children.setdefault(message_id, [])
+        self.message_keys[message_id] = MessageKey.of(db_index, message_obj)
 
         # Sender (first sender if list)
         sender = None
@@ -346,13 +576,14 @@ class SelectionController:
             pass
         self.message_receivers[message_id] = recs
         for r in recs:
-            self.node_rx_messages.setdefault(r, set()).add(message_id)
+            self._add_node_rx_message(r, message_id)
 
-    def register_signal(self, message_id: str, signal_id: str, signal_obj):
+    def register_signal(self, message_id: int, signal_id: int, signal_obj):
         # Link signal under message
         self.message_children.setdefault(message_id, []).append(signal_id)
 
         self.signal_to_message[signal_id] = message_id
+        self.signal_names[signal_id] = signal_obj.name
 
         # Receivers at signal level (preferred)
         recs: Set[str] = set()
@@ -369,47 +600,82 @@ class SelectionController:
 
         for r in recs:
             self.node_rx_signals.setdefault(r, []).append(signal_id)
-            self.node_rx_messages.setdefault(r, set()).add(message_id)
+            self._add_node_rx_message(r, message_id)
+
+    def _add_node_rx_message(self, node_name: str, message_id: int):
+        self.node_rx_messages.setdefault(node_name, set()).add(message_id)
+        self.message_rx_nodes.setdefault(message_id, set()).add(node_name)
 
     # ---- GUI callbacks ----
-    def on_message_toggle(self, message_id: str, which: str, checked: bool):
+    def on_message_toggle(self, message_id: int, which: str, checked: bool):
         # which is 'RX' or 'TX' → same effect: (de)select all child signals
-        for sig_id in self.message_children.get(message_id, []):
-            self._set_signal_checked(sig_id, checked)
-
-        # After toggling a message, update the corresponding node cell(s)
-        # TX side: sender node
-        sender = self.message_sender.get(message_id)
-        if sender:
-            self._update_node_tx_state(sender)
-        # RX side: all receiver nodes for this message
-        for node in self._receivers_for_message(message_id):
-            self._update_node_rx_state(node)
+        with self.batch_update():
+            self._set_message_cell(message_id, which, checked)
+            self.model.set_message_signals_checked(message_id, checked)
 
     def on_node_toggle(self, node_name: str, which: str, checked: bool):
-        if which == 'TX':
-            # Toggle all messages that this node transmits
-            for msg_id in self.node_tx_messages.get(node_name, []):
-                # Toggling the message cell will also toggle its signals via on_message_toggle
-                self.tree.set_message_cell_checked(msg_id, 'TX', checked)
-                self.on_message_toggle(msg_id, 'TX', checked)
-            # Ensure node TX cell reflects the aggregate
-            self.nodes_tree.set_node_cell_checked(node_name, 'TX', self._all_node_tx_messages_checked(node_name))
-        else:  # 'RX'
-            # Toggle all messages where this node is a receiver
-            for msg_id in self.node_rx_messages.get(node_name, set()):
-                self.tree.set_message_cell_checked(msg_id, 'RX', checked)
-                self.on_message_toggle(msg_id, 'RX', checked)
-            # Ensure node RX cell reflects the aggregate
-            self.nodes_tree.set_node_cell_checked(node_name, 'RX', self._all_node_rx_messages_checked(node_name))
+        with self.batch_update():
+            if which == 'TX':
+                # Toggle all messages that this node transmits
+                messages = self.node_tx_messages.get(node_name, [])
+            else:  # 'RX'
+                # Toggle all messages where this node is a receiver
+                messages = self.node_rx_messages.get(node_name, set())
+
+            for msg_id in messages:
+                self._set_message_cell(msg_id, which, checked)
+                self.model.set_message_signals_checked(msg_id, checked)
+
+            # Ensure the node cell reflects the aggregate even if no message changed
+            self._dirty_nodes.add((node_name, which))
+
+    # ---- Batch updates ----
+    @contextmanager
+    def batch_update(self):
+        """
+        Group check state changes into one update.
+
+        Model change notifications are coalesced per message and node cells
+        are refreshed once from their counters when the outermost batch ends.
+        """
+        self._batch_depth += 1
+        self.model.begin_batch()
+        try:
+            yield
+        finally:
+            self.model.end_batch()
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_node_states()
+
+    def _flush_node_states(self):
+        dirty, self._dirty_nodes = self._dirty_nodes, set()
+        for node_name, which in dirty:
+            self.nodes_tree.set_node_cell_checked(node_name, which, self._all_node_messages_checked(node_name, which))
 
     # ---- Helpers ----
-    def _set_signal_checked(self, signal_id: str, checked: bool):
-        item = self.tree._item_map.get(signal_id)
-        if item is not None:
-            item.setCheckState(0, Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+    def _set_message_cell(self, message_id: int, which: str, checked: bool):
+        """Set a message RX/TX cell and keep the per-node checked counters in sync."""
+        checked = bool(checked)
+        if self.model.is_message_cell_checked(message_id, which) == checked:
+            return
+
+        self.model.set_message_cell_checked(message_id, which, checked)
+
+        if which == 'TX':
+            sender = self.message_sender.get(message_id)
+            nodes = (sender,) if sender else ()
+            counters = self.node_tx_checked
+        else:
+            nodes = self.message_rx_nodes.get(message_id, ())
+            counters = self.node_rx_checked
+
+        delta = 1 if checked else -1
+        for node in nodes:
+            counters[node] = counters.get(node, 0) + delta
+            self._dirty_nodes.add((node, which))
 
-    def _receivers_for_message(self, message_id: str) -> Set[str]:
+    def _receivers_for_message(self, message_id: int) -> Set[str]:
         nodes: Set[str] = set()
         for sig_id in self.message_children.get(message_id, []):
             nodes.update(self.signal_receivers.get(sig_id, set()))
@@ -417,42 +683,39 @@ class SelectionController:
             nodes.update(self.message_receivers.get(message_id, set()))
         return nodes
 
+    def _all_node_messages_checked(self, node_name: str, which: str) -> bool:
+        if which == 'TX':
+            return self._all_node_tx_messages_checked(node_name)
+        return self._all_node_rx_messages_checked(node_name)
+
     def _all_node_tx_messages_checked(self, node_name: str) -> bool:
-        msgs = self.node_tx_messages.get(node_name, [])
-        if not msgs:
-            return False
-        return all(self.tree.is_message_cell_checked(mid, 'TX') for mid in msgs)
+        total = len(self.node_tx_messages.get(node_name, []))
+        return total > 0 and self.node_tx_checked.get(node_name, 0) == total
 
     def _all_node_rx_messages_checked(self, node_name: str) -> bool:
-        msgs = list(self.node_rx_messages.get(node_name, set()))
-        if not msgs:
-            return False
-        return all(self.tree.is_message_cell_checked(mid, 'RX') for mid in msgs)
-
-    def _update_node_tx_state(self, node_name: str):
-        self.nodes_tree.set_node_cell_checked(node_name, 'TX', self._all_node_tx_messages_checked(node_name))
-
-    def _update_node_rx_state(self, node_name: str):
-        self.nodes_tree.set_node_cell_checked(node_name, 'RX', self._all_node_rx_messages_checked(node_name))
+        total = len(self.node_rx_messages.get(node_name, set()))
+        return total > 0 and self.node_rx_checked.get(node_name, 0) == total
 
     def select_all(self):
         """Select all nodes/messages/signals, but only in directions that exist for each node."""
-        # 1) All TX-capable nodes → check TX
-        for node in list(self.node_tx_messages.keys()):
-            # This cascades to mark all its messages and signals TX-checked
-            self.on_node_toggle(node, 'TX', True)
-        # 2) All RX-capable nodes → check RX
-        for node in list(self.node_rx_messages.keys()):
-            self.on_node_toggle(node, 'RX', True)
+        with self.batch_update():
+            # 1) All TX-capable nodes → check TX
+            for node in list(self.node_tx_messages.keys()):
+                # This cascades to mark all its messages and signals TX-checked
+                self.on_node_toggle(node, 'TX', True)
+            # 2) All RX-capable nodes → check RX
+            for node in list(self.node_rx_messages.keys()):
+                self.on_node_toggle(node, 'RX', True)
 
     def unselect_all(self):
         """Clear all nodes/messages/signals for both RX and TX (only where applicable)."""
-        # 1) All TX-capable nodes → uncheck TX
-        for node in list(self.node_tx_messages.keys()):
-            self.on_node_toggle(node, 'TX', False)
-        # 2) All RX-capable nodes → uncheck RX
-        for node in list(self.node_rx_messages.keys()):
-            self.on_node_toggle(node, 'RX', False)
+        with self.batch_update():
+            # 1) All TX-capable nodes → uncheck TX
+            for node in list(self.node_tx_messages.keys()):
+                self.on_node_toggle(node, 'TX', False)
+            # 2) All RX-capable nodes → uncheck RX
+            for node in list(self.node_rx_messages.keys()):
+                self.on_node_toggle(node, 'RX', False)
 
     def apply_enable_states(self):
         """Enable/disable node/message RX/TX checkboxes according to DBC topology."""
@@ -467,14 +730,83 @@ class SelectionController:
         # Messages: enable RX only if there is at least one receiver (signal or message level)
         for msg_id in self.message_children.keys():
             has_rx = len(self._receivers_for_message(msg_id)) > 0
-            self.tree.set_message_cell_enabled(msg_id, 'RX', has_rx)
+            self.model.set_message_cell_enabled(msg_id, 'RX', has_rx)
         # (Optional) Symmetry for TX: enable only if sender exists
         # for msg_id, sender in self.message_sender.items():
-        #     self.tree.set_message_cell_enabled(msg_id, 'TX', bool(sender))
+        #     self.model.set_message_cell_enabled(msg_id, 'TX', bool(sender))
 
-    def on_signal_toggled(self, signal_id: str):
+    def on_signal_toggled(self, signal_id: int):
         return
 
+    def remap_databases(self, positions: Dict[int, int]):
+        """Re-key the messages from the index of their file to the position of their database in the loaded list."""
+        self.message_keys = {
+            message_id: key._replace(db_index=positions[key.db_index])
+            for message_id, key in self.message_keys.items()
+        }
+
+    def build_selection(self) -> Selection:
+        """Build the Selection of checked signals and message RX/TX modes."""
+        selection = Selection()
+
+        for message_id, signal_ids in self.message_children.items():
+            signals = [self.signal_names[sig_id] for sig_id in signal_ids if self.model.is_signal_checked(sig_id)]
+            if not signals:
+                continue
+
+            key = self.message_keys[message_id]
+            selection.add_message(
+                key.db_index,
+                key.frame_id,
+                key.is_extended,
+                signals=signals,
+                rx=self.model.is_message_cell_checked(message_id, "RX"),
+                tx=self.model.is_message_cell_checked(message_id, "TX")
+            )
+
+        return selection
+
+
+class DbcLoadWorker(QObject):
+    """
+    Loads DBC files in a background thread.
+
+    Parsing runs in a process pool (see utils.dbc_loader), results are sent
+    to the UI thread through Qt signals as soon as each file is parsed.
+    Every signal carries the generation of the loading, so the UI can ignore
+    queued signals of a cancelled worker.
+    """
+    file_loaded = pyqtSignal(int, int, object)  # generation, index in file list, database
+    file_failed = pyqtSignal(int, str, str)     # generation, file path, error message
+    progress = pyqtSignal(int, int, int)        # generation, finished files, total files
+    finished = pyqtSignal(int)                  # generation
+
+    def __init__(self, file_paths: List[str], generation: int = 0):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.generation = generation
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        done = 0
+        try:
+            for result in iter_load_dbc_files(self.file_paths, cancel_event=self._cancel_event):
+                if self._cancel_event.is_set():
+                    break
+                if result.error is not None:
+                    self.file_failed.emit(self.generation, result.file_path, result.error)
+                else:
+                    self.file_loaded.emit(self.generation, result.index, result.db)
+                done += 1
+                self.progress.emit(self.generation, done, len(self.file_paths))
+        except Exception as e:
+            self.file_failed.emit(self.generation, ", ".join(self.file_paths), str(e))
+        finally:
+            self.finished.emit(self.generation)
+
 
 class DBCLibraryGenerator(QMainWindow):
     def __init__(self):
@@ -483,7 +815,8 @@ class DBCLibraryGenerator(QMainWindow):
         self.nodes_tree = None
         self.setWindowTitle("CAN Library Generator")
         self.dbs = []  # List of loaded DBC databases
-        self.tree = None  # CheckableTreeWidget for messages and signals
+        self.tree = None  # MessageTreeView for messages and signals
+        self.tree_model = None  # MessageTreeModel shown by self.tree
         self.files_label = None  # Label for selected files
         self.library_name_entry = None  # Entry for library name
         self.language_group = None  # QButtonGroup for language selection
@@ -495,6 +828,15 @@ class DBCLibraryGenerator(QMainWindow):
         self.chk_crc = None
         self.chk_callback = None
 
+        # Background DBC loading state
+        self._load_thread = None
+        self._load_worker = None
+        self._load_progress = None
+        self._load_generation = 0  # signals of workers from older generations are ignored
+        self._load_threads = set()  # loader threads kept alive until they finish, also after a cancellation
+        self._loaded_dbs = {}
+        self._node_names = set()
+
         self.setup_gui()
         self.apply_theme()
 
@@ -561,7 +903,7 @@ class DBCLibraryGenerator(QMainWindow):
         QRadioButton {
             spacing: 5px; /* Space between radio button and text */
         }
-        QTreeWidget {
+        QTreeView {
             border: 1px solid; /* Defined by theme */
             border-radius: 4px;
             padding: 2px;
@@ -574,13 +916,13 @@ class DBCLibraryGenerator(QMainWindow):
             font-weight: bold;
             text-align: center; /* Center align header text */
         }
-        QTreeWidget::item {
+        QTreeView::item {
             padding: 3px 0; /* Padding for tree items */
         }
-        QTreeWidget::item:hover {
+        QTreeView::item:hover {
             /* Handled by theme specific styles */
         }
-        QTreeWidget::item:selected {
+        QTreeView::item:selected {
             /* Handled by theme specific styles */
         }
         QScrollBar:vertical {
@@ -654,7 +996,7 @@ class DBCLibraryGenerator(QMainWindow):
             QRadioButton {
                 color: #F0F0F0;
             }
-            QTreeWidget {
+            QTreeView {
                 background-color: #3A3A3A; /* sv_ttk treeview background */
                 color: #F0F0F0;
                 border-color: #4A4A4A; /* sv_ttk treeview border */
@@ -664,10 +1006,10 @@ class DBCLibraryGenerator(QMainWindow):
                 background-color: #3A3A3A; /* sv_ttk header background */
                 color: #F0F0F0;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: rgba(0, 120, 215, 0.2); /* Light blue hover */
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: rgba(0, 120, 215, 0.4); /* Darker blue selected */
             }
             QScrollBar::handle:vertical {
@@ -714,7 +1056,7 @@ class DBCLibraryGenerator(QMainWindow):
             QRadioButton {
                 color: #333333;
             }
-            QTreeWidget {
+            QTreeView {
                 color: #333333;
                 border-color: #BBBBBB; /* sv_ttk treeview border */
                 alternate-background-color: #F8F8F8; /* For alternating row colors */
@@ -723,10 +1065,10 @@ class DBCLibraryGenerator(QMainWindow):
                 background-color: #EEEEEE; /* sv_ttk header background */
                 color: #333333;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: rgba(0, 120, 215, 0.1); /* Light blue hover */
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: rgba(0, 120, 215, 0.2); /* Darker blue selected */
             }
             QScrollBar::handle:vertical {
@@ -801,8 +1143,9 @@ class DBCLibraryGenerator(QMainWindow):
         tree_layout.setContentsMargins(15, 20, 15, 10)
         tree_layout.setSpacing(5)
 
-        # CheckableTreeWidget for messages and signals
-        self.tree = CheckableTreeWidget()
+        # Virtualized tree view for messages and signals
+        self.tree_model = MessageTreeModel(self)
+        self.tree = MessageTreeView(self.tree_model)
         self.tree.header().setStretchLastSection(False)  # Prevent last column from stretching automatically
         self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)  # Make Name column stretchable
         self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
@@ -812,8 +1155,8 @@ class DBCLibraryGenerator(QMainWindow):
         tree_layout.addWidget(self.tree)
         main_layout.addWidget(tree_frame, 1)  # Stretch factor 1 for tree frame
 
-        self.controller = SelectionController(self.tree, self.nodes_tree)
-        self.tree.set_controller(self.controller)
+        self.controller = SelectionController(self.tree_model, self.nodes_tree)
+        self.tree_model.set_controller(self.controller)
         self.nodes_tree.set_controller(self.controller)
 
         # --- Bottom Frame: Controls and Generation ---
@@ -937,75 +1280,149 @@ class DBCLibraryGenerator(QMainWindow):
             "DBC files (*.dbc)"
         )
         if file_paths:
+            self.cancel_loading()
+
             shortened_file_paths = [os.path.basename(file_path) for file_path in file_paths]
             self.files_label.setText(f"Selected files: {', '.join(shortened_file_paths)}")
             self.dbs.clear()
-            self.tree.clear()
+            self.tree_model.clear()
             # reinit controller so indices are clean
-            self.controller = SelectionController(self.tree, self.nodes_tree)
-            self.tree.set_controller(self.controller)
+            self.controller = SelectionController(self.tree_model, self.nodes_tree)
+            self.tree_model.set_controller(self.controller)
             self.nodes_tree.set_controller(self.controller)
             if hasattr(self, 'nodes_tree'):
                 self.nodes_tree.clear()
 
-            node_names = set()
-
-            for file_path in file_paths:
-                try:
-                    db = cantools.database.load_file(file_path)
-                    db.name = os.path.basename(file_path)
-                    self.dbs.append(db)
-
-                    # --- Collect nodes for the top widget ---
-                    if hasattr(db, 'nodes') and db.nodes:
-                        for n in db.nodes:
-                            name = getattr(n, 'name', str(n))
-                            if name:
-                                node_names.add(name)
-                    else:
-                        # Fallback: derive from message senders/receivers
-                        for message in db.messages:
-                            for s in getattr(message, 'senders', []) or []:
-                                if s:
-                                    node_names.add(s)
-                            rec = getattr(message, 'receivers', []) or []
-                            for r in (rec if isinstance(rec, (list, tuple, set)) else [rec]):
-                                if r:
-                                    node_names.add(r)
-
-                    # --- Populate Messages & Signals (your existing behavior) ---
-                    for message in db.messages:
-                        message_id = self.tree.add_item(None, message.name, ("Message", hex(message.frame_id)))
-                        self.controller.register_message(message_id, message)
-                        for signal in message.signals:
-                            signal_id = self.tree.add_item(message_id, signal.name, ("Signal", ""))
-                            self.controller.register_signal(message_id, signal_id, signal)
-
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Can't read DBC file {file_path}: {e}")
-
-            # --- Render collected nodes ---
-            if hasattr(self, 'nodes_tree'):
-                for name in sorted(node_names):
-                    self.nodes_tree.add_node(name)
-
-            self.controller.apply_enable_states()
-
-    def build_message_mode_map(self) -> dict:
-        """Returns { message_id: {"rx": bool, "tx": bool} } for every message."""
-        modes = {}
-        for message_id in self.controller.message_children.keys():
-            modes[message_id] = {
-                "rx": bool(self.tree.is_message_cell_checked(message_id, "RX")),
-                "tx": bool(self.tree.is_message_cell_checked(message_id, "TX")),
-            }
-        return modes
+            self._node_names = set()
+            self._loaded_dbs = {}
+
+            # --- Parse files in a process pool, populate widgets as each file completes ---
+            self._load_progress = QProgressDialog("Loading DBC files...", "Cancel", 0, len(file_paths), self)
+            self._load_progress.setWindowTitle("Loading")
+            self._load_progress.setWindowModality(Qt.WindowModality.WindowModal)
+            self._load_progress.setMinimumDuration(300)
+            self._load_progress.setValue(0)
+
+            thread = QThread(self)
+            worker = DbcLoadWorker(file_paths, self._load_generation)
+            worker.moveToThread(thread)
+
+            thread.started.connect(worker.run)
+            worker.file_loaded.connect(self._on_file_loaded)
+            worker.file_failed.connect(self._on_file_failed)
+            worker.progress.connect(self._on_load_progress)
+            worker.finished.connect(self._on_loading_finished)
+            worker.finished.connect(thread.quit)
+            thread.finished.connect(worker.deleteLater)
+            thread.finished.connect(thread.deleteLater)
+            thread.finished.connect(lambda: self._load_threads.discard(thread))
+            # Not a queued slot call: the worker's thread is busy in run() until the loading ends
+            self._load_progress.canceled.connect(lambda: worker.cancel())
+
+            self._load_thread = thread
+            self._load_worker = worker
+            self._load_threads.add(thread)
+            thread.start()
+
+    def cancel_loading(self):
+        """
+        Cancel a running DBC loading without waiting for the loader thread.
+
+        The worker stops its parser processes and ends on its own, signals it
+        already queued are ignored by their stale generation.
+        """
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+        self._load_thread = None
+        self._load_worker = None
+
+        # Signals the old worker already queued belong to a stale generation now
+        self._load_generation += 1
+        self._close_load_progress()
+
+    def _close_load_progress(self):
+        """Close the loading progress dialog, reset() stops its timer that would show it again."""
+        progress, self._load_progress = self._load_progress, None
+        if progress is not None:
+            progress.canceled.disconnect()
+            progress.reset()
+            progress.close()
+
+    def closeEvent(self, event):
+        self.cancel_loading()
+
+        # A cancelled worker ends within one poll of the loader, a running QThread must not be destroyed
+        for thread in list(self._load_threads):
+            thread.wait()
+        super().closeEvent(event)
+
+    def _on_load_progress(self, generation: int, done: int, total: int):
+        if generation != self._load_generation:
+            return
+
+        progress = self._load_progress
+        if progress is not None:
+            progress.setLabelText(f"Loaded {done} of {total} DBC files...")
+            progress.setValue(done)  # may process events of a modal dialog
+
+    def _on_file_failed(self, generation: int, file_path: str, error: str):
+        if generation != self._load_generation:
+            return
+
+        QMessageBox.critical(self, "Error", f"Can't read DBC file {file_path}: {error}")
+
+    def _on_file_loaded(self, generation: int, index: int, db):
+        if generation != self._load_generation:
+            return
+
+        self._loaded_dbs[index] = db
+
+        # --- Collect nodes for the top widget ---
+        if hasattr(db, 'nodes') and db.nodes:
+            for n in db.nodes:
+                name = getattr(n, 'name', str(n))
+                if name:
+                    self._node_names.add(name)
+        else:
+            # Fallback: derive from message senders/receivers
+            for message in db.messages:
+                for s in getattr(message, 'senders', []) or []:
+                    if s:
+                        self._node_names.add(s)
+                rec = getattr(message, 'receivers', []) or []
+                for r in (rec if isinstance(rec, (list, tuple, set)) else [rec]):
+                    if r:
+                        self._node_names.add(r)
+
+        # --- Populate Messages & Signals (rows are created lazily by the view) ---
+        for message_id, message, signal_ids in self.tree_model.add_database(db):
+            self.controller.register_message(message_id, message, index)
+            for signal_id, signal in zip(signal_ids, message.signals):
+                self.controller.register_signal(message_id, signal_id, signal)
+
+    def _on_loading_finished(self, generation: int):
+        if generation != self._load_generation:
+            return
+
+        # Keep databases in the order of the selected files for stable output
+        order = sorted(self._loaded_dbs)
+        self.dbs[:] = [self._loaded_dbs[index] for index in order]
+
+        # Files that failed to load are left out, message keys refer to the position in self.dbs
+        self.controller.remap_databases({index: position for position, index in enumerate(order)})
+
+        # --- Render collected nodes ---
+        if hasattr(self, 'nodes_tree'):
+            for name in sorted(self._node_names):
+                self.nodes_tree.add_node(name)
+
+        self.controller.apply_enable_states()
+        self._close_load_progress()
 
     def generate_library(self):
         """Generate C/C++ library from selected messages and signals."""
-        selected_items_ids = self.tree.get_checked()
-        message_modes = self.build_message_mode_map()
-        if not selected_items_ids:
+        selection = self.controller.build_selection()
+        if not selection:
             QMessageBox.warning(self, "Warning", "No items selected for generation.")
             return
 
@@ -1034,41 +1451,22 @@ class DBCLibraryGenerator(QMainWindow):
         generate_callback = self.chk_callback.isChecked()
 
         try:
-            lib_dir = os.path.join(directory, library_name)
-            inc_dir = os.path.join(lib_dir, "inc")
-            src_dir = os.path.join(lib_dir, "src")
-
-            os.makedirs(inc_dir, exist_ok=True)
-            os.makedirs(src_dir, exist_ok=True)
-
             if language == "c":
                 ext_h, ext_c = ".h", ".c"
                 contents = generate_c_code(
-                    selected_items_ids, library_name, self.dbs, self.tree, __version__, message_modes=message_modes, embedded=embedded, with_units=with_units,
-                    generate_counter=generate_counter, generate_crc=generate_crc, generate_callback=generate_callback
+                    selection, library_name, self.dbs, __version__, embedded=embedded, with_units=with_units,
+                    generate_counter=generate_counter, generate_crc=generate_crc, generate_callback=generate_callback,
+                    stream=True
                 )
             else:
                 ext_h, ext_c = ".hpp", ".cpp"
                 contents = generate_cpp_code(
-                    selected_items_ids, library_name, self.dbs, self.tree, __version__, message_modes=message_modes, embedded=embedded, with_units=with_units,
-                    generate_counter=generate_counter, generate_crc=generate_crc, generate_callback=generate_callback
+                    selection, library_name, self.dbs, __version__, embedded=embedded, with_units=with_units,
+                    generate_counter=generate_counter, generate_crc=generate_crc, generate_callback=generate_callback,
+                    stream=True
                 )
 
-            def_h, db_h, db_c, int_h, int_c = contents
-
-            files_to_write = {
-                os.path.join(inc_dir, f"{library_name}_db{ext_h}"): db_h,
-                os.path.join(src_dir, f"{library_name}_db{ext_c}"): db_c,
-                os.path.join(inc_dir, f"{library_name}_interface{ext_h}"): int_h,
-                os.path.join(src_dir, f"{library_name}_interface{ext_c}"): int_c
-            }
-
-            if self.chk_gen_def.isChecked():
-                files_to_write[os.path.join(inc_dir, f"can_db_def{ext_h}")] = def_h
-
-            for filepath, content in files_to_write.items():
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(content)
+            write_library(contents, directory, library_name, language, generate_def=self.chk_gen_def.isChecked())
 
             QMessageBox.information(self, "Success",
                                     f"Generated {library_name}_db{ext_c} and {library_name}_interface{ext_c}\n"
@@ -1081,6 +1479,7 @@ class DBCLibraryGenerator(QMainWindow):
 
 
 def main():
+    multiprocessing.freeze_support()
     print(f"cantools version: {cantools.__version__}")
     app = QApplication(sys.argv)
     window = DBCLibraryGenerator()
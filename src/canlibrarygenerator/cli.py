@@ -0,0 +1,285 @@
+"""
+Headless command-line entry point of CAN Library Generator.
+
+Generates C/C++ libraries from DBC files without the GUI. Only cantools,
+Jinja2 and the IR/renderer modules are imported, so the tool starts quickly
+and does not need PyQt6 or a display.
+
+Example:
+    python -m canlibrarygenerator.cli powertrain.dbc body.dbc -o out --name ecu \\
+        --node ECU:rxtx --message msgMotor_01:tx --signal msgBrake.sigPressure
+"""
+
+import argparse
+import os
+import sys
+
+from .generate_functions.generate_targets import Target, generate_targets
+from .generate_functions.write_library import write_library
+from .ir.lookup import LOOKUP_STRATEGIES
+from .ir.options import GenerationOptions
+from .ir.precision import PHYS_TYPES
+from .ir.selection import Selection
+from .utils.dbc_cache import DBCCache
+from .utils.dbc_loader import load_dbc_files
+
+
+MODE_FLAGS = {
+    "": {"rx": False, "tx": False},
+    "rx": {"rx": True, "tx": False},
+    "tx": {"rx": False, "tx": True},
+    "rxtx": {"rx": True, "tx": True},
+}
+
+
+class SelectionError(ValueError):
+    """Raised when a selection spec does not match the loaded databases."""
+
+
+def _get_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("canlibrarygenerator")
+    except Exception:
+        return "dev"
+
+
+def _split_mode(spec: str):
+    """
+    Split "NAME[:rx|tx|rxtx]" into the name and RX/TX flags.
+    """
+    name, sep, mode = spec.rpartition(":")
+    if not sep:
+        name, mode = spec, ""
+
+    mode = mode.strip().lower()
+    if mode == "txrx":
+        mode = "rxtx"
+
+    if mode not in MODE_FLAGS:
+        raise SelectionError(f"Invalid mode '{mode}' in '{spec}' (expected rx, tx or rxtx).")
+
+    return name.strip(), dict(MODE_FLAGS[mode])
+
+
+def _message_rx_nodes(message) -> set:
+    """
+    Nodes receiving a message, either on message level or on any of its signals.
+    """
+    nodes = {r for r in (message.receivers or []) if r}
+    for sig in message.signals:
+        nodes.update(r for r in (sig.receivers or []) if r)
+    return nodes
+
+
+def resolve_selection(dbs, select_all=False, nodes=(), messages=(), signals=()) -> Selection:
+    """
+    Resolve a node/message/signal selection spec against loaded databases.
+
+    Node and message specs select whole messages, signal specs add single
+    signals. Names are matched in every loaded database. RX/TX modes are
+    merged, so a message selected both as RX and TX ends up with both modes.
+
+    Args:
+        dbs: Loaded cantools databases.
+        select_all: Select every message like the GUI "Select All" button.
+        nodes: Specs "NODE[:rx|tx|rxtx]" selecting messages sent (tx) or received (rx) by the node.
+        messages: Specs "MESSAGE[:rx|tx|rxtx]" selecting a message with all its signals.
+        signals: Specs "MESSAGE.SIGNAL" selecting a single signal.
+
+    Returns:
+        Selection of the matched messages and signals.
+    """
+    by_name = {}
+    for db_index, db in enumerate(dbs):
+        for message in db.messages:
+            by_name.setdefault(message.name, []).append((db_index, message))
+
+    selection = Selection()
+
+    if select_all:
+        for entries in by_name.values():
+            for db_index, message in entries:
+                selection.add_message(
+                    db_index, message.frame_id, message.is_extended_frame,
+                    rx=bool(_message_rx_nodes(message)), tx=bool(message.senders)
+                )
+
+    for spec in nodes:
+        node, modes = _split_mode(spec)
+        if not modes["rx"] and not modes["tx"]:
+            modes = dict(MODE_FLAGS["rxtx"])
+
+        matched = False
+        for entries in by_name.values():
+            for db_index, message in entries:
+                is_tx = modes["tx"] and bool(message.senders) and message.senders[0] == node
+                is_rx = modes["rx"] and node in _message_rx_nodes(message)
+                if is_tx or is_rx:
+                    selection.add_message(db_index, message.frame_id, message.is_extended_frame, rx=is_rx, tx=is_tx)
+                    matched = True
+
+        if not matched:
+            raise SelectionError(f"Node '{node}' does not send or receive any message.")
+
+    for spec in messages:
+        name, modes = _split_mode(spec)
+        if name not in by_name:
+            raise SelectionError(f"Message '{name}' not found.")
+        for db_index, message in by_name[name]:
+            selection.add_message(db_index, message.frame_id, message.is_extended_frame,
+                                  rx=modes["rx"], tx=modes["tx"])
+
+    for spec in signals:
+        msg_name, sep, sig_name = spec.partition(".")
+        if not sep or msg_name not in by_name:
+            raise SelectionError(f"Signal spec '{spec}' does not match any MESSAGE.SIGNAL.")
+
+        matched = False
+        for db_index, message in by_name[msg_name]:
+            if any(sig.name == sig_name for sig in message.signals):
+                selection.add_signal(db_index, message.frame_id, message.is_extended_frame, sig_name)
+                matched = True
+
+        if not matched:
+            raise SelectionError(f"Signal '{sig_name}' not found in message '{msg_name}'.")
+
+    return selection
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m canlibrarygenerator.cli",
+        description="Generate C/C++ CAN libraries from DBC files without the GUI.",
+        fromfile_prefix_chars="@",
+    )
+    parser.add_argument("dbc_files", nargs="+", metavar="DBC", help="DBC files to load.")
+    parser.add_argument("-o", "--output", required=True, help="Directory in which the library folder is created.")
+    parser.add_argument("-n", "--name", default="cangen", help="Library name/prefix (default: cangen).")
+    parser.add_argument("-l", "--language", choices=("c", "cpp", "both"), default="c",
+                        help="Language of the generated library (default: c).")
+
+    selection = parser.add_argument_group("selection")
+    selection.add_argument("--all", dest="select_all", action="store_true",
+                           help="Select all messages and signals (RX/TX set from DBC topology).")
+    selection.add_argument("--node", action="append", default=[], metavar="NODE[:rx|tx|rxtx]",
+                           help="Select messages sent (tx) and/or received (rx) by a node. Repeatable.")
+    selection.add_argument("--message", action="append", default=[], metavar="MESSAGE[:rx|tx|rxtx]",
+                           help="Select a message with all its signals. Repeatable.")
+    selection.add_argument("--signal", action="append", default=[], metavar="MESSAGE.SIGNAL",
+                           help="Select a single signal of a message. Repeatable.")
+
+    cache = parser.add_argument_group("DBC cache")
+    cache.add_argument("--no-cache", dest="use_cache", action="store_false",
+                       help="Always parse DBC files, do not use the parsed database cache.")
+    cache.add_argument("--cache-dir", default=None,
+                       help="Directory of the parsed database cache (default: per-user cache directory).")
+
+    options = parser.add_argument_group("generation options")
+    options.add_argument("--embedded", action="store_true", help="Generate library for embedded platforms.")
+    options.add_argument("--with-units", action="store_true", help="Generate signal names with units.")
+    options.add_argument("--no-counter", dest="generate_counter", action="store_false",
+                         help="Do not generate message counter processing.")
+    options.add_argument("--no-crc", dest="generate_crc", action="store_false",
+                         help="Do not generate CRC processing.")
+    options.add_argument("--no-callback", dest="generate_callback", action="store_false",
+                         help="Do not generate message callbacks.")
+    options.add_argument("--no-def-header", dest="generate_def", action="store_false",
+                         help="Do not write the shared can_db_def header file.")
+    options.add_argument("--message-lookup", choices=LOOKUP_STRATEGIES, default="auto",
+                         help="CAN ID lookup of find_message: direct table, hash table or binary search "
+                              "(default: auto, chosen per frame type by ID density).")
+    options.add_argument("--unrolled-codec", action="store_true",
+                         help="Generate straight-line decode/encode functions per message instead of the generic bit loops.")
+    options.add_argument("--fixed-point", action="store_true",
+                         help="Store physical values as scaled integers with integer-only conversions (no FPU needed).")
+    options.add_argument("--phys-type", choices=PHYS_TYPES, default="double",
+                         help="Floating-point type of physical values, factors and offsets (default: double). "
+                              "float warns about signals that are not exact in single precision.")
+    options.add_argument("--split-layout", action="store_true",
+                         help="Place the constant message/signal layout in const tables (flash) and keep only "
+                              "runtime values in RAM; prints the estimated RAM saving.")
+    options.add_argument("--compact-layout", action="store_true",
+                         help="Narrow message/signal field types to the ranges in the DBC, order fields to minimize "
+                              "padding and size data buffers per message; prints the estimated size of each message.")
+    options.add_argument("--change-detection", action="store_true",
+                         help="Skip received frames identical to the stored data and decode only the signals "
+                              "whose data bytes changed; decoded signals with a new value get a changed flag.")
+    options.add_argument("--lazy-decode", action="store_true",
+                         help="Only store received frames and decode each signal on its first read through the "
+                              "generated accessors (for messages with many signals of which few are read).")
+    options.add_argument("--rx-timeout-cycles", type=int, default=3, metavar="N",
+                         help="Cycle times without reception after which a cyclic RX message times out (default: 3).")
+    options.add_argument("--rx-timeout-reset", action="store_true",
+                         help="Set the signals of a timed out RX message to their init values.")
+    options.add_argument("--reproducible", action="store_true",
+                         help="Omit the generation date from file headers unless SOURCE_DATE_EPOCH is set, "
+                              "so unchanged inputs give byte-identical files.")
+    return parser
+
+
+def load_databases(file_paths, use_cache=True, cache_dir=None):
+    """Load DBC files in parallel, keeping the order of file_paths."""
+    cache = DBCCache(cache_dir) if cache_dir else None
+    return load_dbc_files(file_paths, use_cache=use_cache, cache=cache)
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not (args.select_all or args.node or args.message or args.signal):
+        parser.error("no selection given (use --all, --node, --message or --signal)")
+
+    try:
+        dbs = load_databases(args.dbc_files, use_cache=args.use_cache, cache_dir=args.cache_dir)
+    except Exception as e:
+        print(f"Error: Can't read DBC file: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        selection = resolve_selection(dbs, args.select_all, args.node, args.message, args.signal)
+    except SelectionError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    languages = ("c", "cpp") if args.language == "both" else (args.language,)
+    options = GenerationOptions(
+        embedded=args.embedded, with_units=args.with_units, generate_counter=args.generate_counter,
+        generate_crc=args.generate_crc, generate_callback=args.generate_callback,
+        message_lookup=args.message_lookup, unrolled_codec=args.unrolled_codec,
+        fixed_point=args.fixed_point, phys_type=args.phys_type, split_layout=args.split_layout,
+        compact_layout=args.compact_layout, change_detection=args.change_detection,
+        lazy_decode=args.lazy_decode, rx_timeout_cycles=args.rx_timeout_cycles, rx_timeout_reset=args.rx_timeout_reset
+    )
+    targets = [Target(language, options) for language in languages]
+
+    try:
+        # One IR build shared by both languages, files are rendered while written
+        results = generate_targets(
+            selection, args.name, dbs, targets, _get_version(), reproducible=args.reproducible, stream=True
+        )
+    except Exception as e:
+        print(f"Error during code generation: {e}", file=sys.stderr)
+        return 1
+
+    for target in targets:
+        language = target.language
+        directory = args.output
+        if args.language == "both":
+            directory = os.path.join(args.output, language)
+
+        try:
+            written = write_library(results[target], directory, args.name, language, generate_def=args.generate_def)
+        except Exception as e:
+            print(f"Error during {language} code generation: {e}", file=sys.stderr)
+            return 1
+
+        for path, changed in written:
+            print(path if changed else f"{path} (unchanged)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
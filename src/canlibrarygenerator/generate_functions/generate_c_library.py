@@ -1,24 +1,34 @@
 from ..ir.builder import build_library_ir
-from ..renderers.c_renderer import CRenderer
+from ..renderers.c_renderer import get_c_renderer
 
 
-def generate_c_code(selected_items, library_name, dbs, tree, __version__="dev", message_modes=None, embedded=False, with_units=False,
-                    generate_counter=True, generate_crc=True, generate_callback=True):
-    """Generate C library output files"""
+def generate_c_code(selection, library_name, dbs, __version__="dev", embedded=False, with_units=False,
+                    generate_counter=True, generate_crc=True, generate_callback=True,
+                    stream=False, reproducible=False, options=None):
+    """
+    Generate C library output files.
+
+    With stream=True lazy template streams are returned instead of strings,
+    write_library then renders each file chunk by chunk straight to disk.
+    With reproducible=True the generation date is omitted (see build_library_ir).
+    options (GenerationOptions) replaces the separate option arguments when given.
+    """
 
     ir = build_library_ir(
-        selected_items=selected_items,
+        selection=selection,
         library_name=library_name,
         dbs=dbs,
-        tree=tree,
         version=__version__,
-        message_modes=message_modes or {},
         embedded=embedded,
         with_units=with_units,
         generate_counter=generate_counter,
         generate_crc=generate_crc,
-        generate_callback=generate_callback
+        generate_callback=generate_callback,
+        reproducible=reproducible,
+        options=options
     )
 
-    renderer = CRenderer()
-    return renderer.render_all(ir)
\ No newline at end of file
+    renderer = get_c_renderer()
+    if stream:
+        return renderer.stream_all(ir)
+    return renderer.render_all(ir)
@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from ..ir.builder import apply_options, build_base_ir
+from ..ir.options import GenerationOptions
+from ..renderers.c_renderer import get_c_renderer
+from ..renderers.cpp_renderer import get_cpp_renderer
+
+
+RENDERERS = {
+    "c": get_c_renderer,
+    "cpp": get_cpp_renderer,
+}
+
+
+@dataclass(frozen=True)
+class Target:
+    """One library to generate: output language and generation options."""
+    language: str                                                       # "c" or "cpp"
+    options: GenerationOptions = field(default_factory=GenerationOptions)
+
+
+def _render_target(language: str, ir):
+    """Render all files of one target, used in worker processes."""
+    return RENDERERS[language]().render_all(ir)
+
+
+def generate_targets(selection, library_name, dbs, targets: Iterable[Target], __version__="dev",
+                     reproducible=False, stream=False, parallel=False,
+                     max_workers: Optional[int] = None) -> Dict[Target, tuple]:
+    """
+    Generate several {language x options} libraries from a single IR build.
+
+    The selection dependent IR is built once, each distinct GenerationOptions
+    is derived from it by apply_options() and shared by all languages using it.
+
+    Args:
+        selection: Selected messages, signals and RX/TX modes.
+        library_name: Library name/prefix.
+        dbs: Loaded cantools databases.
+        targets: Targets to render.
+        __version__: Generator version written to the file headers.
+        reproducible: Omit the generation date unless SOURCE_DATE_EPOCH is set.
+        stream: Return lazy template streams instead of strings (see generate_c_code).
+        parallel: Render the targets in a process pool. Ignored with stream=True.
+        max_workers: Maximum number of worker processes (default: CPU count).
+
+    Returns:
+        Target -> (def header, db header, db source, interface header, interface source).
+    """
+    targets = list(dict.fromkeys(targets))
+    base = build_base_ir(selection, library_name, dbs, __version__, reproducible=reproducible)
+
+    views = {}
+    for target in targets:
+        if target.options not in views:
+            views[target.options] = apply_options(base, target.options)
+
+    if stream:
+        return {
+            target: RENDERERS[target.language]().stream_all(views[target.options])
+            for target in targets
+        }
+
+    workers = min(len(targets), max_workers or os.cpu_count() or 1)
+
+    if not parallel or workers < 2:
+        return {
+            target: RENDERERS[target.language]().render_all(views[target.options])
+            for target in targets
+        }
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            target: executor.submit(_render_target, target.language, views[target.options])
+            for target in targets
+        }
+        return {target: future.result() for target, future in futures.items()}
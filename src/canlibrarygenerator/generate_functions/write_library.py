@@ -0,0 +1,108 @@
+import hashlib
+import os
+import shutil
+from typing import NamedTuple
+
+
+LANGUAGE_EXTENSIONS = {
+    "c": (".h", ".c"),
+    "cpp": (".hpp", ".cpp"),
+}
+
+
+class WrittenFile(NamedTuple):
+    path: str
+    changed: bool       # False when the existing file already had the same content
+
+
+def _file_digest(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def write_output(filepath, content) -> bool:
+    """
+    Write one output file, leaving it untouched when the content did not change.
+
+    The content is rendered into a temporary file next to the destination.
+    If its hash equals the hash of the existing file, the temporary file is
+    dropped and the existing file keeps its modification time, so build
+    systems don't rebuild anything. Otherwise it atomically replaces the file.
+
+    Args:
+        filepath: Destination file.
+        content: Rendered string or a template stream (see generate_c_code(stream=True)),
+            which is written chunk by chunk as it is rendered.
+
+    Returns:
+        True if the file was created or changed.
+    """
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                content.dump(f)
+
+        if os.path.isfile(filepath):
+            if _file_digest(tmp_path) == _file_digest(filepath):
+                os.remove(tmp_path)
+                return False
+            shutil.copymode(filepath, tmp_path)
+
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return True
+
+
+def write_library(contents, directory, library_name, language, generate_def=True):
+    """
+    Write rendered library files into the <directory>/<library_name>/{inc,src} layout.
+
+    Args:
+        contents: Tuple returned by generate_c_code / generate_cpp_code
+            (def header, db header, db source, interface header, interface source),
+            either strings or template streams.
+        directory: Directory in which the library folder is created.
+        library_name: Library name/prefix used for the folder and file names.
+        language: "c" or "cpp".
+        generate_def: Write the shared can_db_def header as well.
+
+    Returns:
+        List of WrittenFile for every library file, unchanged files are not rewritten.
+    """
+    ext_h, ext_c = LANGUAGE_EXTENSIONS[language]
+    def_h, db_h, db_c, int_h, int_c = contents
+
+    lib_dir = os.path.join(directory, library_name)
+    inc_dir = os.path.join(lib_dir, "inc")
+    src_dir = os.path.join(lib_dir, "src")
+
+    os.makedirs(inc_dir, exist_ok=True)
+    os.makedirs(src_dir, exist_ok=True)
+
+    files_to_write = {
+        os.path.join(inc_dir, f"{library_name}_db{ext_h}"): db_h,
+        os.path.join(src_dir, f"{library_name}_db{ext_c}"): db_c,
+        os.path.join(inc_dir, f"{library_name}_interface{ext_h}"): int_h,
+        os.path.join(src_dir, f"{library_name}_interface{ext_c}"): int_c
+    }
+
+    if generate_def:
+        files_to_write[os.path.join(inc_dir, f"can_db_def{ext_h}")] = def_h
+
+    return [
+        WrittenFile(filepath, write_output(filepath, content))
+        for filepath, content in files_to_write.items()
+    ]
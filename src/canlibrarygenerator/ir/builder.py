@@ -1,6 +1,18 @@
+from .codec import build_message_codec, signal_byte_mask
+from .compact import build_compact_layout, compact_message_sizes
+from .e2e import CRC_PROFILE_ATTRIBUTE, build_crc_profiles, build_message_crcs
+from .fixed_point import build_message_fixed_points
+from .lookup import build_message_lookups
+from .memory import build_memory_report, data_buffer_size
 from .models import LibraryIR, MessageIR, SignalIR
+from .options import GenerationOptions
+from .precision import PHYS_TYPES, float32_warnings
+from .schedule import build_rx_supervision, build_tx_schedule
+from .selection import MessageKey, Selection
 from ..utils.can_utils import get_dlc_from_data_length
-from datetime import datetime
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 import re
 
@@ -224,113 +236,331 @@ def _is_can_fd_message(message, db) -> bool:
     return bool(message.is_fd)
 
 
-def build_library_ir(selected_items, library_name, dbs, tree, version, message_modes, embedded=False, with_units=False,
-                     generate_counter=True, generate_crc=True, generate_callback=True):
-    selected_messages = {}
+def build_message_index(dbs) -> Dict[MessageKey, Tuple[int, object, object]]:
+    """
+    Index all messages of the loaded databases by MessageKey.
+
+    Returns:
+        MessageKey -> (position, database, cantools message). The position keeps
+        the database/message order of the loaded files for stable output.
+    """
+    index = {}
+    position = 0
+
+    for db_index, db in enumerate(dbs):
+        for message in db.messages:
+            index.setdefault(MessageKey.of(db_index, message), (position, db, message))
+            position += 1
+
+    return index
+
+
+def _codec_start_bit(sig) -> int:
+    """
+    Start bit in the numbering of the generated codec.
+
+    Intel signals keep the DBC start bit (LSB). The DBC start bit of a Motorola
+    signal is its MSB counted from bit 0 of each byte; the codec counts Motorola
+    bits from bit 7 of byte 0 and starts at the LSB.
+    """
+    if sig.byte_order != "big_endian":
+        return sig.start
+
+    return 8 * (sig.start // 8) + 7 - sig.start % 8 + sig.length - 1
+
+
+def _build_signal_ir(sig, with_units: bool) -> SignalIR:
+    gen_sig_func_type = 0
+
+    if sig.dbc and sig.dbc.attributes and "GenSigFuncType" in sig.dbc.attributes:
+        gen_sig_func_type = int(sig.dbc.attributes["GenSigFuncType"].value)
+
+    crc_profile = _normalize_enum_name(_get_message_enum_attribute_name(sig, CRC_PROFILE_ATTRIBUTE))
+
+    return SignalIR(
+        name=sig.name,
+        code_name=_make_signal_code_name(sig.name, sig.unit or "", with_units),
+        start_bit=_codec_start_bit(sig),
+        length=sig.length,
+        is_big_endian=(sig.byte_order == "big_endian"),
+        is_signed=sig.is_signed,
+        factor=sig.scale,
+        offset=sig.offset,
+        minimum=sig.minimum or 0,
+        maximum=sig.maximum or 0,
+        unit=sig.unit or "",
+        receivers=list(sig.receivers or []),
+        raw_initial=sig.raw_initial or 0,
+        phys_initial=(sig.raw_initial or 0) * sig.scale + sig.offset,
+        gen_sig_func_type=gen_sig_func_type,
+        crc_profile=crc_profile,
+        attributes={
+            k: v.value for k, v in sig.dbc.attributes.items()
+        } if sig.dbc and sig.dbc.attributes else {}
+    )
+
+
+def _build_message_ir(message, db, signals: List[SignalIR], mode_rx: bool, mode_tx: bool) -> MessageIR:
+    cycle_time_fast = int(
+        _get_message_attribute(
+            message,
+            "GenMsgCycleTimeFast",
+            0
+        )
+    )
+
+    start_delay_time = int(
+        _get_message_attribute(
+            message,
+            "GenMsgStartDelayTime",
+            0
+        )
+    )
+
+    resolved_is_fd = _is_can_fd_message(message, db)
+
+    return MessageIR(
+        name=message.name,
+        frame_id=message.frame_id,
+        length=message.length,
+        dlc=get_dlc_from_data_length(message.length),
+        is_fd=resolved_is_fd,
+        is_extended=message.is_extended_frame,
+        cycle_time=message.cycle_time or 0,
+        senders=list(message.senders or []),
+        receivers=sorted(message.receivers or []),
+        signals=signals,
+        mode_rx=mode_rx,
+        mode_tx=mode_tx,
+        start_delay_time=start_delay_time,
+        cycle_time_fast=cycle_time_fast
+    )
+
+
+def _generation_time(reproducible: bool) -> Optional[datetime]:
+    """
+    Time written to the file headers.
+
+    SOURCE_DATE_EPOCH pins the time (https://reproducible-builds.org/specs/source-date-epoch/).
+    Without it, reproducible output has no date at all.
+    """
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if source_date_epoch:
+        try:
+            return datetime.fromtimestamp(int(source_date_epoch), tz=timezone.utc)
+        except ValueError:
+            print(f"Warning: Invalid SOURCE_DATE_EPOCH '{source_date_epoch}', ignored.")
+
+    if reproducible:
+        return None
+
+    return datetime.now()
 
-    for item in selected_items:
-        item_type = tree.item(item, "values")[0]
-        if item_type == "Signal":
-            parent = tree.parent(item)
-            msg_name = tree.item(parent, "text")
-            sig_name = tree.item(item, "text")
-            selected_messages.setdefault(msg_name, []).append(sig_name)
+
+def build_base_ir(selection: Selection, library_name, dbs, version, index=None, reproducible=False) -> LibraryIR:
+    """
+    Build the option independent library IR for the selected messages and signals.
+
+    Only the selected messages are visited, they are resolved through a message
+    index and signal membership is checked against frozen sets of the selection.
+    The result uses default GenerationOptions, use apply_options() for variants.
+
+    Args:
+        selection: Selected messages, signals and RX/TX modes.
+        library_name: Library name/prefix.
+        dbs: Loaded cantools databases.
+        version: Generator version written to the file headers.
+        index: Optional prebuilt index from build_message_index(dbs).
+        reproducible: Omit the generation date unless SOURCE_DATE_EPOCH is set,
+            so unchanged inputs give byte-identical output.
+    """
+    if index is None:
+        index = build_message_index(dbs)
+
+    selected = sorted(
+        (index[key], selection.get(key)) for key in selection if key in index
+    )
 
     messages = []
 
-    message_modes_by_name = {}
+    for (_, db, message), message_selection in selected:
+        signals = [
+            _build_signal_ir(sig, False)
+            for sig in message.signals
+            if message_selection.includes(sig.name)
+        ]
 
-    for item_id, flags in message_modes.items():
-        msg_name = tree.item(item_id, "text")
-        message_modes_by_name[msg_name] = flags
+        messages.append(
+            _build_message_ir(message, db, signals, message_selection.rx, message_selection.tx)
+        )
 
-    for db in dbs:
-        for message in db.messages:
-            if message.name not in selected_messages:
-                continue
-
-            signals = []
-            for sig in message.signals:
-                if selected_messages[message.name] and sig.name not in selected_messages[message.name]:
-                    continue
-
-                gen_sig_func_type = 0
-
-                if sig.dbc and sig.dbc.attributes and "GenSigFuncType" in sig.dbc.attributes:
-                    gen_sig_func_type = int(sig.dbc.attributes["GenSigFuncType"].value)
-
-                signals.append(
-                    SignalIR(
-                        name=sig.name,
-                        code_name=_make_signal_code_name(sig.name, sig.unit or "", with_units),
-                        start_bit=sig.start,
-                        length=sig.length,
-                        is_big_endian=(sig.byte_order == "big_endian"),
-                        is_signed=sig.is_signed,
-                        factor=sig.scale,
-                        offset=sig.offset,
-                        minimum=sig.minimum or 0,
-                        maximum=sig.maximum or 0,
-                        unit=sig.unit or "",
-                        receivers=list(sig.receivers or []),
-                        raw_initial=sig.raw_initial or 0,
-                        phys_initial=(sig.raw_initial or 0) * sig.scale + sig.offset,
-                        gen_sig_func_type=gen_sig_func_type,
-                        attributes={
-                            k: v.value for k, v in sig.dbc.attributes.items()
-                        } if sig.dbc and sig.dbc.attributes else {}
-                    )
-                )
-
-            modes = message_modes_by_name.get(message.name, {"rx": False, "tx": False})
-
-            cycle_time_fast = int(
-                _get_message_attribute(
-                    message,
-                    "GenMsgCycleTimeFast",
-                    0
-                )
-            )
-
-            start_delay_time = int(
-                _get_message_attribute(
-                    message,
-                    "GenMsgStartDelayTime",
-                    0
-                )
-            )
-
-            resolved_is_fd = _is_can_fd_message(message, db)
-
-            messages.append(
-                MessageIR(
-                    name=message.name,
-                    frame_id=message.frame_id,
-                    length=message.length,
-                    dlc=get_dlc_from_data_length(message.length),
-                    is_fd=resolved_is_fd,
-                    is_extended=message.is_extended_frame,
-                    cycle_time=message.cycle_time or 0,
-                    senders=list(message.senders or []),
-                    receivers=list(message.receivers or []),
-                    signals=signals,
-                    mode_rx=modes["rx"],
-                    mode_tx=modes["tx"],
-                    start_delay_time=start_delay_time,
-                    cycle_time_fast=cycle_time_fast
-                )
-            )
+    generated_at = _generation_time(reproducible)
+    options = GenerationOptions()
+    lookup_standard, lookup_extended = build_message_lookups(messages, options.message_lookup)
 
     return LibraryIR(
         library_name=library_name,
         generator_version=version,
         dbc_versions=[(db.name, db.version or "unknown") for db in dbs],
         messages=messages,
-        current_date=datetime.now().strftime("%d.%m.%Y"),
-        current_year=datetime.now().year,
-        embedded=embedded,
-        with_units=with_units,
-        generate_counter=generate_counter,
-        generate_crc=generate_crc,
-        generate_callback=generate_callback
-    )
\ No newline at end of file
+        current_date=generated_at.strftime("%d.%m.%Y") if generated_at else None,
+        current_year=generated_at.year if generated_at else None,
+        lookup_standard=lookup_standard,
+        lookup_extended=lookup_extended,
+        tx_schedule=build_tx_schedule(messages),
+        rx_supervision=build_rx_supervision(messages, options.rx_timeout_cycles),
+        **options.as_dict()
+    )
+
+
+def _view(obj, **changes):
+    """Shallow copy of an IR dataclass with some fields replaced, without running __init__."""
+    view = object.__new__(type(obj))
+    view.__dict__.update(obj.__dict__, **changes)
+    return view
+
+
+def apply_options(ir: LibraryIR, options: GenerationOptions) -> LibraryIR:
+    """
+    Return a view of a base IR for the given generation options.
+
+    The base IR is not modified. Messages and signals are shared with the base
+    IR unless an option changes them (signal code names with units, unrolled
+    codec fields, fixed-point scalings, TX message CRCs), so deriving a variant is much cheaper
+    than building the IR again. The split layout also prints its memory estimate,
+    the compact layout the size of its structures and of each message.
+    """
+    if options.phys_type not in PHYS_TYPES:
+        raise ValueError(f"Unknown physical value type '{options.phys_type}', expected one of: {', '.join(PHYS_TYPES)}.")
+    if options.lazy_decode and options.change_detection:
+        raise ValueError("Lazy decoding can't be combined with change detection, which decodes signals to flag them.")
+    if options.rx_timeout_cycles < 1:
+        raise ValueError(f"RX timeout must be at least one cycle time, got {options.rx_timeout_cycles}.")
+
+    messages = ir.messages
+    lookups = {}
+
+    if options.phys_type == "float" and not options.fixed_point:
+        for warning in float32_warnings(messages):
+            print(f"Warning: {warning}")
+
+    if options.message_lookup != ir.message_lookup:
+        lookups["lookup_standard"], lookups["lookup_extended"] = build_message_lookups(messages, options.message_lookup)
+
+    rx_supervision = ir.rx_supervision
+    if options.rx_timeout_cycles != ir.rx_timeout_cycles:
+        rx_supervision = build_rx_supervision(messages, options.rx_timeout_cycles)
+
+    if options.with_units:
+        # Base code names are the sanitized signal names, only the unit suffix is added
+        unit_suffixes = {}
+
+        def code_name(sig):
+            if sig.unit not in unit_suffixes:
+                unit_suffixes[sig.unit] = _sanitize_identifier_part(sig.unit)
+            suffix = unit_suffixes[sig.unit]
+            return f"{sig.code_name}_{suffix}" if suffix else sig.code_name
+
+        messages = [
+            _view(msg, signals=[_view(sig, code_name=code_name(sig)) for sig in msg.signals])
+            for msg in messages
+        ]
+
+    if options.unrolled_codec:
+        unrolled = []
+
+        for msg in messages:
+            codecs, encode_masked = build_message_codec(msg)
+            signals = [
+                _view(sig, decode_fields=decode_fields, encode_fields=encode_fields)
+                for sig, (decode_fields, encode_fields) in zip(msg.signals, codecs)
+            ]
+            unrolled.append(_view(msg, signals=signals, encode_masked=encode_masked))
+
+        messages = unrolled
+
+    if options.fixed_point:
+        scalings, fixed_point_warnings = build_message_fixed_points(messages)
+        for warning in fixed_point_warnings:
+            print(f"Warning: {warning}")
+        messages = [
+            _view(msg, signals=[_view(sig, fixed=fixed) for sig, fixed in zip(msg.signals, msg_scalings)])
+            for msg, msg_scalings in zip(messages, scalings)
+        ]
+
+    if options.change_detection:
+        messages = [
+            _view(msg, signals=[_view(sig, byte_mask=signal_byte_mask(sig, msg.length)) for sig in msg.signals])
+            for msg in messages
+        ]
+
+    if options.split_layout or options.compact_layout:
+        messages = [_view(msg, data_size=data_buffer_size(msg)) for msg in messages]
+
+    crc_profiles = []
+    if options.generate_crc:
+        crcs, crc_warnings = build_message_crcs(messages)
+        for warning in crc_warnings:
+            print(f"Warning: {warning}")
+        messages = [_view(msg, crc=crc) if crc else msg for msg, crc in zip(messages, crcs)]
+        crc_profiles = build_crc_profiles(messages)
+
+    compact = None
+    if options.compact_layout:
+        compact = build_compact_layout(messages, options)
+
+    memory = None
+    if options.split_layout:
+        memory = build_memory_report(messages, options, compact)
+        print(
+            f"Split layout: {memory.ram} bytes of RAM instead of {memory.default_ram} "
+            f"({memory.default_ram - memory.ram} saved), {memory.flash} bytes of constant tables in flash "
+            f"(estimate for a 32-bit target)."
+        )
+
+    if compact:
+        signal_struct, message_struct = (
+            ("can_db_sig_layout_t", "can_db_msg_layout_t") if options.split_layout else ("can_db_sig_t", "can_db_msg_t")
+        )
+        print(
+            f"Compact layout: sizeof({signal_struct}) = {compact.signal_size}, "
+            f"sizeof({message_struct}) = {compact.message_size} (estimate for a 32-bit target)."
+        )
+        for msg in messages:
+            ram, flash, default_ram = compact_message_sizes(msg, compact, options)
+            in_flash = f", {flash} bytes in flash" if options.split_layout else ""
+            print(f"  {msg.name}: {ram} bytes of RAM instead of {default_ram}{in_flash}.")
+
+    return _view(
+        ir, messages=messages, memory=memory, compact=compact, rx_supervision=rx_supervision,
+        crc_profiles=crc_profiles, **lookups,
+        **options.as_dict()
+    )
+
+
+def build_library_ir(selection: Selection, library_name, dbs, version, embedded=False, with_units=False,
+                     generate_counter=True, generate_crc=True, generate_callback=True, index=None,
+                     reproducible=False, options: Optional[GenerationOptions] = None):
+    """
+    Build the library IR for the selected messages and signals.
+
+    Args:
+        selection: Selected messages, signals and RX/TX modes.
+        library_name: Library name/prefix.
+        dbs: Loaded cantools databases.
+        version: Generator version written to the file headers.
+        index: Optional prebuilt index from build_message_index(dbs).
+        reproducible: Omit the generation date unless SOURCE_DATE_EPOCH is set.
+        options: Generation options, replaces the separate option arguments when given.
+    """
+    if options is None:
+        options = GenerationOptions(
+            embedded=embedded,
+            with_units=with_units,
+            generate_counter=generate_counter,
+            generate_crc=generate_crc,
+            generate_callback=generate_callback
+        )
+
+    base = build_base_ir(selection, library_name, dbs, version, index=index, reproducible=reproducible)
+    return apply_options(base, options)
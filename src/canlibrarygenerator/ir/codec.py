@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import BitFieldIR, MessageIR, SignalIR
+
+
+DATA_SIZE = 64                      # Size of can_db_msg_t.data
+INSERT_VALUE_BITS = 64              # insert_signal() takes the raw value as uint64_t
+
+
+def _decode_bits(sig: SignalIR, msg_length: int) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    (value bit, data byte, bit in byte) read by parse_signal(), None if it reads outside the data array.
+    """
+    bits = []
+
+    for i in range(sig.length):
+        if not sig.is_big_endian:
+            pos = sig.start_bit + i
+            if pos // 8 >= DATA_SIZE:
+                return None
+            bits.append((i, pos // 8, pos % 8))
+        else:
+            pos = sig.start_bit - i
+            # Bits before the first byte or after the message are skipped
+            if pos < 0 or pos // 8 >= msg_length:
+                continue
+            bits.append((i, pos // 8, 7 - pos % 8))
+
+    return bits
+
+
+def _encode_bits(sig: SignalIR, msg_length: int) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    (value bit, data byte, bit in byte) written by insert_signal(), None if its behaviour is not
+    defined for the signal (value bits past uint64_t or negative Motorola bit positions).
+    """
+    if sig.length > INSERT_VALUE_BITS:
+        return None
+
+    bits = []
+
+    for i in range(sig.length):
+        pos = sig.start_bit + i if not sig.is_big_endian else sig.start_bit - i
+
+        if pos < 0:
+            return None
+        if pos // 8 >= msg_length:
+            continue
+
+        bits.append((i, pos // 8, pos % 8 if not sig.is_big_endian else 7 - pos % 8))
+
+    return bits
+
+
+def signal_byte_mask(sig: SignalIR, msg_length: int) -> int:
+    """
+    Bit i is set when data byte i of the message holds bits of the signal.
+
+    Used by the change detection to skip signals of unchanged bytes. Bits
+    that parse_signal() reads past the message are left out, received frames
+    never change them. A signal without bits in the message gets all bytes,
+    so it is still decoded like without the change detection.
+    """
+    mask = 0
+
+    for i in range(sig.length):
+        pos = sig.start_bit + i if not sig.is_big_endian else sig.start_bit - i
+        if 0 <= pos < msg_length * 8:
+            mask |= 1 << (pos // 8)
+
+    return mask or (1 << msg_length) - 1
+
+
+def _bit_fields(bits: Iterable[Tuple[int, int, int]]) -> List[BitFieldIR]:
+    """Merge bits of one data byte moved by the same shift into one mask."""
+    fields: Dict[Tuple[int, int], int] = {}
+
+    for value_bit, byte, bit in bits:
+        key = (byte, value_bit - bit)
+        fields[key] = fields.get(key, 0) | (1 << bit)
+
+    return [BitFieldIR(byte=byte, mask=mask, shift=shift) for (byte, shift), mask in fields.items()]
+
+
+def build_message_codec(msg: MessageIR) -> Tuple[List[Tuple[Optional[List[BitFieldIR]], Optional[List[BitFieldIR]]]], bool]:
+    """
+    Compute the byte masks and shifts of the unrolled codec of a message.
+
+    The decode and encode fields of a signal reproduce parse_signal() and
+    insert_signal() bit for bit, they are None for signals that keep calling
+    the generic function.
+
+    Returns:
+        ([(decode fields, encode fields) per signal], encode_masked) where encode_masked
+        is set when signals share data bits, so encoding has to clear the bits of each
+        field like insert_signal() does.
+    """
+    codecs = []
+    written = 0
+    masked = False
+
+    for sig in msg.signals:
+        decode_bits = _decode_bits(sig, msg.length)
+        encode_bits = _encode_bits(sig, msg.length)
+
+        if encode_bits is None:
+            masked = True
+        else:
+            for _, byte, bit in encode_bits:
+                position = 1 << (byte * 8 + bit)
+                masked = masked or bool(written & position)
+                written |= position
+
+        codecs.append((
+            _bit_fields(decode_bits) if decode_bits is not None else None,
+            _bit_fields(encode_bits) if encode_bits is not None else None
+        ))
+
+    return codecs, masked
@@ -0,0 +1,218 @@
+from typing import List, Tuple
+
+from .memory import (
+    BOOL, DOUBLE, FLOAT, INT8, INT64, POINTER, UINT8, UINT16, UINT32, UINT64,
+    data_buffer_size, default_message_fields, default_signal_size, message_state_fields, message_struct_size,
+    signal_state_size, struct_size,
+)
+from .models import CompactLayoutIR, MessageIR, StructFieldIR
+from .options import GenerationOptions
+
+
+# (size, alignment) of the field types on the 32-bit target of ir/memory.py
+TYPE_LAYOUTS = {
+    "bool": BOOL,
+    "int8_t": INT8,
+    "uint8_t": UINT8,
+    "uint16_t": UINT16,
+    "uint32_t": UINT32,
+    "uint64_t": UINT64,
+    "int64_t": INT64,
+    "float": FLOAT,
+    "double": DOUBLE,
+}
+
+
+def uint_type(maximum: int) -> str:
+    """Smallest unsigned fixed-width C type holding 0 to maximum."""
+    for bits in (8, 16, 32):
+        if maximum < 1 << bits:
+            return f"uint{bits}_t"
+    return "uint64_t"
+
+
+def _is_pointer(field: StructFieldIR) -> bool:
+    return field.type.endswith("*") or field.type == "can_db_callback_t"
+
+
+def field_layout(field: StructFieldIR) -> Tuple[int, int]:
+    return POINTER if _is_pointer(field) else TYPE_LAYOUTS[field.type]
+
+
+def _order(fields: List[StructFieldIR]) -> List[StructFieldIR]:
+    """
+    Order fields by decreasing alignment, which leaves padding only at the end.
+
+    Pointers come right after the 64-bit types, so the order also has no
+    padding on 64-bit hosts, where they are 8 bytes. The order is stable.
+    """
+    def rank(field: StructFieldIR) -> Tuple[int, bool]:
+        pointer = _is_pointer(field)
+        return -(8 if pointer else field_layout(field)[1]), pointer
+
+    return sorted(fields, key=rank)
+
+
+def _maximum(messages: List[MessageIR], value) -> int:
+    return max((value(msg) for msg in messages), default=0)
+
+
+def _signal_fields(messages: List[MessageIR], options: GenerationOptions) -> List[StructFieldIR]:
+    signals = [sig for msg in messages for sig in msg.signals]
+    fixed_point = options.fixed_point
+    phys = "int64_t" if fixed_point else options.phys_type
+
+    fields = []
+    if not options.embedded:
+        fields.append(StructFieldIR("const char*", "name", "Name of the signal."))
+    fields += [
+        StructFieldIR(uint_type(max((sig.start_bit for sig in signals), default=0)), "start_bit", "Start bit of the signal."),
+        StructFieldIR(uint_type(max((sig.length for sig in signals), default=0)), "length", "Length of the signal in bits."),
+        StructFieldIR("bool", "is_big_endian", "Endianness flag: false = little endian, true = big endian."),
+        StructFieldIR("bool", "is_signed", "Value type (1 for signed, 0 for unsigned)."),
+    ]
+    if fixed_point:
+        fields += [
+            StructFieldIR(phys, "factor", "Scaled factor: phys_value = raw_value * factor / divisor + offset."),
+            StructFieldIR(
+                uint_type(max((sig.fixed.divisor for sig in signals), default=1)), "divisor",
+                "Divisor of the scaled factor, 1 unless the DBC factor is a fraction like 1/3."
+            ),
+            StructFieldIR(phys, "offset", "Scaled offset."),
+            StructFieldIR(phys, "min", "Scaled minimum physical value."),
+            StructFieldIR(phys, "max", "Scaled maximum physical value."),
+            StructFieldIR("int8_t", "scale_exp", "Physical value = scaled value * 10^scale_exp."),
+        ]
+    else:
+        fields += [
+            StructFieldIR(phys, "factor", "Factor for conversion to physical value."),
+            StructFieldIR(phys, "offset", "Offset for conversion to physical value."),
+            StructFieldIR(phys, "min", "Minimum physical value."),
+            StructFieldIR(phys, "max", "Maximum physical value."),
+        ]
+    if not options.embedded:
+        fields += [
+            StructFieldIR("const char*", "unit", "Unit of the signal."),
+            StructFieldIR("const char*", "receiver", "Receiver of the signal."),
+        ]
+    if not options.split_layout:
+        fields += [
+            StructFieldIR("uint64_t", "raw_value", "Current raw value of the signal."),
+            StructFieldIR(
+                phys, "phys_value",
+                "Current physical value of the signal, scaled." if fixed_point else "Current physical value of the signal."
+            ),
+        ]
+    fields.append(StructFieldIR("uint64_t", "raw_init", "Init raw value."))
+    if options.change_detection:
+        fields.append(StructFieldIR(
+            uint_type(max((sig.byte_mask for sig in signals), default=0)), "byte_mask",
+            "Change detection: bit i is set when the signal has bits in data byte i."
+        ))
+        if not options.split_layout:
+            fields.append(StructFieldIR(
+                "bool", "changed", "Change detection: set when a decode changed raw_value, cleared by the application."
+            ))
+
+    return _order(fields)
+
+
+def _message_fields(messages: List[MessageIR], options: GenerationOptions) -> List[StructFieldIR]:
+    fields = [StructFieldIR(uint_type(_maximum(messages, lambda msg: msg.frame_id)), "id", "CAN ID of the message.")]
+    if not options.embedded:
+        fields += [
+            StructFieldIR("const char*", "name", "Name of the message."),
+            StructFieldIR("const char*", "senders", "Senders of the message."),
+            StructFieldIR("const char*", "receivers", "Receivers of the message."),
+        ]
+    fields += [
+        StructFieldIR(
+            uint_type(_maximum(messages, lambda msg: len(msg.signals))), "num_signals", "Number of signals in the message."
+        ),
+        StructFieldIR("bool", "is_fd", "Boolean flag (fd / not fd)."),
+        StructFieldIR("uint8_t", "frame_type", "Type of frame ID (0 - STANDARD, 1 - EXTENDED)."),
+        StructFieldIR(
+            uint_type(_maximum(messages, lambda msg: msg.cycle_time)), "cycle_time", "Cycle time of the message (ms)."
+        ),
+        StructFieldIR(
+            uint_type(_maximum(messages, lambda msg: msg.cycle_time_fast)), "cycle_time_fast",
+            "Cycle time fast of the message (ms)."
+        ),
+        StructFieldIR(
+            uint_type(_maximum(messages, lambda msg: msg.start_delay_time)), "start_delay_time",
+            "Initial transmission delay of the message (ms)."
+        ),
+    ]
+    if options.split_layout:
+        fields.append(
+            StructFieldIR("const can_db_sig_layout_t*", "signals", "Pointer to the array of the signal layouts.")
+        )
+    else:
+        fields += [
+            StructFieldIR("uint8_t", "dlc", "Data Length Code (DLC) of the message."),
+            StructFieldIR("uint8_t", "length", "Byte length of the message."),
+            StructFieldIR("uint8_t*", "data", "Data of the message, sized for the message."),
+            StructFieldIR("bool", "is_active", "Runtime flag indicating whether the message is active."),
+            StructFieldIR("uint32_t", "timestamp_ms", "Runtime timestamp of the message in milliseconds."),
+        ]
+        if options.change_detection:
+            fields.append(StructFieldIR(
+                "bool", "rx_data_valid", "Change detection: data holds the last received frame, cleared by init and encodes."
+            ))
+        if options.generate_callback:
+            fields.append(StructFieldIR("can_db_callback_t", "cb_fnc", "Callback function."))
+        fields.append(StructFieldIR("can_db_sig_t*", "signals", "Pointer to the array of the message signals."))
+        if options.lazy_decode:
+            fields.append(StructFieldIR(
+                uint_type(_maximum(messages, lambda msg: (1 << min(len(msg.signals), 64)) - 1)), "stale",
+                "Lazy decoding: bit i is set while signal i is not decoded from the data."
+            ))
+
+    return _order(fields)
+
+
+def build_compact_layout(messages: List[MessageIR], options: GenerationOptions) -> CompactLayoutIR:
+    """
+    Narrow the fields of the signal and message structures to the ranges of the library.
+
+    Bit positions, lengths, signal counts, CAN IDs and times get the smallest
+    unsigned type holding their largest value in the messages, flags get
+    bool/uint8_t, and the fields are ordered to minimize padding. In the
+    split layout, this applies to the constant layout structures; the runtime
+    state structures have no fields to narrow.
+    """
+    signal_fields = _signal_fields(messages, options)
+    message_fields = _message_fields(messages, options)
+
+    return CompactLayoutIR(
+        signal_fields=signal_fields,
+        message_fields=message_fields,
+        signal_size=struct_size([field_layout(field) for field in signal_fields]),
+        message_size=struct_size([field_layout(field) for field in message_fields]),
+    )
+
+
+def compact_message_sizes(msg: MessageIR, compact: CompactLayoutIR, options: GenerationOptions) -> Tuple[int, int, int]:
+    """
+    Bytes of RAM and flash of one message in the compact layout, and of RAM in the default layout.
+
+    A message takes its message structure with a signal pointer per signal,
+    a signal structure per signal, and its data buffer (data[64] in the
+    default layout).
+    """
+    signal_count = len(msg.signals)
+    default_ram = (
+        message_struct_size(default_message_fields(options), signal_count) + signal_count * default_signal_size(options)
+    )
+
+    if options.split_layout:
+        ram = message_struct_size(message_state_fields(options), signal_count) + signal_count * signal_state_size(options)
+        flash = compact.message_size + signal_count * compact.signal_size
+    else:
+        ram = (
+            message_struct_size([field_layout(field) for field in compact.message_fields], signal_count)
+            + signal_count * compact.signal_size
+        )
+        flash = 0
+
+    return ram + data_buffer_size(msg), flash, default_ram
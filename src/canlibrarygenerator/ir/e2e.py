@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Tuple
+
+from .codec import signal_byte_mask
+from .models import CrcProfileIR, MessageCrcIR, MessageIR
+
+
+# GenSigFuncType values of the counter and CRC signals of a TX message
+FUNC_TYPE_COUNTER = 1
+FUNC_TYPE_CRC = 2
+
+# Signal attribute selecting the CRC profile of a CRC signal, SAE_J1850 when not set
+CRC_PROFILE_ATTRIBUTE = "GenSigCrcProfile"
+DEFAULT_CRC_PROFILE = "SAE_J1850"
+
+# CRC8 profiles of the AUTOSAR CRC library: name -> (polynomial, initial value, final XOR value)
+CRC8_PROFILES: Dict[str, Tuple[int, int, int]] = {
+    "SAE_J1850": (0x1D, 0xFF, 0xFF),        # Crc_CalculateCRC8
+    "AUTOSAR_0X2F": (0x2F, 0xFF, 0xFF),     # Crc_CalculateCRC8H2F
+}
+
+
+def crc8_table(polynomial: int) -> List[int]:
+    """Byte-wise lookup table of an MSB-first CRC8: table[i] is the CRC register after shifting in byte i."""
+    table = []
+
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+
+    return table
+
+
+def _covered_ranges(length: int, skipped: int) -> List[Tuple[int, int]]:
+    """(first byte, byte count) ranges of the data bytes 0..length-1 whose bit is not set in skipped."""
+    ranges = []
+    start = None
+
+    for byte in range(length + 1):
+        covered = byte < length and not skipped & (1 << byte)
+        if covered and start is None:
+            start = byte
+        elif not covered and start is not None:
+            ranges.append((start, byte - start))
+            start = None
+
+    return ranges
+
+
+def build_message_crc(msg: MessageIR) -> Optional[MessageCrcIR]:
+    """
+    CRC of a message with a GenSigFuncType CRC signal, None for other messages.
+
+    The CRC covers the data bytes of the message length without the bytes
+    of the CRC signal, in order, and is written to the CRC signal at its
+    position. The CRC signal must have the 8 bits of the CRC8 profiles.
+    """
+    crc_signals = [index for index, sig in enumerate(msg.signals) if sig.gen_sig_func_type == FUNC_TYPE_CRC]
+    if not crc_signals:
+        return None
+    if len(crc_signals) > 1:
+        raise ValueError(f"Message '{msg.name}' has {len(crc_signals)} CRC signals, only one is supported.")
+
+    index = crc_signals[0]
+    sig = msg.signals[index]
+    profile = sig.crc_profile or DEFAULT_CRC_PROFILE
+
+    if profile not in CRC8_PROFILES:
+        raise ValueError(
+            f"Signal '{msg.name}.{sig.name}': unknown CRC profile '{profile}', "
+            f"expected one of: {', '.join(CRC8_PROFILES)}."
+        )
+    if sig.length != 8:
+        raise ValueError(f"Signal '{msg.name}.{sig.name}': CRC8 profile {profile} needs 8 bits, the signal has {sig.length}.")
+
+    skipped = signal_byte_mask(sig, msg.length)
+    whole_byte = skipped & (skipped - 1) == 0
+
+    return MessageCrcIR(
+        signal=index,
+        profile=profile,
+        ranges=_covered_ranges(msg.length, skipped),
+        byte=skipped.bit_length() - 1 if whole_byte else None,
+    )
+
+
+def build_message_crcs(messages: List[MessageIR]) -> Tuple[List[Optional[MessageCrcIR]], List[str]]:
+    """
+    CRCs of the TX messages and warnings for the CRC signals no CRC can be generated for.
+
+    A message whose CRC signal is not supported is generated without the CRC
+    instead of failing the whole library.
+    """
+    crcs = []
+    warnings = []
+
+    for msg in messages:
+        crc = None
+        if msg.mode_tx:
+            try:
+                crc = build_message_crc(msg)
+            except ValueError as e:
+                warnings.append(f"{e} The CRC of message '{msg.name}' is not generated.")
+        crcs.append(crc)
+
+    return crcs, warnings
+
+
+def build_crc_profiles(messages: List[MessageIR]) -> List[CrcProfileIR]:
+    """Lookup tables of the CRC profiles used by the messages, in profile order."""
+    used = {msg.crc.profile for msg in messages if msg.crc}
+
+    return [
+        CrcProfileIR(name=name, polynomial=polynomial, initial=initial, final_xor=final_xor, table=crc8_table(polynomial))
+        for name, (polynomial, initial, final_xor) in CRC8_PROFILES.items()
+        if name in used
+    ]
@@ -0,0 +1,147 @@
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+from typing import List, Optional, Tuple
+
+from .models import FixedPointIR, MessageIR, SignalIR
+
+
+MAX_SCALE_DIGITS = 18               # 10**18 is the largest power of ten in int64_t
+MAX_DIVISOR = 10 ** 6               # Largest divisor of a rational scaling
+MIN_ROUNDED_DIGITS = 6              # Significant digits a rounded factor keeps at least
+INT64_MAX = (1 << 63) - 1
+
+
+def _decimal(value: float) -> Decimal:
+    """Shortest decimal that reads back as value, i.e. the number as written in the DBC file."""
+    return Decimal(repr(float(value)))
+
+
+def _fraction_digits(value: Decimal) -> int:
+    return max(0, -value.normalize().as_tuple().exponent)
+
+
+def _scaled(value: float, scale: int) -> int:
+    """value * scale rounded half away from zero, like llround()."""
+    return int((_decimal(value) * scale).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _div_round(numerator: int, denominator: int) -> int:
+    """Integer division rounded half away from zero, like the generated div_round()."""
+    quotient = (abs(numerator) + abs(denominator) // 2) // abs(denominator)
+    return quotient if (numerator < 0) == (denominator < 0) else -quotient
+
+
+def _fixed_point(sig: SignalIR, digits: int, factor: Fraction, offset: Decimal) -> Optional[FixedPointIR]:
+    """
+    Scaling of the physical value by 10**digits with factor = fixed_factor / divisor,
+    None if the scaled values do not fit int64_t.
+    """
+    scale = 10 ** digits
+    scaled_factor = factor * scale
+    fixed_factor = scaled_factor.numerator
+    divisor = scaled_factor.denominator
+    fixed_offset = int((offset * scale).to_integral_value(rounding=ROUND_HALF_UP))
+
+    # Unscaled signals keep all 64 raw bits, the physical value is the raw value
+    identity = fixed_factor == 1 and divisor == 1 and fixed_offset == 0
+    largest = ((1 << sig.length) - 1) * abs(fixed_factor)
+
+    if fixed_factor == 0 or (not identity and (digits > MAX_SCALE_DIGITS or largest + abs(fixed_offset) > INT64_MAX)):
+        return None
+
+    return FixedPointIR(
+        scale_exp=-digits,
+        factor=fixed_factor,
+        offset=fixed_offset,
+        minimum=_scaled(sig.minimum, scale),
+        maximum=_scaled(sig.maximum, scale),
+        initial=_div_round(int(sig.raw_initial) * fixed_factor, divisor) + fixed_offset,
+        divisor=divisor
+    )
+
+
+def _rational_factor(factor: Decimal) -> Optional[Fraction]:
+    """
+    Fraction with a small divisor that the DBC factor is the rounded decimal of, e.g. 1/3 for 0.333333333333333.
+
+    The decimal must have at least twice as many fraction digits as the divisor, so a
+    factor that only happens to round to a nearby fraction keeps its decimal scaling.
+    """
+    digits = _fraction_digits(factor)
+    fraction = Fraction(factor).limit_denominator(MAX_DIVISOR)
+
+    if fraction.denominator == 1 or digits < 2 * len(str(fraction.denominator)):
+        return None
+    written = (Decimal(fraction.numerator) / Decimal(fraction.denominator)).quantize(
+        Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP
+    )
+    return fraction if written == factor else None
+
+
+def build_signal_fixed_point(msg: MessageIR, sig: SignalIR) -> Tuple[FixedPointIR, Optional[str]]:
+    """
+    Derive the integer scaling of a signal and a warning if it is not exact.
+
+    The physical value is stored as an integer scaled by 10**-scale_exp. A decimal
+    factor uses the smallest exponent that makes the scaled factor and offset
+    integers, so decoding is raw * factor + offset and encoding the rounded division
+    (value - offset) / factor. A factor written as the rounded decimal of a fraction
+    (e.g. 0.333333333333333 for 1/3) is kept as the fraction factor / divisor with a
+    scale finer than the divisor: decoding rounds raw * factor / divisor and encoding
+    (value - offset) * divisor / factor, both exact for every raw value. All of it is
+    int64_t arithmetic. Minimum and maximum are rounded to the same scale.
+
+    A factor and offset with neither scaling in int64_t are rounded to the most
+    decimal places that fit, with a warning, as long as the factor keeps
+    MIN_ROUNDED_DIGITS significant digits.
+
+    Raises:
+        ValueError: The signal has no 64-bit fixed-point scaling at all.
+    """
+    factor = _decimal(sig.factor)
+    offset = _decimal(sig.offset)
+    offset_digits = _fraction_digits(offset)
+    digits = max(_fraction_digits(factor), offset_digits)
+
+    fixed = _fixed_point(sig, digits, Fraction(factor), offset)
+    if fixed:
+        return fixed, None
+
+    rational = _rational_factor(factor)
+    if rational is not None:
+        fixed = _fixed_point(sig, max(offset_digits, len(str(rational.denominator))), rational, offset)
+        if fixed:
+            return fixed, None
+
+    for rounded_digits in range(min(digits, MAX_SCALE_DIGITS), -1, -1):
+        rounded = factor.quantize(Decimal(1).scaleb(-rounded_digits), rounding=ROUND_HALF_UP)
+        if rounded != factor and len(rounded.normalize().as_tuple().digits) < MIN_ROUNDED_DIGITS:
+            break
+        fixed = _fixed_point(sig, rounded_digits, Fraction(rounded), offset)
+        if fixed:
+            return fixed, (
+                f"Signal '{msg.name}.{sig.name}' has no exact 64-bit fixed-point scaling "
+                f"(factor {sig.factor}, offset {sig.offset}), rounded to {rounded_digits} decimal places."
+            )
+
+    raise ValueError(
+        f"Signal '{msg.name}.{sig.name}' has no 64-bit fixed-point scaling "
+        f"(factor {sig.factor}, offset {sig.offset})."
+    )
+
+
+def build_message_fixed_points(messages: List[MessageIR]) -> Tuple[List[List[FixedPointIR]], List[str]]:
+    """Fixed-point scalings of the signals of each message and warnings for the inexact ones."""
+    scalings = []
+    warnings = []
+
+    for msg in messages:
+        fixed = []
+        for sig in msg.signals:
+            scaling, warning = build_signal_fixed_point(msg, sig)
+            fixed.append(scaling)
+            if warning:
+                warnings.append(warning)
+        scalings.append(fixed)
+
+    return scalings, warnings
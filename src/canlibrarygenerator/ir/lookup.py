@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional, Tuple
+
+from .models import MessageIR, MessageLookupIR
+
+
+LOOKUP_STRATEGIES = ("auto", "direct", "hash", "binary")
+
+EMPTY_SLOT = 0xFFFF                 # Unused table slot, message indexes are stored as uint16_t
+
+DIRECT_MAX_FILL_FACTOR = 2          # auto: direct table when at least every second slot is used
+DIRECT_MAX_SLOTS = 4096             # Largest direct table, also when forced
+HASH_MIN_MESSAGES = 8               # auto: binary search is as fast for fewer messages
+HASH_BUCKET_SIZE = 4                # Average number of IDs per displacement bucket
+HASH_MAX_SEED = 0xFFFF              # Displacements are stored as uint16_t
+
+_MASK32 = 0xFFFFFFFF
+
+
+def hash_id(can_id: int, seed: int) -> int:
+    """
+    32-bit hash of a CAN ID (murmur3 finalizer), must match <lib>_hash_id() in the interface templates.
+    """
+    h = (can_id ^ seed) & _MASK32
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & _MASK32
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & _MASK32
+    h ^= h >> 16
+    return h
+
+
+def _next_pow2(value: int) -> int:
+    return 1 << max(0, value - 1).bit_length()
+
+
+def _build_direct(entries: List[Tuple[int, int]]) -> Optional[MessageLookupIR]:
+    base_id = entries[0][0]
+    span = entries[-1][0] - base_id + 1
+
+    if span > DIRECT_MAX_SLOTS:
+        return None
+
+    indexes = [EMPTY_SLOT] * span
+    for can_id, index in entries:
+        indexes[can_id - base_id] = index
+
+    return MessageLookupIR(strategy="direct", indexes=indexes, base_id=base_id)
+
+
+def _build_hash(entries: List[Tuple[int, int]]) -> Optional[MessageLookupIR]:
+    """
+    Collision-free hash and displace table: bucket = hash(id, 0), slot = hash(id, displacement[bucket]).
+
+    Table and bucket counts are powers of two, so both are selected by a mask.
+    The search is deterministic, equal inputs give equal tables.
+    """
+    bucket_count = _next_pow2(max(1, len(entries) // HASH_BUCKET_SIZE))
+    buckets = [[] for _ in range(bucket_count)]
+
+    for can_id, index in entries:
+        buckets[hash_id(can_id, 0) & (bucket_count - 1)].append((can_id, index))
+
+    # Place the largest buckets first, while the table is still empty
+    order = sorted(range(bucket_count), key=lambda b: -len(buckets[b]))
+
+    table_size = _next_pow2(len(entries))
+
+    for _ in range(3):
+        placed = _place_buckets([buckets[b] for b in order], table_size)
+
+        if placed is not None:
+            slots, seeds = placed
+            displacements = [0] * bucket_count
+            for bucket, seed in zip(order, seeds):
+                displacements[bucket] = seed
+            return MessageLookupIR(strategy="hash", indexes=slots, displacements=displacements)
+
+        table_size *= 2
+
+    return None
+
+
+def _place_buckets(buckets: List[List[Tuple[int, int]]], table_size: int):
+    """Find a displacement for each bucket, so no two IDs share a slot. Returns None when not possible."""
+    slots = [EMPTY_SLOT] * table_size
+    seeds = []
+
+    for bucket in buckets:
+        if not bucket:
+            seeds.append(0)
+            continue
+
+        for seed in range(1, HASH_MAX_SEED + 1):
+            positions = [hash_id(can_id, seed) & (table_size - 1) for can_id, _ in bucket]
+
+            if len(set(positions)) == len(positions) and all(slots[pos] == EMPTY_SLOT for pos in positions):
+                break
+        else:
+            return None
+
+        seeds.append(seed)
+        for pos, (_, index) in zip(positions, bucket):
+            slots[pos] = index
+
+    return slots, seeds
+
+
+def _build_binary(entries: List[Tuple[int, int]]) -> MessageLookupIR:
+    return MessageLookupIR(
+        strategy="binary",
+        indexes=[index for _, index in entries],
+        ids=[can_id for can_id, _ in entries]
+    )
+
+
+def _auto_strategy(entries: List[Tuple[int, int]]) -> str:
+    span = entries[-1][0] - entries[0][0] + 1
+
+    if span <= DIRECT_MAX_FILL_FACTOR * len(entries):
+        return "direct"
+
+    if len(entries) >= HASH_MIN_MESSAGES:
+        return "hash"
+
+    return "binary"
+
+
+def _build_frame_lookup(entries: List[Tuple[int, int]], strategy: str, frame_type: str) -> MessageLookupIR:
+    if not entries:
+        return MessageLookupIR(strategy="none")
+
+    requested = strategy
+    if strategy == "auto":
+        strategy = _auto_strategy(entries)
+
+    if strategy == "direct":
+        lookup = _build_direct(entries)
+    elif strategy == "hash":
+        lookup = _build_hash(entries)
+    else:
+        lookup = _build_binary(entries)
+
+    if lookup is not None:
+        return lookup
+
+    if requested != "auto":
+        raise ValueError(
+            f"Message lookup '{requested}' is not possible for the selected {frame_type} frame IDs, "
+            f"use 'auto' or 'binary'."
+        )
+
+    return _build_binary(entries)
+
+
+def build_message_lookups(messages: List[MessageIR], strategy: str = "auto") -> Tuple[MessageLookupIR, MessageLookupIR]:
+    """
+    Build the CAN ID lookup tables of the generated find_message functions.
+
+    Standard and extended frame IDs are looked up in separate tables, each
+    using the strategy that fits its ID density:
+    - direct: table indexed by (ID - lowest ID), for densely packed IDs.
+    - hash: collision-free hash table, for many sparse IDs.
+    - binary: sorted ID table with binary search, for a few sparse IDs.
+
+    Args:
+        messages: Library messages, table values are indexes into this list (the message registry).
+        strategy: One of LOOKUP_STRATEGIES, "auto" chooses per frame type.
+
+    Returns:
+        (standard frame lookup, extended frame lookup)
+    """
+    if strategy not in LOOKUP_STRATEGIES:
+        raise ValueError(f"Unknown message lookup '{strategy}', expected one of: {', '.join(LOOKUP_STRATEGIES)}.")
+
+    if len(messages) >= EMPTY_SLOT:
+        raise ValueError(f"Too many messages for the message lookup tables ({len(messages)}).")
+
+    frames: Dict[bool, Dict[int, int]] = {False: {}, True: {}}
+
+    for index, msg in enumerate(messages):
+        # The first message of a duplicate ID wins, like in the message registry
+        frames[msg.is_extended].setdefault(msg.frame_id, index)
+
+    return (
+        _build_frame_lookup(sorted(frames[False].items()), strategy, "standard"),
+        _build_frame_lookup(sorted(frames[True].items()), strategy, "extended")
+    )
@@ -0,0 +1,168 @@
+from typing import List, Optional, Tuple
+
+from .models import CompactLayoutIR, MemoryReportIR, MessageIR
+from .options import GenerationOptions
+
+
+# Type sizes of a 32-bit MCU target (ARM EABI): 64-bit types are 8-byte aligned
+POINTER = (4, 4)
+SIZE_T = (4, 4)
+INT = (4, 4)
+UINT32 = (4, 4)
+UINT16 = (2, 2)
+UINT8 = (1, 1)
+BOOL = (1, 1)
+INT8 = (1, 1)
+INT64 = (8, 8)
+UINT64 = (8, 8)
+DOUBLE = (8, 8)
+FLOAT = (4, 4)
+
+# data[64] of the default message structure
+DATA_ARRAY = (64, 1)
+
+
+def _align(offset: int, alignment: int) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def struct_size(fields: List[Tuple[int, int]]) -> int:
+    """sizeof() of a C structure of (size, alignment) fields with natural alignment."""
+    offset = 0
+    alignment = 1
+
+    for size, field_alignment in fields:
+        offset = _align(offset, field_alignment) + size
+        alignment = max(alignment, field_alignment)
+
+    return _align(offset, alignment)
+
+
+def _phys(options: GenerationOptions) -> Tuple[int, int]:
+    if options.fixed_point:
+        return INT64
+    return FLOAT if options.phys_type == "float" else DOUBLE
+
+
+def _signal_layout_fields(options: GenerationOptions) -> List[Tuple[int, int]]:
+    phys = _phys(options)
+    fields = [] if options.embedded else [POINTER]
+    fields += [INT, INT, BOOL, BOOL, phys]
+    if options.fixed_point:
+        fields.append(INT64)
+    fields += [phys, phys, phys]
+    if options.fixed_point:
+        fields.append(INT8)
+    if not options.embedded:
+        fields += [POINTER, POINTER]
+    return fields
+
+
+def _message_layout_fields(options: GenerationOptions) -> List[Tuple[int, int]]:
+    fields = [UINT32]
+    if not options.embedded:
+        fields += [POINTER, POINTER, POINTER]
+    return fields + [SIZE_T, INT, INT, UINT32, UINT32, UINT32, POINTER]
+
+
+def default_signal_size(options: GenerationOptions) -> int:
+    """sizeof(can_db_sig_t) of the default layout."""
+    fields = _signal_layout_fields(options) + [UINT64, _phys(options), UINT64]
+    if options.change_detection:
+        fields += [UINT64, BOOL]
+    return struct_size(fields)
+
+
+def default_message_fields(options: GenerationOptions) -> List[Tuple[int, int]]:
+    """Fields of can_db_msg_t of the default layout."""
+    fields = [UINT32]
+    if not options.embedded:
+        fields.append(POINTER)
+    fields += [UINT8, UINT8]
+    if not options.embedded:
+        fields += [POINTER, POINTER]
+    fields += [SIZE_T, DATA_ARRAY, BOOL]
+    if options.change_detection:
+        fields.append(BOOL)
+    fields += [UINT32, INT, INT, UINT32, UINT32, UINT32]
+    if options.generate_callback:
+        fields.append(POINTER)
+    fields.append(POINTER)
+    if options.lazy_decode:
+        fields.append(UINT64)
+    return fields
+
+
+def signal_state_size(options: GenerationOptions) -> int:
+    """sizeof(can_db_sig_t) of the split layout."""
+    return struct_size([UINT64, _phys(options)] + ([BOOL] if options.change_detection else []))
+
+
+def message_state_fields(options: GenerationOptions) -> List[Tuple[int, int]]:
+    """Fields of can_db_msg_t of the split layout."""
+    return (
+        [POINTER, POINTER, POINTER] + ([POINTER] if options.generate_callback else []) + [UINT32, UINT8, UINT8, BOOL]
+        + ([BOOL] if options.change_detection else []) + ([UINT64] if options.lazy_decode else [])
+    )
+
+
+def message_struct_size(fields: List[Tuple[int, int]], signal_count: int) -> int:
+    """
+    sizeof() of the <prefix>_db_<message>_t structure with a can_db_msg_t of fields.
+
+    The structure holds the base message and a pointer per signal. A 64-bit
+    field of the base message, e.g. the stale mask of the lazy decoding,
+    leaves padding after an odd number of pointers.
+    """
+    base = (struct_size(fields), max(alignment for _, alignment in fields))
+    return struct_size([base] + [POINTER] * signal_count)
+
+
+def data_buffer_size(msg: MessageIR) -> int:
+    """
+    Bytes of the data buffer of a message in the split and compact layouts.
+
+    The buffer holds the message length, and parse_signal() also reads the
+    bytes of Intel signals that reach past the message end, as with data[64].
+    """
+    size = max(msg.length, 1)
+
+    for sig in msg.signals:
+        if not sig.is_big_endian:
+            size = max(size, (sig.start_bit + sig.length - 1) // 8 + 1)
+
+    return size
+
+
+def build_memory_report(messages: List[MessageIR], options: GenerationOptions,
+                        compact: Optional[CompactLayoutIR] = None) -> MemoryReportIR:
+    """
+    Estimate the memory of the generated message and signal tables for a 32-bit target.
+
+    The default layout keeps everything in RAM. The split layout moves the
+    constant layout structures to flash and keeps only the runtime state in RAM:
+    signal values, the message state and a data buffer sized by
+    data_buffer_size() instead of data[64]. The signal pointers of the
+    per-message structures are counted in both layouts. With the compact
+    layout, the layout structures have its narrowed fields.
+    """
+    if compact:
+        signal_layout = compact.signal_size
+        message_layout = compact.message_size
+    else:
+        signal_layout = struct_size(
+            _signal_layout_fields(options) + [UINT64] + ([UINT64] if options.change_detection else [])
+        )
+        message_layout = struct_size(_message_layout_fields(options))
+    signal_count = sum(len(msg.signals) for msg in messages)
+
+    default_ram = signal_count * default_signal_size(options) + sum(
+        message_struct_size(default_message_fields(options), len(msg.signals)) for msg in messages
+    )
+    ram = signal_count * signal_state_size(options) + sum(
+        message_struct_size(message_state_fields(options), len(msg.signals)) + data_buffer_size(msg)
+        for msg in messages
+    )
+    flash = len(messages) * message_layout + signal_count * signal_layout
+
+    return MemoryReportIR(ram=ram, default_ram=default_ram, flash=flash)
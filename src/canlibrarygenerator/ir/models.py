@@ -1,12 +1,32 @@
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+
+@dataclass
+class BitFieldIR:
+    """Bits of one data byte holding a part of a signal value (see ir/codec.py)."""
+    byte: int                   # Index into the message data
+    mask: int                   # Mask of the bits in the data byte
+    shift: int                  # Value bit = data byte bit + shift
+
+
+@dataclass
+class FixedPointIR:
+    """Integer scaling of a signal in fixed-point mode (see ir/fixed_point.py)."""
+    scale_exp: int              # Physical value = scaled value * 10**scale_exp
+    factor: int                 # Scaled value = raw * factor / divisor + offset
+    offset: int
+    minimum: int
+    maximum: int
+    initial: int                # Scaled physical init value
+    divisor: int = 1            # Divisor of a rational factor, e.g. 3 for factor 1/3
 
 
 @dataclass
 class SignalIR:
     name: str
     code_name: str
-    start_bit: int
+    start_bit: int                                      # LSB, Motorola bits counted from bit 7 of byte 0 (see builder)
     length: int
     is_big_endian: bool
     is_signed: bool
@@ -20,6 +40,30 @@ class SignalIR:
     phys_initial: float
     gen_sig_func_type: int = 0
     attributes: Dict[str, int] = field(default_factory=dict)
+    decode_fields: Optional[List[BitFieldIR]] = None   # Unrolled codec only, None calls parse_signal
+    encode_fields: Optional[List[BitFieldIR]] = None   # Unrolled codec only, None calls insert_signal
+    fixed: Optional[FixedPointIR] = None                # Fixed-point mode only
+    byte_mask: int = 0                                  # Change detection: data bytes of the signal (see ir/codec.py)
+    crc_profile: Optional[str] = None                   # CRC signal: GenSigCrcProfile, normalized (see ir/e2e.py)
+
+
+@dataclass
+class MessageCrcIR:
+    """CRC of a TX message, written to its CRC signal (see ir/e2e.py)."""
+    signal: int                         # Index of the CRC signal
+    profile: str                        # Name of the CRC8 profile
+    ranges: List[tuple]                 # (first byte, byte count) of the covered data bytes
+    byte: Optional[int] = None          # Data byte of a CRC signal that fills one whole byte
+
+
+@dataclass
+class CrcProfileIR:
+    """CRC8 profile with its byte-wise lookup table (see ir/e2e.py)."""
+    name: str
+    polynomial: int
+    initial: int
+    final_xor: int
+    table: List[int]
 
 
 @dataclass
@@ -38,6 +82,60 @@ class MessageIR:
     mode_tx: bool
     start_delay_time: int
     cycle_time_fast: int = 0
+    encode_masked: bool = False     # Unrolled codec: signals share data bits
+    data_size: int = 0              # Split and compact layouts: bytes of the data buffer
+    crc: Optional[MessageCrcIR] = None      # TX messages with a CRC signal, unless CRC generation is off
+
+
+@dataclass
+class MessageLookupIR:
+    """Precomputed CAN ID -> message index table of one frame type (see ir/lookup.py)."""
+    strategy: str                                           # "none", "direct", "hash" or "binary"
+    indexes: List[int] = field(default_factory=list)        # Message index per table slot, EMPTY_SLOT if unused
+    ids: List[int] = field(default_factory=list)            # binary: sorted CAN IDs matching indexes
+    base_id: int = 0                                        # direct: CAN ID of the first slot
+    displacements: List[int] = field(default_factory=list)  # hash: seed of each bucket
+
+
+@dataclass
+class TxScheduleIR:
+    """Cyclic TX messages of the generated TX scheduler (see ir/schedule.py)."""
+    slots: List[int] = field(default_factory=list)     # Message indexes, ordered by start delay
+    index_type: str = "uint8_t"                         # Type of the slot indexes
+    cycle_type: str = "uint8_t"                         # Type of the cycle times
+
+
+@dataclass
+class RxSupervisionIR:
+    """Cyclic RX messages of the generated RX timeout supervision (see ir/schedule.py)."""
+    slots: List[int] = field(default_factory=list)     # Message indexes, ordered by timeout
+    timeouts: List[int] = field(default_factory=list)  # Timeout of each slot (ms)
+    index_type: str = "uint8_t"                         # Type of the slot indexes
+
+
+@dataclass
+class MemoryReportIR:
+    """Estimated bytes of the message and signal tables of the split layout (see ir/memory.py)."""
+    ram: int                    # Runtime state of the split layout
+    default_ram: int            # All tables of the default layout, which are in RAM
+    flash: int                  # Constant layout tables of the split layout
+
+
+@dataclass
+class StructFieldIR:
+    """Field of a structure generated from a field list (see ir/compact.py)."""
+    type: str                   # C type, pointer types end with "*"
+    name: str
+    comment: str
+
+
+@dataclass
+class CompactLayoutIR:
+    """Narrowed fields of the compact layout, ordered by alignment (see ir/compact.py)."""
+    signal_fields: List[StructFieldIR]      # can_db_sig_t, can_db_sig_layout_t in the split layout
+    message_fields: List[StructFieldIR]     # can_db_msg_t, can_db_msg_layout_t in the split layout
+    signal_size: int                        # sizeof() of the signal structure on a 32-bit target
+    message_size: int                       # sizeof() of the message structure on a 32-bit target
 
 
 @dataclass
@@ -46,10 +144,27 @@ class LibraryIR:
     generator_version: str
     dbc_versions: List[tuple]
     messages: List[MessageIR]
-    current_date: str
-    current_year: int
+    current_date: Optional[str]     # None in reproducible mode
+    current_year: Optional[int]
     embedded: bool = False
     with_units: bool = False
     generate_counter: bool = True
     generate_crc: bool = True
-    generate_callback: bool = True
\ No newline at end of file
+    generate_callback: bool = True
+    message_lookup: str = "auto"
+    unrolled_codec: bool = False
+    fixed_point: bool = False
+    phys_type: str = "double"
+    split_layout: bool = False
+    compact_layout: bool = False
+    change_detection: bool = False
+    lazy_decode: bool = False
+    rx_timeout_cycles: int = 3
+    rx_timeout_reset: bool = False
+    lookup_standard: Optional[MessageLookupIR] = None
+    lookup_extended: Optional[MessageLookupIR] = None
+    tx_schedule: Optional[TxScheduleIR] = None
+    rx_supervision: Optional[RxSupervisionIR] = None
+    crc_profiles: List[CrcProfileIR] = field(default_factory=list)     # CRC profiles used by the TX messages
+    memory: Optional[MemoryReportIR] = None     # Split layout only
+    compact: Optional[CompactLayoutIR] = None   # Compact layout only
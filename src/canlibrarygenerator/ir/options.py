@@ -0,0 +1,29 @@
+from dataclasses import asdict, dataclass
+
+
+@dataclass(frozen=True)
+class GenerationOptions:
+    """
+    Options that change how a library is generated, but not which messages and signals it contains.
+
+    Field names match the option fields of LibraryIR, so a library IR built once
+    for a selection can be turned into any variant by apply_options().
+    """
+    embedded: bool = False
+    with_units: bool = False
+    generate_counter: bool = True
+    generate_crc: bool = True
+    generate_callback: bool = True
+    message_lookup: str = "auto"        # auto, direct, hash or binary (see ir/lookup.py)
+    unrolled_codec: bool = False        # Straight-line decode/encode per message (see ir/codec.py)
+    fixed_point: bool = False           # Integer-only scaled physical values (see ir/fixed_point.py)
+    phys_type: str = "double"           # Floating-point type of physical values: double or float (see ir/precision.py)
+    split_layout: bool = False          # Constant layout tables in flash, runtime state in RAM (see ir/memory.py)
+    compact_layout: bool = False        # Narrowed field types and per-message data buffers (see ir/compact.py)
+    change_detection: bool = False      # Skip unchanged RX frames and signals of unchanged bytes (see ir/codec.py)
+    lazy_decode: bool = False           # RX only stores the data, signals are decoded on their first read
+    rx_timeout_cycles: int = 3          # RX timeout of a cyclic message in cycle times (see ir/schedule.py)
+    rx_timeout_reset: bool = False      # Signals of a timed out RX message are set to their init values
+
+    def as_dict(self) -> dict:
+        return asdict(self)
@@ -0,0 +1,55 @@
+import math
+from typing import List
+
+from .models import MessageIR, SignalIR
+
+
+PHYS_TYPES = ("double", "float")
+
+FLOAT32_MAX = 3.4028234663852886e38
+FLOAT32_MANTISSA_BITS = 24
+
+
+def _float32_ulp(value: float) -> float:
+    """Distance between adjacent float32 values around value."""
+    _, exponent = math.frexp(abs(value))
+    return math.ldexp(1.0, exponent - FLOAT32_MANTISSA_BITS)
+
+
+def _raw_range(sig: SignalIR):
+    if sig.is_signed:
+        return -(1 << (sig.length - 1)), (1 << (sig.length - 1)) - 1
+    return 0, (1 << sig.length) - 1
+
+
+def float32_issues(sig: SignalIR) -> List[str]:
+    """
+    Describe why the physical values of a signal are not exact in float32.
+
+    The range is not exact when a physical value of any raw value or a DBC
+    limit is outside the float32 range. The resolution is not exact when
+    float32 can't tell two neighbouring raw values apart at the largest physical
+    value, so decode followed by encode does not give back the raw value.
+    """
+    raw_min, raw_max = _raw_range(sig)
+    values = [raw_min * sig.factor + sig.offset, raw_max * sig.factor + sig.offset, sig.minimum, sig.maximum]
+    largest = max(abs(value) for value in values)
+
+    if largest > FLOAT32_MAX:
+        return [f"range up to {largest:g} exceeds float32"]
+
+    step = abs(sig.factor)
+    if step and _float32_ulp(largest) > step / 2:
+        return [f"resolution {step:g} is not kept for physical values up to {largest:g} in float32"]
+
+    return []
+
+
+def float32_warnings(messages: List[MessageIR]) -> List[str]:
+    """Warnings for all signals whose physical values are not exact in float32."""
+    return [
+        f"Signal '{msg.name}.{sig.name}': {issue}."
+        for msg in messages
+        for sig in msg.signals
+        for issue in float32_issues(sig)
+    ]
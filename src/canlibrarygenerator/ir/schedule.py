@@ -0,0 +1,51 @@
+from typing import List
+
+from .compact import uint_type
+from .models import MessageIR, RxSupervisionIR, TxScheduleIR
+
+
+def build_tx_schedule(messages: List[MessageIR]) -> TxScheduleIR:
+    """
+    Cyclic TX messages of the generated TX scheduler, in their initial deadline order.
+
+    A message is scheduled when it is transmitted and has a cycle time, its
+    fast cycle is cycle_time_fast or the normal cycle time if it has none.
+    The generated scheduler keeps the messages in a binary min-heap of their
+    next deadlines. <lib>_tx_start() sets the deadlines to the start delays,
+    ordered by start delay they are already a valid heap.
+    """
+    slots = sorted(
+        (index for index, msg in enumerate(messages) if msg.mode_tx and msg.cycle_time > 0),
+        key=lambda index: messages[index].start_delay_time,
+    )
+    longest = max((max(messages[index].cycle_time, messages[index].cycle_time_fast) for index in slots), default=0)
+
+    return TxScheduleIR(
+        slots=slots,
+        index_type=uint_type(max(len(slots) - 1, 0)),
+        cycle_type=uint_type(longest),
+    )
+
+
+def build_rx_supervision(messages: List[MessageIR], timeout_cycles: int) -> RxSupervisionIR:
+    """
+    Cyclic RX messages of the generated RX timeout supervision, in their initial deadline order.
+
+    A message is supervised when it is received and has a cycle time, it
+    times out when no frame was received for timeout_cycles cycle times.
+    The generated supervision keeps the messages in a binary min-heap of the
+    times at which they are checked next. A reception only stamps the message,
+    a message at the top of the heap that was received in time gets its next
+    check at its new timeout. <lib>_rx_start() sets the checks to one timeout
+    after the start, ordered by timeout they are already a valid heap.
+    """
+    slots = sorted(
+        (index for index, msg in enumerate(messages) if msg.mode_rx and msg.cycle_time > 0),
+        key=lambda index: messages[index].cycle_time,
+    )
+
+    return RxSupervisionIR(
+        slots=slots,
+        timeouts=[messages[index].cycle_time * timeout_cycles for index in slots],
+        index_type=uint_type(max(len(slots) - 1, 0)),
+    )
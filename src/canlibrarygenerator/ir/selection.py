@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+
+class MessageKey(NamedTuple):
+    """
+    Unique key of a message across all loaded databases.
+
+    db_index is the position of the database in the loaded list, so databases
+    loaded from files with the same name stay apart. is_extended keeps a standard
+    and an extended frame with the same numeric ID apart.
+    """
+    db_index: int
+    frame_id: int
+    is_extended: bool
+
+    @classmethod
+    def of(cls, db_index: int, message) -> "MessageKey":
+        """Key of a cantools message of the database at db_index."""
+        return cls(db_index, message.frame_id, bool(message.is_extended_frame))
+
+
+@dataclass(frozen=True)
+class MessageSelection:
+    """
+    Selected signals and RX/TX modes of a single message.
+
+    signals:
+        Names of the selected signals. None selects all signals of the message.
+    """
+    signals: Optional[FrozenSet[str]] = None
+    rx: bool = False
+    tx: bool = False
+
+    def includes(self, signal_name: str) -> bool:
+        return self.signals is None or signal_name in self.signals
+
+    def merge(self, other: "MessageSelection") -> "MessageSelection":
+        if self.signals is None or other.signals is None:
+            signals = None
+        else:
+            signals = self.signals | other.signals
+
+        return MessageSelection(
+            signals=signals,
+            rx=self.rx or other.rx,
+            tx=self.tx or other.tx
+        )
+
+
+@dataclass
+class Selection:
+    """
+    Tree-independent selection of messages and signals used to build the library IR.
+
+    Messages are keyed by MessageKey (database index, frame ID, frame type), so membership
+    lookups of messages and signals are O(1).
+    """
+    messages: Dict[MessageKey, MessageSelection] = field(default_factory=dict)
+
+    def add_message(self, db_index: int, frame_id: int, is_extended: bool,
+                    signals: Optional[Iterable[str]] = None, rx: bool = False, tx: bool = False):
+        """
+        Select a message. Selecting an already selected message merges the signals and modes.
+
+        Args:
+            db_index: Position of the database containing the message in the loaded list.
+            frame_id: Frame ID of the message.
+            is_extended: The message is an extended (29-bit) frame.
+            signals: Names of the selected signals, None selects all signals.
+            rx: Generate RX processing for the message.
+            tx: Generate TX processing for the message.
+        """
+        key = MessageKey(db_index, frame_id, bool(is_extended))
+        entry = MessageSelection(
+            signals=frozenset(signals) if signals is not None else None,
+            rx=bool(rx),
+            tx=bool(tx)
+        )
+
+        existing = self.messages.get(key)
+        self.messages[key] = existing.merge(entry) if existing else entry
+
+    def add_signal(self, db_index: int, frame_id: int, is_extended: bool, signal_name: str):
+        self.add_message(db_index, frame_id, is_extended, signals=(signal_name,))
+
+    def get(self, key: MessageKey) -> Optional[MessageSelection]:
+        return self.messages.get(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.messages
+
+    def __iter__(self) -> Iterator[MessageKey]:
+        return iter(self.messages)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __bool__(self) -> bool:
+        return bool(self.messages)
+
+    @classmethod
+    def from_message_names(cls, dbs, selected_signals: Mapping[str, Optional[Iterable[str]]],
+                           message_modes: Optional[Mapping[str, Mapping[str, bool]]] = None) -> "Selection":
+        """
+        Build a selection from message names, matching messages of that name in every database.
+
+        Args:
+            dbs: Loaded cantools databases.
+            selected_signals: Message name -> selected signal names (None selects all signals).
+            message_modes: Message name -> {"rx": bool, "tx": bool}.
+        """
+        message_modes = message_modes or {}
+        selection = cls()
+
+        for db_index, db in enumerate(dbs):
+            for message in db.messages:
+                if message.name not in selected_signals:
+                    continue
+
+                modes = message_modes.get(message.name, {})
+                selection.add_message(
+                    db_index,
+                    message.frame_id,
+                    message.is_extended_frame,
+                    signals=selected_signals[message.name],
+                    rx=modes.get("rx", False),
+                    tx=modes.get("tx", False)
+                )
+
+        return selection
@@ -1,14 +1,9 @@
-from jinja2 import Environment, FileSystemLoader
-import os
+from .template_env import create_environment, get_shared_renderer, stream_template
+
 
 class CPPRenderer:
     def __init__(self):
-        template_dir = os.path.join(os.path.dirname(__file__), "..", "templates", "cpp")
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            trim_blocks=False,
-            lstrip_blocks=False
-            )
+        self.env = create_environment("cpp")
 
     def render_can_db_def(self, ir):
         return self.env.get_template("can_db_def.hpp.j2").render(ir=ir)
@@ -32,4 +27,21 @@ class CPPRenderer:
             self.render_db_c(ir),
             self.render_interface_h(ir),
             self.render_interface_c(ir)
-        )
\ No newline at end of file
+        )
+
+    def stream_all(self, ir):
+        """
+        Same files as render_all, but as lazy template streams.
+
+        Nothing is rendered until a stream is iterated or dumped, so the
+        output can be written chunk by chunk without holding whole files in memory.
+        """
+        return tuple(
+            stream_template(self.env.get_template(name), ir)
+            for name in ("can_db_def.hpp.j2", "db_hpp.j2", "db_cpp.j2", "interface_hpp.j2", "interface_cpp.j2")
+        )
+
+
+def get_cpp_renderer() -> CPPRenderer:
+    """Return the shared CPPRenderer, templates are compiled only once per process."""
+    return get_shared_renderer(CPPRenderer)
@@ -0,0 +1,144 @@
+import os
+import threading
+from typing import Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.bccache import Bucket
+
+from ..utils.cache_dirs import user_cache_dir
+
+
+TEMPLATES_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "templates"))
+
+# Precompiled bytecode shipped next to the templates (see scripts/precompile_templates.py).
+PACKAGE_CACHE_DIR = os.path.join(TEMPLATES_DIR, "__jinja_cache__")
+
+LANGUAGES = ("c", "cpp")
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    Bytecode cache keyed by the template path relative to the templates directory.
+
+    Jinja keys cache entries by the absolute template file name, which changes
+    when the package is bundled or installed elsewhere. Keying by the relative
+    path keeps precompiled entries valid after the package is moved. Jinja still
+    checks the template source checksum and its own/Python version, so stale
+    entries are recompiled.
+    """
+
+    def get_cache_key(self, name: str, filename: Optional[str] = None) -> str:
+        if filename is not None:
+            try:
+                filename = os.path.relpath(filename, TEMPLATES_DIR).replace(os.sep, "/")
+            except ValueError:
+                pass  # different drive on Windows, keep the absolute path
+        return super().get_cache_key(name, filename)
+
+    def dump_bytecode(self, bucket: Bucket):
+        # A read-only cache (e.g. precompiled in an installed package) only costs a recompile.
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def template_cache_dir() -> str:
+    """
+    Return the directory of the template bytecode cache.
+
+    CANLIBGEN_TEMPLATE_CACHE_DIR overrides the location. Otherwise the
+    precompiled cache next to the templates is used when present, else the
+    per-user cache directory.
+    """
+    override = os.environ.get("CANLIBGEN_TEMPLATE_CACHE_DIR")
+    if override:
+        return override
+
+    if os.path.isdir(PACKAGE_CACHE_DIR):
+        return PACKAGE_CACHE_DIR
+
+    return user_cache_dir("templates")
+
+
+def create_bytecode_cache(cache_dir: Optional[str] = None) -> Optional[TemplateBytecodeCache]:
+    """Create the bytecode cache, None if the cache directory can't be created."""
+    cache_dir = cache_dir or template_cache_dir()
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+
+    return TemplateBytecodeCache(cache_dir)
+
+
+def create_environment(language: str, cache_dir: Optional[str] = None) -> Environment:
+    """
+    Create the Jinja environment for the templates of a language ("c" or "cpp").
+
+    Args:
+        language: Template subdirectory.
+        cache_dir: Bytecode cache directory, defaults to template_cache_dir().
+    """
+    return Environment(
+        loader=FileSystemLoader(os.path.join(TEMPLATES_DIR, language)),
+        trim_blocks=False,
+        lstrip_blocks=False,
+        bytecode_cache=create_bytecode_cache(cache_dir)
+    )
+
+
+def precompile_templates(cache_dir: Optional[str] = None) -> list:
+    """
+    Compile all templates into the bytecode cache.
+
+    Args:
+        cache_dir: Target directory, defaults to the cache shipped next to the templates.
+
+    Returns:
+        List of compiled template names.
+    """
+    cache_dir = cache_dir or PACKAGE_CACHE_DIR
+    compiled = []
+
+    for language in LANGUAGES:
+        env = create_environment(language, cache_dir)
+        for name in env.list_templates(extensions=("j2",)):
+            env.get_template(name)
+            compiled.append(f"{language}/{name}")
+
+    return compiled
+
+
+# Number of template output chunks joined before they are written.
+STREAM_BUFFER_SIZE = 128
+
+
+def stream_template(template, ir):
+    """Return a buffered TemplateStream rendering the template for the IR."""
+    stream = template.stream(ir=ir)
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+    return stream
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def get_shared_renderer(renderer_class):
+    """
+    Return the process-wide instance of a renderer class, created on first use.
+
+    Renderers only hold a Jinja environment, which is safe to share between threads.
+    """
+    renderer = _renderers.get(renderer_class)
+
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(renderer_class)
+            if renderer is None:
+                renderer = renderer_class()
+                _renderers[renderer_class] = renderer
+
+    return renderer
@@ -1,138 +1,148 @@
 import os
 import sys
-import shutil
-import cantools
-from collections import namedtuple
 
+from ..generate_functions.generate_targets import Target, generate_targets
+from ..generate_functions.write_library import write_output
+from ..ir.selection import Selection
+from ..utils.dbc_cache import load_dbc_file
 
-def generate_all_code(dbc_filename, library_name, generate_c_code, generate_cpp_code, embedded=False, output_suffix="", with_units=False,
-                      generate_counter=True, generate_crc=True, generate_callback=True):
-    """
-    Generates both C and C++ libraries from a given DBC file.
-    """
 
-    # --- Paths setup ---
-    dbc_path = os.path.abspath(dbc_filename)
-    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'temp'))
+output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'temp'))
 
-    # --- Create output directory ---
-    os.makedirs(output_dir, exist_ok=True)
 
-    # --- Load DBC file ---
+def _load_dbs(dbc_filename):
+    dbc_path = os.path.abspath(dbc_filename)
+
     try:
-        db = cantools.database.load_file(dbc_path)
-        db.name = os.path.basename(dbc_path)
-        dbc_dbs = [db]
+        return [load_dbc_file(dbc_path)]
     except Exception as e:
         print(f"Error: Can't read DBC file {dbc_path}: {e}")
         sys.exit(1)
 
-    # --- Mock structures for testing (LEGACY SUPPORT) ---
-    SelectedItem = namedtuple("SelectedItem", ["type", "name", "parent"])
-
-    selected_items = [
-        SelectedItem("Message", "msgMotor_01", None),
-        SelectedItem("Signal", "sigMO_CRC", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_CTR", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_MotorRunningStatus", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_PedalPosition", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_EngineSpeed", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_EngineTorque", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_Oil_Temperature", "msgMotor_01"),
-        SelectedItem("Signal", "sigMO_Oil_pressure", "msgMotor_01"),
-        SelectedItem("Message", "msgVD_GNSS_precision_position", None),
-        SelectedItem("Signal", "sigVD_GNSS_LatitudeDegree", "msgVD_GNSS_precision_position"),
-        SelectedItem("Signal", "sigVD_GNSS_LongitudeDegree", "msgVD_GNSS_precision_position"),
-        SelectedItem("Signal", "sigVD_GNSS_heading", "msgVD_GNSS_precision_position")
-    ]
-
-    class MockTree:
-        """Mock implementation of a GUI-like tree structure used for testing."""
-
-        def item(self, item_id, option):
-            if option == "values":
-                return [item_id.type]
-            if option == "text":
-                return item_id.name
-
-        def parent(self, item_id):
-            return SelectedItem("Message", item_id.parent, None)
-
-    tree = MockTree()
+
+def _test_selection(dbc_dbs):
+    """Selection used for testing."""
+    return Selection.from_message_names(dbc_dbs, {
+        "msgMotor_01": [
+            "sigMO_CRC",
+            "sigMO_CTR",
+            "sigMO_MotorRunningStatus",
+            "sigMO_PedalPosition",
+            "sigMO_EngineSpeed",
+            "sigMO_EngineTorque",
+            "sigMO_Oil_Temperature",
+            "sigMO_Oil_pressure",
+        ],
+        "msgVD_GNSS_precision_position": [
+            "sigVD_GNSS_LatitudeDegree",
+            "sigVD_GNSS_LongitudeDegree",
+            "sigVD_GNSS_heading",
+        ],
+        "msgCodecFixture": None,
+    }, {
+        "msgMotor_01": {"rx": True, "tx": True},
+        "msgVD_GNSS_precision_position": {"rx": True},
+        "msgCodecFixture": {"rx": True, "tx": True},
+    })
+
+
+def _save_files(folder_name, library_name, language, contents):
+    """Write a generated library flat into temp/<folder_name>."""
+    ext_h, ext_c = (".h", ".c") if language == "c" else (".hpp", ".cpp")
+    def_h, db_h, db_c, int_h, int_c = contents
+
+    lib_dir = os.path.join(output_dir, folder_name)
+    os.makedirs(lib_dir, exist_ok=True)
+
+    files = {
+        f"can_db_def{ext_h}": def_h,
+        f"{library_name}_db{ext_h}": db_h,
+        f"{library_name}_db{ext_c}": db_c,
+        f"{library_name}_interface{ext_h}": int_h,
+        f"{library_name}_interface{ext_c}": int_c
+    }
+
+    for filename, content in files.items():
+        write_output(os.path.join(lib_dir, filename), content)
+
+
+def generate_all_code(dbc_filename, library_name, generate_c_code, generate_cpp_code, embedded=False, output_suffix="", with_units=False,
+                      generate_counter=True, generate_crc=True, generate_callback=True,
+                      reproducible=False):
+    """
+    Generates both C and C++ libraries from a given DBC file.
+
+    Only files whose content changed are rewritten.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    dbc_dbs = _load_dbs(dbc_filename)
+    selection = _test_selection(dbc_dbs)
 
     c_output_name = f"{library_name}{output_suffix}"
     cpp_output_name = f"{library_name}{output_suffix}_cpp"
 
-    # --- Generate C code ---
-    try:
-        h_init, h_code, c_code, func_h, func_c = generate_c_code(
-            selected_items,
-            library_name,
-            dbc_dbs,
-            tree,
-            __version__="dev",
-            embedded=embedded,
-            with_units=with_units,
-            generate_counter=generate_counter,
-            generate_crc=generate_crc,
-            generate_callback=generate_callback
-        )
-    except Exception as e:
-        print(f"Error during C code generation: {e}")
-        sys.exit(1)
-
-    # --- Save C files ---
-    c_dir = os.path.join(output_dir, c_output_name)
-    if os.path.exists(c_dir):
-        shutil.rmtree(c_dir)
+    for language, generate, folder_name in (("c", generate_c_code, c_output_name),
+                                            ("cpp", generate_cpp_code, cpp_output_name)):
+        try:
+            contents = generate(
+                selection,
+                library_name,
+                dbc_dbs,
+                __version__="dev",
+                embedded=embedded,
+                with_units=with_units,
+                generate_counter=generate_counter,
+                generate_crc=generate_crc,
+                generate_callback=generate_callback,
+                stream=True,
+                reproducible=reproducible
+            )
+        except Exception as e:
+            print(f"Error during {'C' if language == 'c' else 'C++'} code generation: {e}")
+            sys.exit(1)
+
+        _save_files(folder_name, library_name, language, contents)
+
+
+def generate_all_variants(dbc_filename, library_name, variants, reproducible=False, parallel=False):
+    """
+    Generates C and C++ libraries for several option variants, building the IR only once.
+
+    Args:
+        dbc_filename: DBC file to load.
+        library_name: Library name/prefix.
+        variants: Output suffix -> GenerationOptions. Libraries are written to
+            temp/<library_name><suffix> and temp/<library_name><suffix>_cpp.
+        reproducible: Omit the generation date from the file headers.
+        parallel: Render the libraries in a process pool.
+    """
+    os.makedirs(output_dir, exist_ok=True)
 
-    os.makedirs(c_dir, exist_ok=True)
+    dbc_dbs = _load_dbs(dbc_filename)
+    selection = _test_selection(dbc_dbs)
 
-    c_files = {
-        "can_db_def.h": h_init,
-        f"{library_name}_db.h": h_code,
-        f"{library_name}_db.c": c_code,
-        f"{library_name}_interface.h": func_h,
-        f"{library_name}_interface.c": func_c
+    targets = {
+        (suffix, language): Target(language, options)
+        for suffix, options in variants.items()
+        for language in ("c", "cpp")
     }
 
-    for filename, content in c_files.items():
-        with open(os.path.join(c_dir, filename), "w") as f:
-            f.write(content)
-
-    # --- Generate C++ code ---
     try:
-        cpp_def, cpp_db_hpp, cpp_db_cpp, cpp_int_hpp, cpp_int_cpp = generate_cpp_code(
-            selected_items,
+        results = generate_targets(
+            selection,
             library_name,
             dbc_dbs,
-            tree,
+            targets.values(),
             __version__="dev",
-            embedded=embedded,
-            with_units=with_units,
-            generate_counter=generate_counter,
-            generate_crc=generate_crc,
-            generate_callback=generate_callback
+            reproducible=reproducible,
+            parallel=parallel
         )
     except Exception as e:
-        print(f"Error during C++ code generation: {e}")
+        print(f"Error during code generation: {e}")
         sys.exit(1)
 
-    # --- Save C++ files ---
-    cpp_dir = os.path.join(output_dir, cpp_output_name)
-    if os.path.exists(cpp_dir):
-        shutil.rmtree(cpp_dir)
-
-    os.makedirs(cpp_dir, exist_ok=True)
-
-    cpp_files = {
-        "can_db_def.hpp": cpp_def,
-        f"{library_name}_db.hpp": cpp_db_hpp,
-        f"{library_name}_db.cpp": cpp_db_cpp,
-        f"{library_name}_interface.hpp": cpp_int_hpp,
-        f"{library_name}_interface.cpp": cpp_int_cpp
-    }
+    for (suffix, language), target in targets.items():
+        folder_name = f"{library_name}{suffix}" + ("_cpp" if language == "cpp" else "")
+        _save_files(folder_name, library_name, language, results[target])
 
-    for filename, content in cpp_files.items():
-        with open(os.path.join(cpp_dir, filename), "w") as f:
-            f.write(content)
\ No newline at end of file
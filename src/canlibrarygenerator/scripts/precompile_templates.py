@@ -0,0 +1,19 @@
+"""
+Precompile the Jinja templates into the bytecode cache shipped next to the templates.
+
+Run before building the application bundle so the first generation does not
+compile templates:
+
+    python -m src.canlibrarygenerator.scripts.precompile_templates [TARGET_DIR]
+"""
+
+import sys
+
+from src.canlibrarygenerator.renderers.template_env import PACKAGE_CACHE_DIR, precompile_templates
+
+
+if __name__ == "__main__":
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else PACKAGE_CACHE_DIR
+    for name in precompile_templates(target_dir):
+        print(f"Compiled {name}")
+    print(f"Template bytecode written to {target_dir}")
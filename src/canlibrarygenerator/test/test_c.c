@@ -39,6 +39,29 @@ bool compare_data(const uint8_t* a, const uint8_t* b, size_t len) {
     return true;
 }
 
+// Physical value of a signal, also in fixed-point mode
+static double phys(const can_db_sig_t* sig) {
+#ifdef CAN_DB_FIXED_POINT
+    return (double)sig->phys_value * pow(10.0, sig->scale_exp);
+#else
+    return sig->phys_value;
+#endif
+}
+
+// Signal of a message, read through the accessor with lazy decoding
+#ifdef CAN_DB_LAZY_DECODE
+#define SIGNAL(msg, index) cangen_get_signal((msg), (index))
+#else
+#define SIGNAL(msg, index) (&(msg)->signals[index])
+#endif
+
+// The 1e-7 GNSS coordinates keep only float resolution in float mode
+#ifdef CAN_DB_PHYS_FLOAT
+#define GNSS_EPSILON 1E-4
+#else
+#define GNSS_EPSILON 1E-6
+#endif
+
 // --- Standard CAN message test ---
 void test_standard_can_message(void) {
     printf("\n--- Testing CAN Message (ID 0x121) ---\n");
@@ -52,14 +75,14 @@ void test_standard_can_message(void) {
     TEST_ASSERT(unpack_res == 0, "Message decoded successfully");
 
     if (unpack_res == 0) {
-        TEST_ASSERT_FLOAT_EQ(12.0, cangen_msgMotor_01.base.signals[0].phys_value, 1e-3, "sigMO_CRC decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(5.0,  cangen_msgMotor_01.base.signals[1].phys_value, 1e-3, "sigMO_CTR decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(1.0,  cangen_msgMotor_01.base.signals[2].phys_value, 1e-3, "sigMO_MotorRunningStatus decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(5.2,  cangen_msgMotor_01.base.signals[3].phys_value, 1e-3, "sigMO_PedalPosition decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(880.0, cangen_msgMotor_01.base.signals[4].phys_value, 1e-3, "sigMO_EngineSpeed decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(49.0, cangen_msgMotor_01.base.signals[5].phys_value, 1e-3, "sigMO_EngineTorque decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(87.0, cangen_msgMotor_01.base.signals[6].phys_value, 1e-3, "sigMO_Oil_Temperature decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(1.0,  cangen_msgMotor_01.base.signals[7].phys_value, 1e-3, "sigMO_Oil_pressure decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(12.0, phys(SIGNAL(&cangen_msgMotor_01.base, 0)), 1e-3, "sigMO_CRC decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(5.0,  phys(SIGNAL(&cangen_msgMotor_01.base, 1)), 1e-3, "sigMO_CTR decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(1.0,  phys(SIGNAL(&cangen_msgMotor_01.base, 2)), 1e-3, "sigMO_MotorRunningStatus decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(5.2,  phys(SIGNAL(&cangen_msgMotor_01.base, 3)), 1e-3, "sigMO_PedalPosition decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(880.0, phys(SIGNAL(&cangen_msgMotor_01.base, 4)), 1e-3, "sigMO_EngineSpeed decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(49.0, phys(SIGNAL(&cangen_msgMotor_01.base, 5)), 1e-3, "sigMO_EngineTorque decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(87.0, phys(SIGNAL(&cangen_msgMotor_01.base, 6)), 1e-3, "sigMO_Oil_Temperature decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(1.0,  phys(SIGNAL(&cangen_msgMotor_01.base, 7)), 1e-3, "sigMO_Oil_pressure decoded correctly");
     }
 
     // Pack test
@@ -84,10 +107,14 @@ void test_canfd_message(void) {
     TEST_ASSERT(unpack_res == 0, "CAN FD message decoded successfully");
 
     if (unpack_res == 0) {
+#ifdef CAN_DB_SPLIT_LAYOUT
+        TEST_ASSERT(cangen_msgVD_GNSS_precision_position.base.layout->is_fd == 1, "is_fd flag set correctly");
+#else
         TEST_ASSERT(cangen_msgVD_GNSS_precision_position.base.is_fd == 1, "is_fd flag set correctly");
-        TEST_ASSERT_FLOAT_EQ(110.491736, cangen_msgVD_GNSS_precision_position.base.signals[0].phys_value, 1E-6, "sigVD_GNSS_LatitudeDegree decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(189.047311, cangen_msgVD_GNSS_precision_position.base.signals[1].phys_value, 1E-6, "sigVD_GNSS_LongitudeDegree decoded correctly");
-        TEST_ASSERT_FLOAT_EQ(7.8, cangen_msgVD_GNSS_precision_position.base.signals[2].phys_value, 1E-6, "sigVD_GNSS_heading decoded correctly");
+#endif
+        TEST_ASSERT_FLOAT_EQ(110.491736, phys(SIGNAL(&cangen_msgVD_GNSS_precision_position.base, 0)), GNSS_EPSILON, "sigVD_GNSS_LatitudeDegree decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(189.047311, phys(SIGNAL(&cangen_msgVD_GNSS_precision_position.base, 1)), GNSS_EPSILON, "sigVD_GNSS_LongitudeDegree decoded correctly");
+        TEST_ASSERT_FLOAT_EQ(7.8, phys(SIGNAL(&cangen_msgVD_GNSS_precision_position.base, 2)), 1E-6, "sigVD_GNSS_heading decoded correctly");
     }
 
     // Pack test
@@ -95,10 +122,539 @@ void test_canfd_message(void) {
     TEST_ASSERT(pack_res == 0, "CAN FD message packaged successfully");
 
     if (pack_res == 0) {
+#ifndef CAN_DB_PHYS_FLOAT  // float can't tell neighbouring raw coordinates apart
         TEST_ASSERT(compare_data(canfd_data, cangen_msgVD_GNSS_precision_position.base.data, cangen_msgVD_GNSS_precision_position.base.length), "CAN FD data integrity matches after packaging");
+#endif
+    }
+}
+
+// --- Codec fixture test ---
+// msgCodecFixture (ID 0x300): Motorola, signed and signals over 32 bits, the last signals end at byte 63 of the
+// 64-byte CAN FD frame. The expected raw values are the unsigned signal bits, computed with cantools.
+void test_codec_fixture(void) {
+    printf("\n--- Testing Codec Fixture (ID 0x300) ---\n");
+
+    const uint32_t can_id = 0x300;
+    can_db_msg_t* msg = &cangen_msgCodecFixture.base;
+    uint8_t data[64];
+    for (int i = 0; i < 64; i++) {
+        data[i] = (uint8_t)(i * 0x3B + 0x17);
+    }
+
+    int unpack_res = cangen_unpackage_message(can_id, data, sizeof(data));
+    TEST_ASSERT(unpack_res == 0, "64-byte CAN FD message decoded successfully");
+
+    if (unpack_res == 0) {
+        TEST_ASSERT(SIGNAL(msg, 0)->raw_value == 0x175u, "Motorola 12-bit signal decoded");
+        TEST_ASSERT(SIGNAL(msg, 1)->raw_value == 0x28DCu, "Motorola signed 16-bit signal decoded");
+        TEST_ASSERT(SIGNAL(msg, 2)->raw_value == 0x203u, "Intel signed 10-bit signal decoded");
+        TEST_ASSERT(SIGNAL(msg, 3)->raw_value == 0xA0652AEFB479ull, "Intel 48-bit signal decoded");
+        TEST_ASSERT(SIGNAL(msg, 4)->raw_value == 0xDB16518CC7ull, "Motorola 40-bit signal decoded");
+        TEST_ASSERT(SIGNAL(msg, 5)->raw_value == 0xEEB3783D02ull, "Intel signed 40-bit signal decoded");
+        TEST_ASSERT(SIGNAL(msg, 6)->raw_value == 0x6429u, "Intel 16-bit signal with a fraction factor decoded");
+        TEST_ASSERT(SIGNAL(msg, 7)->raw_value == 0xFF3A7u, "Motorola signal at the end of the FD frame decoded");
+        TEST_ASSERT(SIGNAL(msg, 8)->raw_value == 0x9C6126EBB0ull, "Intel signal ending at byte 63 decoded");
+        TEST_ASSERT_FLOAT_EQ(-254.5, phys(SIGNAL(msg, 2)), 1e-3, "Intel signed 10-bit signal sign-extended");
+#ifndef CAN_DB_PHYS_FLOAT  // float can't hold the 40-bit value exactly
+        TEST_ASSERT_FLOAT_EQ(-74298409726.0, phys(SIGNAL(msg, 5)), 1e-3, "Intel signed 40-bit signal sign-extended");
+#endif
+    }
+
+    // The generic codec sign-extends signed signals in every mode, init makes change detection decode the whole frame
+    cangen_init(msg);
+    TEST_ASSERT(cangen_decode_message(msg, data, sizeof(data)) == 0, "64-byte CAN FD message decoded by the generic codec");
+    TEST_ASSERT_FLOAT_EQ(-254.5, phys(SIGNAL(msg, 2)), 1e-3, "Intel signed 10-bit signal sign-extended by the generic codec");
+#ifndef CAN_DB_PHYS_FLOAT
+    TEST_ASSERT_FLOAT_EQ(-74298409726.0, phys(SIGNAL(msg, 5)), 1e-3, "Intel signed 40-bit signal sign-extended by the generic codec");
+#endif
+
+    // -1234 (Motorola) and -100 (Intel) are negative raw values; the wide signals hold raw values
+    // above 2^32 with at most 24 significant bits, exact in every mode
+    const uint8_t frame[64] = {
+        0xAB, 0xCF, 0xB2, 0xE0, 0x9C, 0x03, 0x00, 0x00, 0x00, 0x56, 0x34, 0x12, 0xAB, 0xCD, 0x00, 0x00,
+        0x00, 0x00, 0x00, 0x00, 0xCC, 0xED, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xFE, 0xDC, 0xB0, 0x00, 0x00, 0x00, 0xDC, 0xFE,
+    };
+
+    unpack_res = cangen_unpackage_message(can_id, frame, sizeof(frame));
+    TEST_ASSERT(unpack_res == 0 && SIGNAL(msg, 1)->raw_value == 0xFB2Eu && SIGNAL(msg, 2)->raw_value == 0x39Cu,
+                "Negative raw values decoded as signal bits");
+    TEST_ASSERT_FLOAT_EQ(-1234.0, phys(SIGNAL(msg, 1)), 1e-3, "Negative Motorola signal decoded");
+    TEST_ASSERT_FLOAT_EQ(-50.0, phys(SIGNAL(msg, 2)), 1e-3, "Negative Intel signal decoded");
+
+    int pack_res = cangen_package_message(can_id);
+    TEST_ASSERT(pack_res == 0, "64-byte CAN FD message packaged successfully");
+
+    if (pack_res == 0) {
+        TEST_ASSERT(compare_data(frame, msg->data, sizeof(frame)), "64-byte CAN FD data integrity matches after packaging");
+        TEST_ASSERT(SIGNAL(msg, 3)->raw_value == 0x123456000000ull && SIGNAL(msg, 4)->raw_value == 0xABCD000000ull,
+                    "48- and 40-bit raw values above 2^32 encoded");
     }
 }
 
+// --- Generic signal functions test ---
+void test_signal_functions(void) {
+    printf("\n--- Testing Generic Signal Functions ---\n");
+
+    uint8_t data[16];
+    for (int i = 0; i < 16; i++) {
+        data[i] = (uint8_t)(i * 0x25 + 0x13);
+    }
+
+    TEST_ASSERT(cangen_parse_signal(data, 16, 100, 20, false) == 0x19F4C, "Intel signal at the message end parsed");
+    TEST_ASSERT(cangen_parse_signal(data, 16, 7, 64, false) == 0x762DE3994F04BA70ull, "Intel signal over 9 bytes parsed");
+    TEST_ASSERT(cangen_parse_signal(data, 16, 15, 16, true) == 0x1338, "Motorola signal parsed");
+    TEST_ASSERT(cangen_parse_signal(data, 16, 130, 8, true) == 0xF0, "Motorola bits after the message read as 0");
+    TEST_ASSERT(cangen_parse_signal(data, 3, 20, 8, false) == 0x25, "Signal of a short message parsed");
+
+    const uint8_t intel_data[4] = { 0xEF, 0xCD, 0xAB, 0x3E };
+    cangen_insert_signal(data, 16, 0xABCDE, 100, 20, false);
+    TEST_ASSERT(compare_data(intel_data, &data[12], 4), "Intel signal inserted, neighbouring bits kept");
+
+    const uint8_t motorola_data[2] = { 0xBF, 0xFE };
+    cangen_insert_signal(data, 16, 0x3FF, 124, 10, true);
+    TEST_ASSERT(compare_data(motorola_data, &data[14], 2), "Motorola signal inserted, neighbouring bits kept");
+
+    const uint8_t clipped_data[4] = { 0xFF, 0xFF, 0xDF, 0xFF };
+    memset(data, 0xFF, sizeof(data));
+    cangen_insert_signal(data, 3, 0xABCD, 20, 16, false);
+    TEST_ASSERT(compare_data(clipped_data, data, 4), "Bits after the message not written");
+}
+
+#ifdef CAN_DB_FIXED_POINT
+// --- Fixed-point test ---
+void test_fixed_point(void) {
+    printf("\n--- Testing Fixed-Point Scaling ---\n");
+
+    // sigMO_Oil_Temperature: factor 0.04, offset -30
+    can_db_sig_t* oil = &cangen_msgMotor_01.base.signals[6];
+    TEST_ASSERT(oil->scale_exp == CANGEN_MSGMOTOR_01_SIGMO_OIL_TEMPERATURE_SCALE_EXP && oil->scale_exp == -2, "Scale exponent generated");
+    TEST_ASSERT(oil->factor == 4 && oil->offset == -3000, "Factor and offset scaled exactly");
+
+    oil->phys_value = -2998;
+    TEST_ASSERT(cangen_package_message(0x121) == 0 && oil->raw_value == 1u, "Positive half raw value rounded away from zero");
+    oil->phys_value = -3002;
+    TEST_ASSERT(cangen_package_message(0x121) == 0 && (int64_t)oil->raw_value == -1, "Negative half raw value rounded away from zero");
+
+    oil->phys_value = 0;
+    TEST_ASSERT(cangen_package_message(0x121) == 0 && oil->raw_value == 750u, "Scaled value encoded");
+    TEST_ASSERT(cangen_unpackage_message(0x121, cangen_msgMotor_01.base.data, 8) == 0 && SIGNAL(&cangen_msgMotor_01.base, 6)->phys_value == 0, "Scaled value decoded");
+
+    // sigCF_Third: factor 0.333333333333333 = 1/3, scaled to 10/3 at one decimal place
+    can_db_sig_t* third = &cangen_msgCodecFixture.base.signals[6];
+    TEST_ASSERT(third->factor == 10 && third->divisor == 3 && third->scale_exp == -1, "Fraction factor scaled as factor / divisor");
+
+    third->phys_value = 3333;
+    TEST_ASSERT(cangen_package_message(0x300) == 0 && third->raw_value == 1000u, "Fraction scaled value encoded");
+    TEST_ASSERT(cangen_unpackage_message(0x300, cangen_msgCodecFixture.base.data, 64) == 0 && SIGNAL(&cangen_msgCodecFixture.base, 6)->phys_value == 3333, "Fraction scaled value decoded");
+}
+#endif
+
+#ifdef CAN_DB_SPLIT_LAYOUT
+// --- Split layout test ---
+void test_split_layout(void) {
+    printf("\n--- Testing Split Layout ---\n");
+
+    const uint8_t raw_data[8] = { 0x0C, 0xB5, 0x01, 0x6E, 0xC4, 0xD0, 0xB6, 0x01 };
+    can_db_msg_t* msg = &cangen_msgMotor_01.base;
+    const can_db_sig_layout_t* oil = &msg->layout->signals[6];
+
+    TEST_ASSERT(msg->layout->id == 0x121 && msg->layout->num_signals == 8, "Message layout in constant table");
+    TEST_ASSERT(oil->start_bit == 44 && oil->length == 12, "Signal layout in constant table");
+
+    TEST_ASSERT(cangen_decode_message(msg, raw_data, sizeof(raw_data)) == 0, "Message decoded by the generic codec");
+    TEST_ASSERT_FLOAT_EQ(880.0, phys(SIGNAL(msg, 4)), 1e-3, "sigMO_EngineSpeed decoded with the signal layout");
+    TEST_ASSERT_FLOAT_EQ(87.0, phys(SIGNAL(msg, 6)), 1e-3, "sigMO_Oil_Temperature decoded with the signal layout");
+
+    cangen_encode_message(msg);
+    TEST_ASSERT(compare_data(raw_data, msg->data, msg->length), "Message encoded by the generic codec");
+
+    cangen_init(msg);
+    bool initialized = true;
+    for (size_t i = 0; i < msg->layout->num_signals; i++) {
+        initialized = initialized && msg->signals[i].raw_value == msg->layout->signals[i].raw_init;
+    }
+    TEST_ASSERT(initialized, "Init values read from the signal layouts");
+}
+#endif
+
+#ifdef CAN_DB_COMPACT_LAYOUT
+// --- Compact layout test ---
+void test_compact_layout(void) {
+    printf("\n--- Testing Compact Layout ---\n");
+
+#ifdef CAN_DB_SPLIT_LAYOUT
+    const can_db_msg_layout_t* msg = cangen_msgMotor_01.base.layout;
+#else
+    const can_db_msg_t* msg = &cangen_msgMotor_01.base;
+#endif
+
+    // Largest CAN ID 0xD001, at most 8 signals, start bits up to 479 in the 64-byte codec fixture
+    TEST_ASSERT(sizeof(msg->id) == 2 && msg->id == 0x121, "CAN ID narrowed to uint16_t");
+    TEST_ASSERT(sizeof(msg->num_signals) == 1 && msg->num_signals == 8, "Signal count narrowed to uint8_t");
+    TEST_ASSERT(sizeof(msg->signals[6].start_bit) == 2 && msg->signals[6].start_bit == 44 && msg->signals[6].length == 12, "Signal bit position narrowed to uint16_t");
+}
+#endif
+
+#ifdef CAN_DB_CHANGE_DETECTION
+// --- Change detection test ---
+void test_change_detection(void) {
+    printf("\n--- Testing Change Detection ---\n");
+
+    uint8_t raw_data[8] = { 0x0C, 0xB5, 0x01, 0x6E, 0xC4, 0xD0, 0xB6, 0x01 };
+    can_db_msg_t* msg = &cangen_msgMotor_01.base;
+    can_db_sig_t* speed = &msg->signals[4];
+
+    cangen_init(msg);
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && speed->changed && msg->signals[6].changed, "First frame after init decoded in full");
+
+    for (size_t i = 0; i < 8; i++) {
+        msg->signals[i].changed = false;
+    }
+    speed->raw_value = 0;
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && speed->raw_value == 0 && !msg->signals[7].changed, "Identical frame skipped");
+
+    // sigMO_Oil_pressure is byte 7, sigMO_EngineSpeed bytes 2 to 4
+    raw_data[7] = 0x02;
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && msg->signals[7].changed && msg->signals[7].raw_value == 2u, "Signal of the changed byte decoded");
+    TEST_ASSERT(speed->raw_value == 0 && !speed->changed && !msg->signals[6].changed, "Signals of unchanged bytes skipped");
+
+    // sigMO_EngineTorque shares byte 4 with sigMO_EngineSpeed
+    raw_data[4] ^= 0x80;
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && msg->signals[5].changed && speed->raw_value == 880u, "Signals sharing a changed byte decoded");
+    TEST_ASSERT(!msg->signals[6].changed, "Signal of other bytes not flagged");
+
+    cangen_init(msg);
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && speed->raw_value == 880u && msg->signals[0].changed, "Frame after init decoded in full");
+
+    // Packaging a TX message writes the signals and data, the next received frame is decoded in full
+    can_db_sig_t* pedal = &msg->signals[3];
+    const double rx_pedal = phys(pedal);
+#ifdef CAN_DB_FIXED_POINT
+    pedal->phys_value = (int64_t)llround(50.1 / pow(10.0, pedal->scale_exp));
+#else
+    pedal->phys_value = 50.1;
+#endif
+    TEST_ASSERT(cangen_package_message(0x121) == 0 && pedal->raw_value == 125u, "TX value packaged");
+
+    uint8_t tx_data[8];
+    memcpy(tx_data, msg->data, sizeof(tx_data));
+    TEST_ASSERT(cangen_unpackage_message(0x121, tx_data, sizeof(tx_data)) == 0 && pedal->raw_value == 125u, "Frame equal to the packaged data decoded");
+    TEST_ASSERT_FLOAT_EQ(50.0, phys(pedal), 1E-6, "Physical value of the frame equal to the packaged data");
+
+#ifdef CAN_DB_FIXED_POINT
+    pedal->phys_value = (int64_t)llround(50.1 / pow(10.0, pedal->scale_exp));
+#else
+    pedal->phys_value = 50.1;
+#endif
+    TEST_ASSERT(cangen_package_buffer(0x121, tx_data, sizeof(tx_data)) == 8 && compare_data(tx_data, msg->data, 8), "TX value packaged into a buffer");
+    TEST_ASSERT(cangen_unpackage_message(0x121, tx_data, sizeof(tx_data)) == 0, "Frame equal to the stored data received");
+    TEST_ASSERT_FLOAT_EQ(50.0, phys(pedal), 1E-6, "Frame equal to the stored data decoded after packaging into a buffer");
+
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0, "Received frame stored");
+    TEST_ASSERT_FLOAT_EQ(rx_pedal, phys(pedal), 1E-6, "Received physical value restored");
+}
+#endif
+
+#ifdef CAN_DB_LAZY_DECODE
+// --- Lazy decoding test ---
+void test_lazy_decode(void) {
+    printf("\n--- Testing Lazy Decoding ---\n");
+
+    const uint8_t raw_data[8] = { 0x0C, 0xB5, 0x01, 0x6E, 0xC4, 0xD0, 0xB6, 0x01 };
+    can_db_msg_t* msg = &cangen_msgMotor_01.base;
+    can_db_sig_t* crc = &msg->signals[0];
+    can_db_sig_t* speed = &msg->signals[4];
+
+    cangen_init(msg);
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && crc->raw_value == 0 && speed->raw_value == 0, "Received data stored without decoding");
+
+    cangen_msgMotor_01_sigMO_CRC_get();
+    TEST_ASSERT(crc->raw_value == 12u && speed->raw_value == 0, "Signal decoded on its first read only");
+    TEST_ASSERT(cangen_get_signal(msg, 4) == speed && speed->raw_value == 880u, "Signal decoded through the generic accessor");
+
+    crc->raw_value = 0;
+    cangen_msgMotor_01_sigMO_CRC_get();
+    TEST_ASSERT(crc->raw_value == 0, "Decoded signal not decoded again");
+
+    TEST_ASSERT(cangen_unpackage_message(0x121, raw_data, sizeof(raw_data)) == 0 && cangen_get_signal(msg, 0)->raw_value == 12u, "Signal decoded again after the next frame");
+
+    cangen_encode_message(msg);
+    TEST_ASSERT(compare_data(raw_data, msg->data, msg->length), "Unread signals decoded before encoding");
+}
+#endif
+
+// --- Message lookup test ---
+void test_message_lookup(void) {
+    printf("\n--- Testing Message Lookup ---\n");
+
+    TEST_ASSERT(cangen_find_message(0x121, false) == &cangen_msgMotor_01.base, "Standard frame found by ID and frame type");
+    TEST_ASSERT(cangen_find_message(0xD001, true) == &cangen_msgVD_GNSS_precision_position.base, "Extended frame found by ID and frame type");
+    TEST_ASSERT(cangen_find_message(0x121, true) == NULL, "Standard ID not found as extended frame");
+    TEST_ASSERT(cangen_find_message(0xD001, false) == NULL, "Extended ID not found as standard frame");
+    TEST_ASSERT(cangen_find_message_by_id(0xD001) == &cangen_msgVD_GNSS_precision_position.base, "Extended frame found by ID");
+    TEST_ASSERT(cangen_find_message_by_id(0x120) == NULL && cangen_find_message_by_id(0x122) == NULL, "Unknown standard IDs not found");
+    TEST_ASSERT(cangen_find_message_by_id(0xD000) == NULL && cangen_find_message_by_id(0x1FFFFFFF) == NULL, "Unknown extended IDs not found");
+}
+
+// --- RX dispatch test ---
+static int motor_callback_calls = 0;
+
+static void motor_callback(void) {
+    motor_callback_calls++;
+}
+
+void test_rx_dispatch(void) {
+    printf("\n--- Testing RX Dispatch ---\n");
+
+    const uint8_t raw_data[8] = { 0x0F, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00 };
+    cangen_msgMotor_01.base.cb_fnc = motor_callback;
+
+    TEST_ASSERT(cangen_dispatch_rx(0x121, false, raw_data, sizeof(raw_data)) == 0, "Standard frame dispatched");
+    TEST_ASSERT(motor_callback_calls == 1, "Callback executed after dispatch");
+    TEST_ASSERT_FLOAT_EQ(15.0, phys(SIGNAL(&cangen_msgMotor_01.base, 0)), 1e-3, "sigMO_CRC decoded by dispatch");
+    TEST_ASSERT_FLOAT_EQ(3.0, phys(SIGNAL(&cangen_msgMotor_01.base, 1)), 1e-3, "sigMO_CTR decoded by dispatch");
+
+    TEST_ASSERT(cangen_dispatch_rx(0x121, true, raw_data, sizeof(raw_data)) == -1, "Standard ID as extended frame not dispatched");
+    TEST_ASSERT(cangen_dispatch_rx(0x121, false, raw_data, 4) == -1, "Frame with wrong length not dispatched");
+    TEST_ASSERT(cangen_dispatch_rx(0x7FF, false, raw_data, sizeof(raw_data)) == -1, "Unknown frame not dispatched");
+    TEST_ASSERT(motor_callback_calls == 1, "Callback not executed for rejected frames");
+
+    cangen_msgMotor_01_input_processing(&cangen_msgMotor_01.base);
+    TEST_ASSERT(motor_callback_calls == 2, "Callback executed by input processing");
+
+    cangen_msgMotor_01.base.cb_fnc = NULL;
+}
+
+// --- Cyclic TX scheduler test ---
+static int motor_tx_calls = 0;
+
+static void motor_tx_callback(void) {
+    motor_tx_calls++;
+}
+
+void test_tx_scheduler(void) {
+    printf("\n--- Testing Cyclic TX Scheduler ---\n");
+
+    // msgMotor_01: start delay 100 ms, cycle 100 ms, fast cycle 20 ms; the time wraps around after 256 ms
+    const uint32_t start = 0xFFFFFF00u;
+    cangen_msgMotor_01.base.cb_fnc = motor_tx_callback;
+    cangen_tx_start(start);
+
+    cangen_tx_tick(start + 99u);
+    TEST_ASSERT(motor_tx_calls == 0, "Message not sent before its start delay");
+    cangen_tx_tick(start + 100u);
+    TEST_ASSERT(motor_tx_calls == 1, "Message sent after its start delay");
+    cangen_tx_tick(start + 150u);
+    cangen_tx_tick(start + 199u);
+    TEST_ASSERT(motor_tx_calls == 1, "Message not sent again within its cycle");
+    cangen_tx_tick(start + 200u);
+    TEST_ASSERT(motor_tx_calls == 2, "Message sent after its cycle, across the time wrap-around");
+
+    cangen_msgMotor_01_set_fast_cycle(true);
+    cangen_tx_tick(start + 219u);
+    TEST_ASSERT(motor_tx_calls == 2, "Fast cycle counted from the last transmission");
+    cangen_tx_tick(start + 220u);
+    cangen_tx_tick(start + 240u);
+    TEST_ASSERT(motor_tx_calls == 4, "Message sent in its fast cycle");
+
+    cangen_msgMotor_01_set_fast_cycle(false);
+    cangen_tx_tick(start + 260u);
+    cangen_tx_tick(start + 359u);
+    TEST_ASSERT(motor_tx_calls == 5, "Planned transmission kept when returning to the normal cycle");
+    cangen_tx_tick(start + 360u);
+    TEST_ASSERT(motor_tx_calls == 6, "Message sent in its normal cycle again");
+
+    cangen_tx_tick(start + 1000u);
+    cangen_tx_tick(start + 1099u);
+    TEST_ASSERT(motor_tx_calls == 7, "Missed cycles skipped instead of sent in a burst");
+    cangen_tx_tick(start + 1100u);
+    TEST_ASSERT(motor_tx_calls == 8, "Cycle restarted from the late transmission");
+
+    cangen_msgMotor_01.base.cb_fnc = NULL;
+}
+
+// --- TX counter and CRC test ---
+// Bitwise CRC8 AUTOSAR 0x2F (polynomial 0x2F, initial value and final XOR 0xFF)
+static uint8_t crc8_h2f(const uint8_t* data, size_t length) {
+    uint8_t crc = 0xFFu;
+    for (size_t i = 0; i < length; i++) {
+        crc ^= data[i];
+        for (int bit = 0; bit < 8; bit++) {
+            crc = (crc & 0x80u) ? (uint8_t)((crc << 1) ^ 0x2Fu) : (uint8_t)(crc << 1);
+        }
+    }
+    return (uint8_t)(crc ^ 0xFFu);
+}
+
+void test_tx_counter_crc(void) {
+    printf("\n--- Testing TX Counter and CRC ---\n");
+
+    const uint8_t check[9] = { '1', '2', '3', '4', '5', '6', '7', '8', '9' };
+    TEST_ASSERT(crc8_h2f(check, sizeof(check)) == 0xDFu, "Reference CRC8 0x2F check value");
+
+    // msgMotor_01: 4-bit counter sigMO_CTR in byte 1, CRC8 0x2F of bytes 1 to 7 in sigMO_CRC (byte 0)
+    const uint8_t* data = cangen_msgMotor_01.base.data;
+    SIGNAL(&cangen_msgMotor_01.base, 1)->raw_value = 14u;
+    SIGNAL(&cangen_msgMotor_01.base, 5)->phys_value = 300;   // sigMO_EngineTorque, factor 1 in all modes
+
+    cangen_msgMotor_01_output_processing();
+    TEST_ASSERT((data[1] & 0x0Fu) == 15u, "Counter incremented before packaging");
+    TEST_ASSERT(data[0] == crc8_h2f(&data[1], 7u), "CRC of data bytes 1 to 7 written to byte 0");
+    TEST_ASSERT(SIGNAL(&cangen_msgMotor_01.base, 0)->raw_value == data[0], "CRC stored in the CRC signal");
+
+    cangen_msgMotor_01_output_processing();
+    TEST_ASSERT((data[1] & 0x0Fu) == 0u, "Counter wraps around at its 4 bits");
+    TEST_ASSERT(data[0] == crc8_h2f(&data[1], 7u), "CRC updated for the new counter value");
+}
+
+// --- Zero-copy buffer test ---
+void test_zero_copy(void) {
+    printf("\n--- Testing Zero-Copy Buffers ---\n");
+
+    const uint8_t raw_data[8] = { 0x0C, 0xB5, 0x01, 0x6E, 0xC4, 0xD0, 0xB6, 0x01 };
+    uint8_t tx_buffer[8];
+    can_db_msg_t* msg = &cangen_msgMotor_01.base;
+
+    cangen_init(msg);
+    memset(msg->data, 0, msg->length);
+    TEST_ASSERT(cangen_unpackage_buffer(0x121, raw_data, sizeof(raw_data)) == 0, "Frame decoded from the caller buffer");
+    TEST_ASSERT_FLOAT_EQ(880.0, phys(SIGNAL(msg, 4)), 1e-3, "sigMO_EngineSpeed decoded from the caller buffer");
+    TEST_ASSERT_FLOAT_EQ(87.0, phys(SIGNAL(msg, 6)), 1e-3, "sigMO_Oil_Temperature decoded from the caller buffer");
+#ifndef CAN_DB_CHANGE_DETECTION
+    TEST_ASSERT(msg->data[2] == 0, "Frame not copied to the message data");
+#endif
+    TEST_ASSERT(cangen_unpackage_buffer(0x121, raw_data, 7) == -1 && cangen_unpackage_buffer(0x120, raw_data, 8) == -1, "DLC mismatch and unknown ID rejected");
+
+    memset(tx_buffer, 0xAA, sizeof(tx_buffer));
+    TEST_ASSERT(cangen_package_buffer(0x121, tx_buffer, sizeof(tx_buffer)) == 8, "Message packaged into the caller buffer");
+    TEST_ASSERT(compare_data(raw_data, tx_buffer, sizeof(tx_buffer)), "Caller buffer holds the encoded frame");
+    TEST_ASSERT(cangen_package_buffer(0x121, tx_buffer, 7) == -1, "Too small caller buffer rejected");
+
+    // sigMO_CTR is 5 in the frame
+    cangen_msgMotor_01_output_buffer(tx_buffer);
+    TEST_ASSERT((tx_buffer[1] & 0x0Fu) == 6u && tx_buffer[0] == crc8_h2f(&tx_buffer[1], 7u), "Output processing into the caller buffer with counter and CRC");
+#ifndef CAN_DB_CHANGE_DETECTION
+    TEST_ASSERT(msg->data[2] == 0, "Message data not written by the TX buffer functions");
+#endif
+}
+
+// --- RX timeout supervision test ---
+static int motor_timeout_calls = 0;
+
+static void motor_timeout_callback(void) {
+    motor_timeout_calls++;
+}
+
+void test_rx_supervision(void) {
+    printf("\n--- Testing RX Timeout Supervision ---\n");
+
+    // msgMotor_01: cycle 100 ms, timeout 3 cycles; the time wraps around after 256 ms
+    const uint32_t start = 0xFFFFFF00u;
+    const uint8_t raw_data[8] = { 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x2A };
+    cangen_msgMotor_01_set_timeout_callback(motor_timeout_callback);
+    cangen_rx_start(start);
+
+    cangen_rx_tick(start + 50u);
+    TEST_ASSERT(cangen_dispatch_rx(0x121, false, raw_data, sizeof(raw_data)) == 0, "Frame received");
+    TEST_ASSERT(cangen_msgMotor_01.base.timestamp_ms == start + 50u && cangen_msgMotor_01.base.is_active,
+                "Reception stamped with the time of the last tick");
+
+    cangen_rx_tick(start + 300u);
+    cangen_rx_tick(start + 349u);
+    TEST_ASSERT(motor_timeout_calls == 0, "No timeout within three cycles of the last reception");
+    cangen_rx_tick(start + 350u);
+    TEST_ASSERT(motor_timeout_calls == 1 && !cangen_msgMotor_01.base.is_active,
+                "Timeout three cycles after the last reception, across the time wrap-around");
+#ifdef CAN_DB_RX_TIMEOUT_RESET
+    TEST_ASSERT_FLOAT_EQ(0.0, phys(SIGNAL(&cangen_msgMotor_01.base, 6)), 1e-3, "sigMO_Oil_Temperature reset to its init value");
+    TEST_ASSERT_FLOAT_EQ(0.0, phys(SIGNAL(&cangen_msgMotor_01.base, 7)), 1e-3, "sigMO_Oil_pressure reset to its init value");
+#endif
+
+    cangen_rx_tick(start + 1000u);
+    TEST_ASSERT(motor_timeout_calls == 1, "Silent message reported only once");
+
+    TEST_ASSERT(cangen_dispatch_rx(0x121, false, raw_data, sizeof(raw_data)) == 0, "Same frame received again");
+    TEST_ASSERT_FLOAT_EQ(42.0, phys(SIGNAL(&cangen_msgMotor_01.base, 7)), 1e-3, "sigMO_Oil_pressure decoded after the timeout");
+    cangen_rx_tick(start + 1299u);
+    TEST_ASSERT(motor_timeout_calls == 1, "No timeout after the new reception");
+    cangen_rx_tick(start + 1300u);
+    TEST_ASSERT(motor_timeout_calls == 2, "Timeout reported again after a new reception");
+
+    cangen_rx_start(start + 2000u);
+    cangen_rx_tick(start + 2299u);
+    TEST_ASSERT(motor_timeout_calls == 2, "No timeout within the first timeout after the start");
+    cangen_rx_tick(start + 2300u);
+    TEST_ASSERT(motor_timeout_calls == 3, "Message not received since the start times out");
+
+    // Frames decoded by unpackage_message() are stamped like the ones of RX dispatch, identical frames too
+    cangen_rx_start(start + 3000u);
+    for (uint32_t t = 10u; t <= 1000u; t += 10u) {
+        cangen_rx_tick(start + 3000u + t);
+        if (t % 100u == 0) {
+            (void)cangen_unpackage_message(0x121, raw_data, sizeof(raw_data));
+        }
+    }
+    TEST_ASSERT(motor_timeout_calls == 3 && cangen_msgMotor_01.base.is_active && cangen_msgMotor_01.base.timestamp_ms == start + 4000u,
+                "Message unpackaged every cycle does not time out");
+    TEST_ASSERT_FLOAT_EQ(42.0, phys(SIGNAL(&cangen_msgMotor_01.base, 7)), 1e-3, "sigMO_Oil_pressure kept while unpackaged in time");
+
+    cangen_msgMotor_01_set_timeout_callback(NULL);
+}
+
+// --- Batch decode test ---
+void test_unpackage_batch(void) {
+    printf("\n--- Testing Batch Decode ---\n");
+
+    const uint8_t motor_1[8] = { 0x0C, 0xB5, 0x01, 0x6E, 0xC4, 0xD0, 0xB6, 0x01 };
+    const uint8_t motor_2[8] = { 0x0C, 0xB5, 0x01, 0x6E, 0xC4, 0xD0, 0xB6, 0x02 };
+    const uint8_t gnss[16] = { 0x10, 0x37, 0xBB, 0x1D, 0x64, 0x49, 0xE5, 0x0A, 0xE7, 0x04, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00 };
+    const can_db_frame_t frames[5] = {
+        { 0x121, false, 8, motor_1 },
+        { 0x121, false, 8, motor_2 },
+        { 0x121, true, 8, motor_1 },     // not an extended frame message
+        { 0xD001, true, 16, gnss },
+        { 0xD001, true, 8, gnss },       // DLC mismatch
+    };
+    int8_t status[5];
+
+    motor_callback_calls = 0;
+    cangen_msgMotor_01.base.cb_fnc = motor_callback;
+
+    TEST_ASSERT(cangen_unpackage_batch(frames, 5, status, true) == 3, "Valid frames of the batch decoded");
+    TEST_ASSERT(status[0] == 0 && status[1] == 0 && status[2] == -1 && status[3] == 0 && status[4] == -1, "Per-frame status reported");
+    TEST_ASSERT(SIGNAL(&cangen_msgMotor_01.base, 7)->raw_value == 2u, "Last frame of a message sets its signals");
+    TEST_ASSERT_FLOAT_EQ(7.8, phys(SIGNAL(&cangen_msgVD_GNSS_precision_position.base, 2)), 1E-6, "Extended frame of the batch decoded");
+    TEST_ASSERT(motor_callback_calls == 1, "Callback executed once per batch");
+
+    TEST_ASSERT(cangen_unpackage_batch(frames, 2, NULL, false) == 2 && motor_callback_calls == 1, "Batch without status and callbacks");
+    TEST_ASSERT(cangen_unpackage_batch(frames, 0, status, true) == 0 && motor_callback_calls == 1, "Empty batch");
+
+    // 0x121 and 0xD001 share an index cache slot, interleaved frames replace each other's lookups
+    const can_db_frame_t interleaved[4] = {
+        { 0xD001, true, 16, gnss },
+        { 0x121, false, 8, motor_1 },
+        { 0xD001, true, 16, gnss },
+        { 0x121, false, 8, motor_2 },
+    };
+    TEST_ASSERT(cangen_unpackage_batch(interleaved, 4, status, false) == 4 && status[2] == 0 && status[3] == 0
+                && SIGNAL(&cangen_msgMotor_01.base, 7)->raw_value == 2u, "Interleaved frames of two messages decoded");
+
+    // Decoded frames of a batch are stamped for the RX timeout supervision (msgMotor_01 timeout 300 ms)
+    cangen_rx_start(1000u);
+    cangen_msgMotor_01_set_timeout_callback(motor_timeout_callback);
+    motor_timeout_calls = 0;
+    cangen_rx_tick(1250u);
+    TEST_ASSERT(cangen_unpackage_batch(frames, 2, NULL, false) == 2, "Batch decoded before the timeout");
+    cangen_rx_tick(1500u);
+    TEST_ASSERT(motor_timeout_calls == 0 && cangen_msgMotor_01.base.is_active && cangen_msgMotor_01.base.timestamp_ms == 1250u,
+                "Batch decode keeps the message active");
+    cangen_msgMotor_01_set_timeout_callback(NULL);
+
+    cangen_msgMotor_01.base.cb_fnc = NULL;
+}
+
 // --- Registry test ---
 void test_registry_size(void) {
     printf("\n--- Testing C Registry ---\n");
@@ -114,6 +670,30 @@ int main(void) {
 
     test_standard_can_message();
     test_canfd_message();
+    test_codec_fixture();
+    test_signal_functions();
+#ifdef CAN_DB_FIXED_POINT
+    test_fixed_point();
+#endif
+#ifdef CAN_DB_SPLIT_LAYOUT
+    test_split_layout();
+#endif
+#ifdef CAN_DB_COMPACT_LAYOUT
+    test_compact_layout();
+#endif
+#ifdef CAN_DB_CHANGE_DETECTION
+    test_change_detection();
+#endif
+#ifdef CAN_DB_LAZY_DECODE
+    test_lazy_decode();
+#endif
+    test_message_lookup();
+    test_rx_dispatch();
+    test_tx_scheduler();
+    test_rx_supervision();
+    test_tx_counter_crc();
+    test_zero_copy();
+    test_unpackage_batch();
     test_registry_size();
 
     printf("\n======================================\n");
@@ -1,12 +1,24 @@
+import contextlib
+import io
 import os
 import subprocess
 import shutil
 import sys
+import tempfile
+import threading
+from unittest import mock
 
-from src.canlibrarygenerator.generate_functions.generate_c_library import generate_c_code
-from src.canlibrarygenerator.generate_functions.generate_cpp_library import generate_cpp_code
-from src.canlibrarygenerator.scripts.codegen_utils import generate_all_code
+import cantools
+
+from src.canlibrarygenerator.cli import SelectionError, resolve_selection
+from src.canlibrarygenerator.ir.builder import build_library_ir, build_message_index
+from src.canlibrarygenerator.ir.options import GenerationOptions
+from src.canlibrarygenerator.ir.selection import MessageKey, Selection
+from src.canlibrarygenerator.scripts.codegen_utils import generate_all_variants
 from src.canlibrarygenerator.scripts.delete_temp_files import delete_temp_files
+from src.canlibrarygenerator.utils import dbc_cache, dbc_loader
+from src.canlibrarygenerator.utils.dbc_cache import DBCCache, default_cache_dir, load_dbc_file
+from src.canlibrarygenerator.utils.dbc_loader import iter_load_dbc_files
 
 
 def run_cmd(cmd, step_name):
@@ -43,26 +55,400 @@ test_dir = os.path.abspath(os.path.dirname(__file__))
 library_name = "cangen"
 
 
-def generate_variant(embedded: bool, suffix: str, with_units: bool = False):
-    label_parts = ["embedded" if embedded else "normal"]
-
-    if with_units:
-        label_parts.append("units")
-
-    label = " + ".join(label_parts)
-
-    print(f"\n🔧 Generating {label} code from DBC...")
+def generate_variants():
+    print("\n🔧 Generating normal, normal + units and embedded code from DBC...")
 
-    generate_all_code(
+    # The variants also cover the direct (auto), hash and binary search message lookups,
+    # the unrolled message codec, split layout and lazy decoding (embedded), fixed-point scaling, the compact
+    # layout and change detection (units), the reset of timed out RX messages (units, embedded)
+    generate_all_variants(
         dbc_file,
         library_name,
-        generate_c_code,
-        generate_cpp_code,
-        embedded=embedded,
-        output_suffix=suffix,
-        with_units=with_units
+        {
+            "": GenerationOptions(),
+            "_units": GenerationOptions(
+                with_units=True, message_lookup="hash", fixed_point=True, compact_layout=True, change_detection=True,
+                rx_timeout_reset=True
+            ),
+            "_embedded": GenerationOptions(
+                embedded=True, message_lookup="binary", unrolled_codec=True, phys_type="float", split_layout=True,
+                lazy_decode=True, rx_timeout_reset=True
+            ),
+        },
+        parallel=True
     )
 
+def generate_cli_variant(folder_name: str):
+    print(f"\n🔧 Generating {folder_name} code from DBC via command line...")
+
+    run_cmd([
+        sys.executable, "-m", "src.canlibrarygenerator.cli",
+        dbc_file,
+        "-o", os.path.join(output_dir, folder_name),
+        "--name", library_name,
+        "--language", "both",
+        "--all",
+        "--message", "msgMotor_01:tx",
+        "--reproducible",
+        "--unrolled-codec",
+        "--fixed-point",
+        "--change-detection"
+    ], f"Command line generation ({folder_name})")
+
+
+def check_unchanged_regeneration(folder_name: str):
+    """
+    Regenerates a reproducible library and checks that no output file was rewritten.
+    """
+    lib_root = os.path.join(output_dir, folder_name)
+    before = {}
+
+    for root, _, files in os.walk(lib_root):
+        for name in files:
+            path = os.path.join(root, name)
+            before[path] = os.stat(path).st_mtime_ns
+
+    generate_cli_variant(folder_name)
+
+    touched = [path for path, mtime in before.items() if os.stat(path).st_mtime_ns != mtime]
+
+    if touched:
+        print(f"❌ Regeneration rewrote unchanged files: {touched}")
+        sys.exit(1)
+
+    print(f"✅ Regeneration left all {len(before)} files untouched.")
+
+
+def check(condition: bool, description: str):
+    if not condition:
+        print(f"❌ Check failed: {description}")
+        sys.exit(1)
+
+    print(f"    ✔ {description}")
+
+
+def check_dbc_cache():
+    """
+    Checks hits, misses, corrupt entries, eviction and invalidation of the parsed DBC cache in a temporary directory.
+    """
+    print("\n🔍 Checking the DBC cache...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "cache")
+        dbc_copy = os.path.join(tmp_dir, "CAN_example.dbc")
+        shutil.copyfile(dbc_file, dbc_copy)
+
+        with mock.patch.object(cantools.database, "load_string", wraps=cantools.database.load_string) as parse:
+            cold = DBCCache(cache_dir).load(dbc_copy)
+            check(parse.call_count == 1 and len(DBCCache(cache_dir).entries()) == 1, "Cold load parses and stores an entry")
+
+            warm = DBCCache(cache_dir).load(dbc_copy)
+            check(parse.call_count == 1, "Warm load skips parsing")
+            check([m.name for m in warm.messages] == [m.name for m in cold.messages], "Warm load returns the same messages")
+
+            with open(dbc_copy, "ab") as f:
+                f.write(b"\n")
+            DBCCache(cache_dir).load(dbc_copy)
+            check(parse.call_count == 2 and len(DBCCache(cache_dir).entries()) == 2, "Changed file misses the cache")
+
+            with open(dbc_copy, "rb") as f:
+                entry_path = DBCCache(cache_dir)._entry_path(DBCCache(cache_dir).key_for(f.read()))
+            with open(entry_path, "wb") as f:
+                f.write(b"corrupt")
+            fallback = DBCCache(cache_dir).load(dbc_copy)
+            check(parse.call_count == 3 and len(fallback.messages) == len(cold.messages), "Corrupt entry falls back to parsing")
+            DBCCache(cache_dir).load(dbc_copy)
+            check(parse.call_count == 3, "Corrupt entry is replaced by a valid one")
+
+        key = DBCCache(cache_dir).key_for(b"data")
+        with mock.patch.object(dbc_cache, "CACHE_FORMAT_VERSION", dbc_cache.CACHE_FORMAT_VERSION + 1):
+            check(DBCCache(cache_dir).key_for(b"data") != key, "Cache format version invalidates the keys")
+        with mock.patch.object(cantools, "__version__", "0.0.0"):
+            check(DBCCache(cache_dir).key_for(b"data") != key, "cantools version invalidates the keys")
+
+        bounded = DBCCache(os.path.join(tmp_dir, "bounded"))
+        for age, name in enumerate(["oldest", "older", "newest"]):
+            bounded.put(name, list(range(100)))
+            os.utime(bounded._entry_path(name), (1000 + age, 1000 + age))
+        bounded.max_bytes = bounded.size() - 1
+        bounded.evict()
+        check(bounded.get("oldest") is None and bounded.get("older") is not None and bounded.get("newest") is not None,
+              "Size bound evicts the oldest entry")
+
+        with mock.patch.dict(os.environ, {"CANLIBGEN_CACHE_DIR": cache_dir}):
+            check(default_cache_dir() == cache_dir, "CANLIBGEN_CACHE_DIR overrides the cache directory")
+
+        uncached = DBCCache(os.path.join(tmp_dir, "uncached"))
+        with mock.patch.dict(os.environ, {"CANLIBGEN_NO_CACHE": "1"}):
+            db = load_dbc_file(dbc_copy, cache=uncached)
+        check(not uncached.entries() and db.name == "CAN_example.dbc", "CANLIBGEN_NO_CACHE skips the cache")
+
+    cancel_event = threading.Event()
+    results = list(iter_load_dbc_files([dbc_file], cancel_event=cancel_event, use_cache=False))
+    check(len(results) == 1 and results[0].db is not None and len(results[0].db.messages) == 3,
+          "Cancellable loading parses a single file in the process pool")
+
+    cancel_event.set()
+    check(not list(iter_load_dbc_files([dbc_file], cancel_event=cancel_event, use_cache=False)),
+          "Cancelled loading yields no results")
+
+    cancel_event = threading.Event()
+    with mock.patch.object(dbc_loader.os, "kill", wraps=os.kill) as kill:
+        loading = iter_load_dbc_files([dbc_file] * 3, max_workers=1, cancel_event=cancel_event, use_cache=False)
+        next(loading)
+        cancel_event.set()
+        check(len(list(loading)) < 2 and kill.called, "Cancellation terminates the reported worker processes")
+
+    print("✅ DBC cache checks passed.")
+
+
+def check_selection():
+    """
+    Checks the RX/TX mode merging, signal selection and errors of the selection resolved from command line specs.
+    """
+    print("\n🔍 Checking the message selection...")
+
+    dbs = [load_dbc_file(dbc_file, use_cache=False)]
+    motor = MessageKey(0, 0x121, False)
+    gnss = MessageKey(0, 0xD001, True)
+    fixture = MessageKey(0, 0x300, False)
+
+    selection = resolve_selection(dbs, nodes=["TCU:rx"], messages=["msgMotor_01:tx"])
+    check(list(selection) == [motor], "Node selects the messages it receives")
+    check(selection.get(motor).rx and selection.get(motor).tx and selection.get(motor).signals is None,
+          "RX node and TX message modes are merged")
+
+    selection = resolve_selection(dbs, nodes=["CAEB"])
+    check(list(selection) == [gnss] and selection.get(gnss).tx and not selection.get(gnss).rx,
+          "Node without mode selects the messages it sends as TX")
+
+    selection = resolve_selection(dbs, signals=["msgMotor_01.sigMO_CRC", "msgMotor_01.sigMO_CTR"])
+    entry = selection.get(motor)
+    check(entry.signals == {"sigMO_CRC", "sigMO_CTR"} and not entry.rx and not entry.tx,
+          "Signal specs select only their signals")
+    check(entry.includes("sigMO_CRC") and not entry.includes("sigMO_Oil_pressure"), "Signal membership of a message")
+
+    selection = resolve_selection(dbs, messages=["msgMotor_01:rx"], signals=["msgMotor_01.sigMO_CRC"])
+    check(selection.get(motor).signals is None and selection.get(motor).rx, "Message spec keeps all signals of a signal spec")
+
+    selection = resolve_selection(dbs, select_all=True)
+    check(set(selection) == {motor, gnss, fixture} and selection.get(motor).rx, "Select all selects every message")
+
+    for description, kwargs in [
+        ("Unknown node", {"nodes": ["ECU"]}),
+        ("Unknown message", {"messages": ["msgUnknown"]}),
+        ("Unknown signal", {"signals": ["msgMotor_01.sigUnknown"]}),
+        ("Signal spec without message", {"signals": ["sigMO_CRC"]}),
+        ("Invalid mode", {"messages": ["msgMotor_01:rw"]}),
+    ]:
+        try:
+            resolve_selection(dbs, **kwargs)
+        except SelectionError:
+            check(True, f"{description} is rejected")
+        else:
+            check(False, f"{description} is rejected")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        other_dir = os.path.join(tmp_dir, "other")
+        os.makedirs(other_dir)
+        shutil.copyfile(dbc_file, os.path.join(other_dir, os.path.basename(dbc_file)))
+        both = dbs + [load_dbc_file(os.path.join(other_dir, os.path.basename(dbc_file)), use_cache=False)]
+
+        selection = resolve_selection(both, messages=["msgMotor_01:rx"])
+        check(set(selection) == {motor, MessageKey(1, 0x121, False)}, "Databases with the same file name stay apart")
+        check(len(build_message_index(both)) == 6, "Message index keeps the messages of both databases")
+
+    selection = Selection.from_message_names(dbs, {"msgMotor_01": ["sigMO_CRC"]}, {"msgMotor_01": {"tx": True}})
+    selection.add_signal(0, 0x121, False, "sigMO_CTR")
+    check(selection.get(motor).signals == {"sigMO_CRC", "sigMO_CTR"} and selection.get(motor).tx,
+          "Selected signals of a message are merged")
+
+    check_frame_types()
+
+    print("✅ Message selection checks passed.")
+
+
+FRAME_TYPES_DBC = """VERSION ""
+
+NS_ :
+
+BS_:
+
+BU_: ECU
+
+BO_ 291 msgStandard: 8 ECU
+ SG_ sigStandard : 0|8@1+ (1,0) [0|255] "" ECU
+
+BO_ 2147483939 msgExtended: 8 ECU
+ SG_ sigExtended : 0|8@1+ (1,0) [0|255] "" ECU
+"""
+
+
+FRAME_TYPES_C = """
+#include <stdio.h>
+#include "frames_interface.h"
+
+void frames_msg_send(const can_db_msg_t* msg)
+{
+    (void)msg;
+}
+
+int main(void)
+{
+    const can_db_msg_t* standard = frames_find_message(0x123, false);
+    const can_db_msg_t* extended = frames_find_message(0x123, true);
+
+    if (standard == NULL || extended == NULL || standard == extended || extended->frame_type != 1) {
+        printf("Standard and extended frame 0x123 are not told apart\\n");
+        return 1;
+    }
+
+    return 0;
+}
+"""
+
+
+def check_frame_types():
+    """
+    Checks that a standard and an extended frame with the same numeric ID are both selected and generated.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pair_file = os.path.join(tmp_dir, "frames.dbc")
+        with open(pair_file, "w", encoding="utf-8") as f:
+            f.write(FRAME_TYPES_DBC)
+
+        dbs = [load_dbc_file(pair_file, use_cache=False)]
+        standard, extended = MessageKey(0, 0x123, False), MessageKey(0, 0x123, True)
+
+        check(set(build_message_index(dbs)) == {standard, extended},
+              "Message index keeps standard and extended frames with the same ID")
+        check(set(resolve_selection(dbs, select_all=True)) == {standard, extended},
+              "Select all selects standard and extended frames with the same ID")
+        check(set(resolve_selection(dbs, signals=["msgExtended.sigExtended"])) == {extended},
+              "Signal spec selects only the extended frame")
+
+        out_dir = os.path.join(tmp_dir, "out")
+        run_cmd([
+            sys.executable, "-m", "src.canlibrarygenerator.cli",
+            pair_file, "-o", out_dir, "--name", "frames", "--language", "c", "--all"
+        ], "Command line generation (standard/extended pair)")
+
+        inc_dir, src_dir = library_dirs(os.path.join(out_dir, "frames"))
+        main_file = os.path.join(tmp_dir, "frames_test.c")
+        with open(main_file, "w", encoding="utf-8") as f:
+            f.write(FRAME_TYPES_C)
+
+        frames_exec = os.path.join(tmp_dir, executable_name("frames_test"))
+        run_cmd([
+            "gcc", "-std=c99", main_file,
+            os.path.join(src_dir, "frames_interface.c"),
+            os.path.join(src_dir, "frames_db.c"),
+            "-I", inc_dir, "-o", frames_exec, "-lm"
+        ], "Compiling standard/extended pair")
+
+        check(subprocess.run([frames_exec]).returncode == 0,
+              "Generated library finds the standard and the extended frame with the same ID")
+
+
+CRC4_DBC = """VERSION ""
+
+NS_ :
+
+BS_:
+
+BU_: ECU
+
+BO_ 291 msgCrc4: 8 ECU
+ SG_ sigCrc4 : 0|4@1+ (1,0) [0|15] "" ECU
+ SG_ sigValue : 8|8@1+ (1,0) [0|255] "" ECU
+
+BA_DEF_ SG_  "GenSigFuncType" ENUM  "NoFunction","Counter","CRC";
+BA_DEF_DEF_  "GenSigFuncType" "NoFunction";
+BA_ "GenSigFuncType" SG_ 291 sigCrc4 2;
+"""
+
+
+def check_unsupported_crc():
+    """
+    Checks that a TX message with a CRC signal that is not 8 bits is generated without CRC and with a warning.
+    """
+    print("\n🔍 Checking unsupported CRC signals...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        crc_file = os.path.join(tmp_dir, "crc4.dbc")
+        with open(crc_file, "w", encoding="utf-8") as f:
+            f.write(CRC4_DBC)
+
+        dbs = [load_dbc_file(crc_file, use_cache=False)]
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        ir = build_library_ir(resolve_selection(dbs, messages=["msgCrc4:tx"]), "crc4", dbs, "dev")
+
+    check(len(ir.messages) == 1 and ir.messages[0].crc is None, "Message with a 4-bit CRC signal is generated without CRC")
+    check("Warning: Signal 'msgCrc4.sigCrc4'" in output.getvalue(), "Unsupported CRC signal produces a warning")
+
+    print("✅ Unsupported CRC checks passed.")
+
+
+SCALING_DBC = """VERSION ""
+
+NS_ :
+
+BS_:
+
+BU_: ECU
+
+BO_ 292 msgScaling: 8 ECU
+ SG_ sigThird : 0|16@1+ (0.333333333333333,0) [0|21845] "" ECU
+ SG_ sigInexact : 16|40@1+ (0.1234567891234567,0) [0|1] "" ECU
+"""
+
+
+def check_fixed_point_scaling():
+    """
+    Checks the rational fixed-point scaling of a fraction factor and the rounded scaling with a warning
+    of a factor without an exact 64-bit scaling.
+    """
+    print("\n🔍 Checking fixed-point scalings...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scaling_file = os.path.join(tmp_dir, "scaling.dbc")
+        with open(scaling_file, "w", encoding="utf-8") as f:
+            f.write(SCALING_DBC)
+
+        dbs = [load_dbc_file(scaling_file, use_cache=False)]
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        ir = build_library_ir(resolve_selection(dbs, select_all=True), "scaling", dbs, "dev",
+                              options=GenerationOptions(fixed_point=True))
+
+    fixed = {sig.name: sig.fixed for sig in ir.messages[0].signals}
+    third, inexact = fixed["sigThird"], fixed["sigInexact"]
+    check(third.factor == 10 and third.divisor == 3 and third.scale_exp == -1,
+          "Fraction factor is scaled as factor / divisor")
+    check(inexact.factor == 1234568 and inexact.divisor == 1 and inexact.scale_exp == -7,
+          "Factor without exact scaling is rounded")
+    check("Warning: Signal 'msgScaling.sigInexact'" in output.getvalue()
+          and "msgScaling.sigThird" not in output.getvalue(), "Rounded scaling produces a warning")
+
+    print("✅ Fixed-point scaling checks passed.")
+
+
+def library_dirs(lib_dir: str):
+    """
+    Returns (include, source) directories of a generated library.
+    Supports both the flat test layout and the inc/src layout written by the GUI and command line.
+    """
+    inc_dir = os.path.join(lib_dir, "inc")
+
+    if os.path.isdir(inc_dir):
+        return inc_dir, os.path.join(lib_dir, "src")
+
+    return lib_dir, lib_dir
+
+
 def create_c_mock(c_dir: str):
     """
     Creates dummy send function for C linking.
@@ -94,7 +480,8 @@ def compile_and_run_c(folder_name: str, exe_base_name: str):
         print(f"❌ Error: C output directory not found: {c_dir}")
         sys.exit(1)
 
-    mock_file = create_c_mock(c_dir)
+    inc_dir, src_dir = library_dirs(c_dir)
+    mock_file = create_c_mock(src_dir)
 
     c_test_file = os.path.join(test_dir, "test_c.c")
     c_exec = os.path.join(output_dir, executable_name(exe_base_name))
@@ -107,10 +494,10 @@ def compile_and_run_c(folder_name: str, exe_base_name: str):
         "-Wall",
         "-Wextra",
         c_test_file,
-        os.path.join(c_dir, f"{library_name}_interface.c"),
-        os.path.join(c_dir, f"{library_name}_db.c"),
+        os.path.join(src_dir, f"{library_name}_interface.c"),
+        os.path.join(src_dir, f"{library_name}_db.c"),
         mock_file,
-        "-I", c_dir,
+        "-I", inc_dir,
         "-o", c_exec,
         "-lm"
     ], f"Compiling C tests ({folder_name})")
@@ -125,6 +512,7 @@ def compile_and_run_cpp(folder_name: str, exe_base_name: str):
         print(f"❌ Error: C++ output directory not found: {cpp_dir}")
         sys.exit(1)
 
+    inc_dir, src_dir = library_dirs(cpp_dir)
     cpp_test_file = os.path.join(test_dir, "test_cpp.cpp")
     cpp_exec = os.path.join(output_dir, executable_name(exe_base_name))
 
@@ -136,9 +524,9 @@ def compile_and_run_cpp(folder_name: str, exe_base_name: str):
         "-Wall",
         "-Wextra",
         cpp_test_file,
-        os.path.join(cpp_dir, f"{library_name}_interface.cpp"),
-        os.path.join(cpp_dir, f"{library_name}_db.cpp"),
-        "-I", cpp_dir,
+        os.path.join(src_dir, f"{library_name}_interface.cpp"),
+        os.path.join(src_dir, f"{library_name}_db.cpp"),
+        "-I", inc_dir,
         "-o", cpp_exec
     ], f"Compiling C++ tests ({folder_name})")
 
@@ -158,19 +546,29 @@ if __name__ == "__main__":
         print("❌ Error: gcc or g++ not found in system PATH.")
         sys.exit(1)
 
+    # ---------------- DBC CACHE ----------------
+    print("\n🧪 0b. Testing the DBC cache...")
+    check_dbc_cache()
+
+    # ---------------- SELECTION ----------------
+    print("\n🧪 0c. Testing the message selection...")
+    check_selection()
+
+    print("\n🧪 0d. Testing unsupported CRC signals...")
+    check_unsupported_crc()
+
+    print("\n🧪 0e. Testing fixed-point scalings...")
+    check_fixed_point_scaling()
+
     # ---------------- GENERATION ----------------
-    print("\n🔧 1. Generating normal library...")
-    generate_variant(embedded=False, suffix="")
-
-    print("\n🔧 2. Generating normal library with unit signal names...")
-    generate_variant(
-        embedded=False,
-        suffix="_units",
-        with_units=True
-    )
+    print("\n🔧 1-3. Generating normal, unit signal names and embedded libraries...")
+    generate_variants()
 
-    print("\n🔧 3. Generating embedded library...")
-    generate_variant(embedded=True, suffix="_embedded")
+    print("\n🔧 3b. Generating library via command line...")
+    generate_cli_variant("cli")
+
+    print("\n🔧 3c. Regenerating unchanged reproducible library...")
+    check_unchanged_regeneration("cli")
 
     # ---------------- NORMAL C TEST ----------------
     print("\n🧪 4. Testing normal C library...")
@@ -214,6 +612,17 @@ if __name__ == "__main__":
         exe_base_name="test_cpp_embedded"
     )
 
+    # ---------------- COMMAND LINE C / C++ TEST ----------------
+    print("\n🧪 9b. Testing C and C++ libraries generated via command line...")
+    compile_and_run_c(
+        folder_name=os.path.join("cli", "c", library_name),
+        exe_base_name="test_c_cli"
+    )
+    compile_and_run_cpp(
+        folder_name=os.path.join("cli", "cpp", library_name),
+        exe_base_name="test_cpp_cli"
+    )
+
     # ---------------- CLEANUP ----------------
     print("\n🧹 10. Cleaning up temporary files...")
     delete_temp_files()
@@ -0,0 +1,19 @@
+import os
+import sys
+
+
+def user_cache_dir(*parts: str) -> str:
+    """
+    Return a directory inside the per-user cache directory of the application.
+
+    Args:
+        parts: Path components appended to the application cache directory.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+    return os.path.join(base, "canlibrarygenerator", *parts)
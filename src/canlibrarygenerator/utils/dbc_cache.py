@@ -0,0 +1,225 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import zlib
+from typing import Optional
+
+import cantools
+
+from .cache_dirs import user_cache_dir
+
+
+# Bump when the stored format changes so old entries are never read.
+CACHE_FORMAT_VERSION = 1
+
+# Default upper bound of the cache directory size.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+CACHE_SUFFIX = ".dbcache"
+
+
+def default_cache_dir() -> str:
+    """
+    Return the per-user cache directory for parsed databases.
+
+    The CANLIBGEN_CACHE_DIR environment variable overrides the platform default.
+    """
+    override = os.environ.get("CANLIBGEN_CACHE_DIR")
+    if override:
+        return override
+
+    return user_cache_dir("dbc")
+
+
+def _database_format_and_encoding(file_path: str):
+    """Resolve the database format and text encoding the same way cantools.database.load_file does."""
+    database_format = os.path.splitext(file_path)[1][1:].lower()
+    encoding = "cp1252" if database_format in ("dbc", "sym") else "utf-8"
+    return database_format, encoding
+
+
+class DBCCache:
+    """
+    Persistent on-disk cache of parsed cantools databases.
+
+    Entries are keyed by the SHA-256 of the file content together with the
+    cantools version, Python version and cache format version, so any change
+    of the file or of the parser invalidates the entry. Entries are stored as
+    zlib-compressed pickles. The total size of the cache directory is bounded
+    by max_bytes, least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key_for(self, data: bytes) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(
+            f"|cantools={cantools.__version__}"
+            f"|python={sys.version_info[0]}.{sys.version_info[1]}"
+            f"|format={CACHE_FORMAT_VERSION}".encode()
+        )
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def get(self, key: str):
+        """Return the cached database for a key or None on a cache miss."""
+        path = self._entry_path(key)
+
+        try:
+            with open(path, "rb") as f:
+                db = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupted or incompatible entry, drop it and parse again.
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+
+        return db
+
+    def put(self, key: str, db):
+        """Store a parsed database and evict old entries if the cache grows over max_bytes."""
+        payload = zlib.compress(pickle.dumps(db, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+        if len(payload) > self.max_bytes:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def load(self, file_path: str):
+        """
+        Load a database file, skipping parsing entirely when a cached entry exists.
+
+        Args:
+            file_path: Path to the DBC (or other cantools supported) file.
+
+        Returns:
+            Parsed cantools database.
+        """
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        key = self.key_for(data)
+        db = self.get(key)
+
+        if db is None:
+            database_format, encoding = _database_format_and_encoding(file_path)
+            db = cantools.database.load_string(
+                data.decode(encoding, errors="replace"),
+                database_format=database_format
+            )
+
+            try:
+                self.put(key, db)
+            except Exception as e:
+                print(f"Warning: Can't write DBC cache entry for {file_path}: {e}")
+
+        return db
+
+    def invalidate(self, file_path: str):
+        """Remove the cache entry of the current content of a file."""
+        with open(file_path, "rb") as f:
+            self._remove(self._entry_path(self.key_for(f.read())))
+
+    def entries(self):
+        """Return (path, size, mtime) of all cache entries, least recently used first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits into max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_default_cache: Optional[DBCCache] = None
+
+
+def get_default_cache() -> DBCCache:
+    """Return the process-wide DBC cache in the default cache directory."""
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = DBCCache()
+
+    return _default_cache
+
+
+def load_dbc_file(file_path: str, cache: Optional[DBCCache] = None, use_cache: bool = True):
+    """
+    Load a DBC file through the cache and name the database after the file.
+
+    Caching is skipped when use_cache is False or CANLIBGEN_NO_CACHE is set.
+
+    Args:
+        file_path: Path to the DBC file.
+        cache: Cache to use, defaults to the process-wide cache.
+        use_cache: Set to False to always parse the file.
+
+    Returns:
+        Parsed cantools database with db.name set to the file name.
+    """
+    if use_cache and not os.environ.get("CANLIBGEN_NO_CACHE"):
+        db = (cache or get_default_cache()).load(file_path)
+    else:
+        db = cantools.database.load_file(file_path)
+
+    db.name = os.path.basename(file_path)
+    return db
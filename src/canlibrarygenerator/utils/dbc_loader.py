@@ -0,0 +1,160 @@
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from .dbc_cache import DBCCache, get_default_cache, load_dbc_file
+
+
+@dataclass
+class LoadResult:
+    """Result of loading a single DBC file."""
+    index: int                  # Position of the file in the requested file list
+    file_path: str
+    db: object = None           # Parsed cantools database, None on error
+    error: Optional[str] = None
+
+
+def _load_worker(file_path: str, cache_dir: Optional[str], use_cache: bool):
+    """Parse a single file in a worker process."""
+    cache = DBCCache(cache_dir) if cache_dir else None
+    return load_dbc_file(file_path, cache=cache, use_cache=use_cache)
+
+
+def _report_worker_pid(worker_pids):
+    """Pool initializer, reports the PID of a started worker process so a cancellation can terminate it."""
+    worker_pids.put(os.getpid())
+
+
+def _cache_enabled(use_cache: bool) -> bool:
+    return use_cache and not os.environ.get("CANLIBGEN_NO_CACHE")
+
+
+def iter_load_dbc_files(file_paths: List[str], max_workers: Optional[int] = None,
+                        cancel_event: Optional[threading.Event] = None,
+                        use_cache: bool = True, cache: Optional[DBCCache] = None) -> Iterator[LoadResult]:
+    """
+    Load DBC files concurrently and yield each result as soon as it is ready.
+
+    Files found in the DBC cache are loaded directly, the remaining files are
+    parsed in a process pool, so loading several files costs roughly the time
+    of the slowest one. Results are yielded in completion order.
+
+    Args:
+        file_paths: DBC files to load.
+        max_workers: Maximum number of worker processes (default: CPU count).
+        cancel_event: When set, pending files are cancelled, running workers are
+            terminated and no further results are yielded. Without a cancel event
+            a single uncached file is parsed in-process.
+        use_cache: Use the parsed database cache.
+        cache: Cache to use, defaults to the process-wide cache.
+
+    Yields:
+        LoadResult for every loaded (or failed) file.
+    """
+    cancellable = cancel_event is not None
+    cancel_event = cancel_event or threading.Event()
+    cache_enabled = _cache_enabled(use_cache)
+    cache = cache or (get_default_cache() if cache_enabled else None)
+    pending = []
+
+    # Cache hits are cheap, serve them without starting worker processes.
+    for index, file_path in enumerate(file_paths):
+        if cancel_event.is_set():
+            return
+
+        db = None
+        if cache_enabled:
+            try:
+                with open(file_path, "rb") as f:
+                    db = cache.get(cache.key_for(f.read()))
+            except OSError as e:
+                yield LoadResult(index, file_path, error=str(e))
+                continue
+
+        if db is not None:
+            db.name = os.path.basename(file_path)
+            yield LoadResult(index, file_path, db=db)
+        else:
+            pending.append((index, file_path))
+
+    if not pending:
+        return
+
+    # A single file is parsed in-process unless the caller can cancel the loading,
+    # a pool would only add start-up cost.
+    if len(pending) == 1 and not cancellable:
+        index, file_path = pending[0]
+        try:
+            yield LoadResult(index, file_path, db=load_dbc_file(file_path, cache=cache, use_cache=use_cache))
+        except Exception as e:
+            yield LoadResult(index, file_path, error=str(e))
+        return
+
+    workers = min(len(pending), max_workers or os.cpu_count() or 1)
+    cache_dir = cache.cache_dir if cache is not None else None
+    context = multiprocessing.get_context()
+    worker_pids = context.SimpleQueue()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=_report_worker_pid, initargs=(worker_pids,))
+
+    try:
+        futures = {
+            executor.submit(_load_worker, file_path, cache_dir, use_cache): (index, file_path)
+            for index, file_path in pending
+        }
+        not_done = set(futures)
+
+        while not_done:
+            done, not_done = wait(not_done, timeout=0.1, return_when=FIRST_COMPLETED)
+
+            if cancel_event.is_set():
+                _terminate_workers(worker_pids)
+                return
+
+            for future in done:
+                index, file_path = futures[future]
+                try:
+                    yield LoadResult(index, file_path, db=future.result())
+                except Exception as e:
+                    yield LoadResult(index, file_path, error=str(e))
+    finally:
+        # Do not block on files still being parsed after a cancellation.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _terminate_workers(worker_pids):
+    """
+    Stop the worker processes of a cancelled loading instead of letting them finish parsing.
+
+    Workers are known by the PIDs they reported on start-up. A worker that has not
+    reported its PID yet finishes its current file and exits with the pool.
+    """
+    while not worker_pids.empty():
+        try:
+            os.kill(worker_pids.get(), signal.SIGTERM)
+        except OSError:
+            pass  # Worker already exited
+
+
+def load_dbc_files(file_paths: List[str], max_workers: Optional[int] = None, use_cache: bool = True,
+                   cache: Optional[DBCCache] = None) -> list:
+    """
+    Load DBC files concurrently and return the databases in the order of file_paths.
+
+    Raises:
+        RuntimeError: If any of the files can't be read.
+    """
+    results = sorted(
+        iter_load_dbc_files(file_paths, max_workers=max_workers, use_cache=use_cache, cache=cache),
+        key=lambda result: result.index
+    )
+
+    for result in results:
+        if result.error is not None:
+            raise RuntimeError(f"{result.file_path}: {result.error}")
+
+    return [result.db for result in results]